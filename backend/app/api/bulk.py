@@ -0,0 +1,77 @@
+"""Helpers for the bulk write endpoints.
+
+A bulk request carries a list of the usual ``*Create`` payloads. References
+are checked with one ``IN`` query per referenced table for the whole list;
+items with unknown references are reported and skipped while the rest are
+inserted with Core ``executemany`` inserts in a single transaction.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Type, Union
+
+from fastapi import Body
+from sqlalchemy import insert, select
+from sqlalchemy.orm import QueryableAttribute, Session
+from sqlalchemy.sql import ColumnElement
+
+from app.schemas import BulkItemResult, BulkResult
+
+# Largest number of items accepted by one bulk request
+BULK_MAX_ITEMS = int(os.getenv("API_BULK_MAX_ITEMS", "10000"))
+
+# Ids per IN list, below SQLite's default limit of 32766 bound parameters
+IN_CHUNK = 30000
+
+
+def bulk_body() -> Any:
+    """Request body parameter for a list of 1 to `BULK_MAX_ITEMS` items."""
+    return Body(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+def existing_ids(
+    db: Session, column: Union[ColumnElement, QueryableAttribute], ids: Iterable[int]
+) -> Set[int]:
+    """The subset of `ids` present in `column`, using one IN query per `IN_CHUNK` ids."""
+    wanted = sorted(set(ids))
+    found: Set[int] = set()
+    for start in range(0, len(wanted), IN_CHUNK):
+        chunk = wanted[start : start + IN_CHUNK]
+        found.update(db.execute(select(column).where(column.in_(chunk))).scalars())
+    return found
+
+
+def unknown_error(label: str, ids: Sequence[int], known: Set[int]) -> Optional[str]:
+    """Error naming the `ids` missing from `known`, e.g. ``Unknown genre ids: 7, 9``."""
+    unknown = sorted(set(ids) - known)
+    if not unknown:
+        return None
+    return f"Unknown {label} {'id' if len(unknown) == 1 else 'ids'}: " + ", ".join(
+        map(str, unknown)
+    )
+
+
+def insert_rows(db: Session, model: Type, rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert `rows` into `model`'s table; returns the new ids in row order.
+
+    SQLite assigns rowids in ascending insertion order while the transaction
+    holds the write lock, so sorting the returned ids restores row order.
+    Asking SQLAlchemy for ordered RETURNING instead would make it insert one
+    row per statement, as SQLite has no sentinel to match rows to parameters.
+    """
+    if not rows:
+        return []
+    return sorted(db.execute(insert(model).returning(model.id), rows).scalars())
+
+
+def bulk_result(count: int, ids: Sequence[int], errors: Dict[int, str]) -> BulkResult:
+    """Per-item results of `count` items: `ids` of the inserted ones in order, or their error."""
+    inserted = iter(ids)
+    results = [
+        (
+            BulkItemResult(index=index, error=errors[index])
+            if index in errors
+            else BulkItemResult(index=index, id=next(inserted))
+        )
+        for index in range(count)
+    ]
+    return BulkResult(created=len(ids), failed=len(errors), results=results)
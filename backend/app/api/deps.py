@@ -1,16 +1,36 @@
 """API dependencies for dependency injection."""
 
+import time
 from typing import Generator
 
 from sqlalchemy.orm import Session
 
-from app.db.database import SessionLocal
+from app.core.metrics import pool_wait
+from app.db.database import ReadSessionLocal, SessionLocal
+
+
+def _checkout(db: Session, pool: str) -> None:
+    """Take the session's connection from the pool now, timing the wait."""
+    start = time.perf_counter()
+    db.connection()
+    pool_wait.observe(time.perf_counter() - start, pool)
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Dependency to get database session."""
+    """Dependency to get a read-write database session for mutations."""
     db = SessionLocal()
     try:
+        _checkout(db, "write")
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """Dependency to get a read-only database session for GET routes."""
+    db = ReadSessionLocal()
+    try:
+        _checkout(db, "read")
         yield db
     finally:
         db.close()
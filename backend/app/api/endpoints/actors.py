@@ -1,55 +1,74 @@
 """Actor API endpoints."""
 
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-
-from app.api.deps import get_db
-from app.models import Actor, Genre, Movie
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.bulk import bulk_body, bulk_result, insert_rows
+from app.api.deps import get_db, get_read_db
+from app.api.filters import ACTOR_FILTERS, MatchMode, apply_filters
+from app.api.pagination import cursor_headers, load_by_ids, page_ids
+from app.api.responses import json_response, schema_fields, trusted_row
+from app.core.suggest import suggestions
+from app.core.versions import record_write
+from app.models import Actor
 from app.schemas import Actor as ActorSchema
-from app.schemas import ActorCreate, ActorDetail, ActorUpdate
+from app.schemas import ActorCreate, ActorDetail, ActorUpdate, BulkResult
 
 router = APIRouter()
 
+ActorSort = Literal["id", "name"]
+
+ACTOR_FIELDS = schema_fields(ActorSchema)
+
 
 @router.get("/", response_model=List[ActorSchema])
 def get_actors(
     genre: Optional[str] = Query(None, description="Filter actors who acted in this genre"),
+    genre_id: Optional[int] = Query(None, description="Filter actors who acted in this genre ID"),
     movie: Optional[str] = Query(None, description="Filter actors who acted in this movie"),
+    movie_id: Optional[int] = Query(None, description="Filter actors who acted in this movie ID"),
     search: Optional[str] = Query(None, description="Search in actor name"),
+    match: MatchMode = Query(
+        "contains", description="How name filters match: exact, prefix or contains"
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-) -> List[ActorSchema]:
+    sort: ActorSort = Query("id", description="Sort key; ties are broken by id"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from X-Next-Cursor; replaces skip"
+    ),
+    db: Session = Depends(get_read_db),
+) -> Response:
     """Get list of actors with optional filters."""
-    query = db.query(Actor)
+    query = apply_filters(
+        db.query(Actor),
+        ACTOR_FILTERS,
+        match,
+        genre=genre,
+        genre_id=genre_id,
+        movie=movie,
+        movie_id=movie_id,
+        search=search,
+    )
 
-    # Filter by genre - actors who acted in movies of this genre
-    if genre:
-        query = query.join(Actor.movies).join(Movie.genres).filter(Genre.name.ilike(f"%{genre}%"))
+    ids, next_cursor = page_ids(query, Actor, skip, limit, sort, cursor)
 
-    # Filter by movie title
-    if movie:
-        query = query.join(Actor.movies).filter(Movie.title.ilike(f"%{movie}%"))
-
-    # Search in name
-    if search:
-        query = query.filter(Actor.name.ilike(f"%{search}%"))
-
-    actors = query.distinct().offset(skip).limit(limit).all()
-    return [ActorSchema.model_validate(actor) for actor in actors]
+    actors = load_by_ids(db, Actor, ids)
+    rows = [trusted_row(actor, ACTOR_FIELDS) for actor in actors]
+    return json_response(rows, headers=cursor_headers(next_cursor))
 
 
 @router.get("/{actor_id}", response_model=ActorDetail)
-def get_actor(actor_id: int, db: Session = Depends(get_db)) -> ActorDetail:
+def get_actor(actor_id: int, db: Session = Depends(get_read_db)) -> Response:
     """Get detailed actor information with their filmography."""
-    actor = db.query(Actor).options(joinedload(Actor.movies)).filter(Actor.id == actor_id).first()
+    actor = db.query(Actor).options(selectinload(Actor.movies)).filter(Actor.id == actor_id).first()
 
     if not actor:
         raise HTTPException(status_code=404, detail="Actor not found")
 
-    return actor
+    return json_response(ActorDetail.model_validate(actor), ActorDetail)
 
 
 @router.post("/", response_model=ActorSchema, status_code=201)
@@ -59,7 +78,22 @@ def create_actor(actor_data: ActorCreate, db: Session = Depends(get_db)) -> Acto
     db.add(actor)
     db.commit()
     db.refresh(actor)
-    return actor
+    suggestions.upsert("actor", actor.id, actor.name)
+    record_write("actor", [actor.id])
+    return ActorSchema.model_validate(actor)
+
+
+@router.post("/bulk", response_model=BulkResult)
+def create_actors(
+    actors_data: List[ActorCreate] = bulk_body(), db: Session = Depends(get_db)
+) -> BulkResult:
+    """Create many actors in one transaction."""
+    rows = [actor_data.model_dump() for actor_data in actors_data]
+    ids = insert_rows(db, Actor, rows)
+    db.commit()
+    suggestions.upsert_many("actor", zip(ids, (row["name"] for row in rows)))
+    record_write("actor", ids)
+    return bulk_result(len(rows), ids, {})
 
 
 @router.put("/{actor_id}", response_model=ActorSchema)
@@ -77,7 +111,9 @@ def update_actor(
 
     db.commit()
     db.refresh(actor)
-    return actor
+    suggestions.upsert("actor", actor.id, actor.name)
+    record_write("actor", [actor.id], movie=[movie.id for movie in actor.movies])
+    return ActorSchema.model_validate(actor)
 
 
 @router.delete("/{actor_id}", status_code=204)
@@ -87,6 +123,9 @@ def delete_actor(actor_id: int, db: Session = Depends(get_db)) -> None:
     if not actor:
         raise HTTPException(status_code=404, detail="Actor not found")
 
+    movie_ids = [movie.id for movie in actor.movies]
     db.delete(actor)
     db.commit()
+    suggestions.remove("actor", actor_id)
+    record_write("actor", [actor_id], movie=movie_ids)
     return None
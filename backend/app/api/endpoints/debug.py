@@ -0,0 +1,35 @@
+"""Slow-query log endpoints.
+
+Mounted at ``/debug`` only when the log is enabled (``DATABASE_SLOW_QUERY_MS``
+above 0); entries carry statements and plans but not their bound parameters.
+"""
+
+import io
+from typing import Any, Literal
+
+from fastapi import APIRouter, Query, Response
+
+from app.db.database import slow_queries
+
+router = APIRouter()
+
+
+@router.get("/slow-queries")
+def slow_query_log(
+    format: Literal["json", "jsonl"] = Query("json", description="json, or jsonl to dump"),
+) -> Any:
+    """Statements slower than DATABASE_SLOW_QUERY_MS, newest first, with their plans."""
+    if format == "jsonl":
+        stream = io.StringIO()
+        slow_queries.dump(stream)
+        return Response(stream.getvalue(), media_type="application/x-ndjson")
+    return {
+        "threshold_ms": slow_queries.threshold_ms,
+        "entries": slow_queries.snapshot(),
+    }
+
+
+@router.delete("/slow-queries", status_code=204)
+def clear_slow_query_log() -> None:
+    """Empty the slow-query log."""
+    slow_queries.clear()
@@ -1,45 +1,59 @@
 """Director API endpoints."""
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session, joinedload
 
-from app.api.deps import get_db
-from app.models import Director, Genre, Movie
+from app.api.deps import get_db, get_read_db
+from app.api.filters import DIRECTOR_FILTERS, MatchMode, apply_filters
+from app.api.pagination import cursor_headers, load_by_ids, page_ids
+from app.api.responses import json_response, schema_fields, trusted_row
+from app.core.suggest import suggestions
+from app.core.versions import record_write
+from app.models import Director
 from app.schemas import Director as DirectorSchema
 from app.schemas import DirectorCreate, DirectorDetail, DirectorUpdate
 
 router = APIRouter()
 
+DirectorSort = Literal["id", "name"]
+
+DIRECTOR_FIELDS = schema_fields(DirectorSchema)
+
 
 @router.get("/", response_model=List[DirectorSchema])
 def get_directors(
     genre: Optional[str] = Query(None, description="Filter directors who directed this genre"),
+    genre_id: Optional[int] = Query(
+        None, description="Filter directors who directed this genre ID"
+    ),
     search: Optional[str] = Query(None, description="Search in director name"),
+    match: MatchMode = Query(
+        "contains", description="How name filters match: exact, prefix or contains"
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-) -> List[DirectorSchema]:
+    sort: DirectorSort = Query("id", description="Sort key; ties are broken by id"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from X-Next-Cursor; replaces skip"
+    ),
+    db: Session = Depends(get_read_db),
+) -> Response:
     """Get list of directors with optional filters."""
-    query = db.query(Director)
-
-    # Filter by genre - directors who directed movies of this genre
-    if genre:
-        query = (
-            query.join(Director.movies).join(Movie.genres).filter(Genre.name.ilike(f"%{genre}%"))
-        )
+    query = apply_filters(
+        db.query(Director), DIRECTOR_FILTERS, match, genre=genre, genre_id=genre_id, search=search
+    )
 
-    # Search in name
-    if search:
-        query = query.filter(Director.name.ilike(f"%{search}%"))
+    ids, next_cursor = page_ids(query, Director, skip, limit, sort, cursor)
 
-    directors = query.distinct().offset(skip).limit(limit).all()
-    return [DirectorSchema.model_validate(director) for director in directors]
+    directors = load_by_ids(db, Director, ids)
+    rows = [trusted_row(director, DIRECTOR_FIELDS) for director in directors]
+    return json_response(rows, headers=cursor_headers(next_cursor))
 
 
 @router.get("/{director_id}", response_model=DirectorDetail)
-def get_director(director_id: int, db: Session = Depends(get_db)) -> DirectorDetail:
+def get_director(director_id: int, db: Session = Depends(get_read_db)) -> Response:
     """Get detailed director information with their filmography."""
     director = (
         db.query(Director)
@@ -51,7 +65,7 @@ def get_director(director_id: int, db: Session = Depends(get_db)) -> DirectorDet
     if not director:
         raise HTTPException(status_code=404, detail="Director not found")
 
-    return director
+    return json_response(DirectorDetail.model_validate(director), DirectorDetail)
 
 
 @router.post("/", response_model=DirectorSchema, status_code=201)
@@ -61,7 +75,9 @@ def create_director(director_data: DirectorCreate, db: Session = Depends(get_db)
     db.add(director)
     db.commit()
     db.refresh(director)
-    return director
+    suggestions.upsert("director", director.id, director.name)
+    record_write("director", [director.id])
+    return DirectorSchema.model_validate(director)
 
 
 @router.put("/{director_id}", response_model=DirectorSchema)
@@ -79,7 +95,9 @@ def update_director(
 
     db.commit()
     db.refresh(director)
-    return director
+    suggestions.upsert("director", director.id, director.name)
+    record_write("director", [director.id], movie=[movie.id for movie in director.movies])
+    return DirectorSchema.model_validate(director)
 
 
 @router.delete("/{director_id}", status_code=204)
@@ -89,6 +107,9 @@ def delete_director(director_id: int, db: Session = Depends(get_db)) -> None:
     if not director:
         raise HTTPException(status_code=404, detail="Director not found")
 
+    movie_ids = [movie.id for movie in director.movies]
     db.delete(director)
     db.commit()
+    suggestions.remove("director", director_id)
+    record_write("director", [director_id], movie=movie_ids)
     return None
@@ -0,0 +1,216 @@
+"""Streaming catalog export.
+
+``GET /api/export/{entity}`` streams every movie, actor, director or rating
+as NDJSON (one JSON object per line) or CSV. Rows are read with Core queries
+in keyset batches of ``EXPORT_BATCH_SIZE`` ids, and each batch's
+relationships are fetched with one ``IN`` query per relationship, so memory
+stays flat however large the table is and no ORM objects are built.
+Relationships are flattened into ``<name>_ids`` and ``<name>s`` (names or
+titles) columns, which CSV joins with ``|``, quoting CSV-style any element
+that contains it (read back with ``csv.reader(..., delimiter="|")``).
+"""
+
+import csv
+import io
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Literal, NamedTuple, Tuple, Union, cast
+
+import pydantic_core
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import QueryableAttribute, Session
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.api.deps import get_read_db
+from app.models import Actor, Director, Genre, Movie, Rating
+from app.models.movie import movie_actors, movie_genres
+
+router = APIRouter()
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+ExportEntity = Literal["movies", "actors", "directors", "ratings"]
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class _Link(NamedTuple):
+    """Relationship flattened into ``<name>_ids`` and ``<name>s`` columns.
+
+    `rows` selects ``(owner id, linked id, linked name)``; `owner` is the
+    owner id column it is filtered on.
+    """
+
+    name: str
+    owner: Union[ColumnElement, QueryableAttribute]
+    rows: Select
+
+
+class _Export(NamedTuple):
+    rows: Select
+    key: Union[ColumnElement, QueryableAttribute]
+    links: Tuple[_Link, ...] = ()
+
+
+EXPORTS: Dict[str, _Export] = {
+    "movies": _Export(
+        select(
+            Movie.id,
+            Movie.title,
+            Movie.release_year,
+            Movie.synopsis,
+            Movie.poster_url,
+            Movie.duration_minutes,
+            Movie.status,
+            Movie.director_id,
+            Director.name.label("director"),
+            Movie.rating_count,
+            Movie.average_rating,
+        ).outerjoin(Director, Director.id == Movie.director_id),
+        Movie.id,
+        (
+            _Link(
+                "genre",
+                movie_genres.c.movie_id,
+                select(movie_genres.c.movie_id, Genre.id, Genre.name).join(
+                    Genre, Genre.id == movie_genres.c.genre_id
+                ),
+            ),
+            _Link(
+                "actor",
+                movie_actors.c.movie_id,
+                select(movie_actors.c.movie_id, Actor.id, Actor.name).join(
+                    Actor, Actor.id == movie_actors.c.actor_id
+                ),
+            ),
+        ),
+    ),
+    "actors": _Export(
+        select(Actor.id, Actor.name, Actor.bio, Actor.photo_url),
+        Actor.id,
+        (
+            _Link(
+                "movie",
+                movie_actors.c.actor_id,
+                select(movie_actors.c.actor_id, Movie.id, Movie.title).join(
+                    Movie, Movie.id == movie_actors.c.movie_id
+                ),
+            ),
+        ),
+    ),
+    "directors": _Export(
+        select(Director.id, Director.name, Director.bio, Director.photo_url),
+        Director.id,
+        (_Link("movie", Movie.director_id, select(Movie.director_id, Movie.id, Movie.title)),),
+    ),
+    "ratings": _Export(
+        select(
+            Rating.id,
+            Rating.movie_id,
+            Movie.title.label("movie_title"),
+            Rating.score,
+            Rating.review,
+        ).outerjoin(Movie, Movie.id == Rating.movie_id),
+        Rating.id,
+    ),
+}
+
+
+def export_columns(export: _Export) -> List[str]:
+    """Output columns of `export` in order."""
+    columns = [column.name for column in export.rows.selected_columns]
+    for link in export.links:
+        columns += [f"{link.name}_ids", f"{link.name}s"]
+    return columns
+
+
+def export_batches(
+    conn: Connection, export: _Export, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """Rows of `export` in id order, `batch_size` at a time, with flattened links."""
+    last = None
+    while True:
+        query = export.rows.order_by(export.key).limit(batch_size)
+        if last is not None:
+            query = query.where(export.key > last)
+        rows = [dict(row) for row in conn.execute(query).mappings().all()]
+        if not rows:
+            return
+
+        ids = [row["id"] for row in rows]
+        for link in export.links:
+            linked: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+            linked_id_column = link.rows.selected_columns[1]
+            query = link.rows.where(link.owner.in_(ids)).order_by(link.owner, linked_id_column)
+            for owner_id, linked_id, name in conn.execute(query).all():
+                linked[owner_id].append((linked_id, name))
+            for row in rows:
+                pairs = linked.get(row["id"], [])
+                row[f"{link.name}_ids"] = [linked_id for linked_id, _ in pairs]
+                row[f"{link.name}s"] = [name for _, name in pairs]
+
+        yield rows
+        last = ids[-1]
+
+
+def _ndjson(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield b"".join(pydantic_core.to_json(row) + b"\n" for row in rows)
+
+
+def _csv(batches: Iterator[List[Dict[str, Any]]], columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Names are free text, so list elements are quoted like CSV fields when needed
+    elements = io.StringIO()
+    element_writer = csv.writer(elements, delimiter="|", lineterminator="")
+
+    def join(values: List[Any]) -> str:
+        element_writer.writerow(values)
+        joined = elements.getvalue()
+        elements.seek(0)
+        elements.truncate()
+        return joined
+
+    writer.writerow(columns)
+    for rows in batches:
+        for row in rows:
+            writer.writerow(
+                [join(value) if isinstance(value, list) else value for value in row.values()]
+            )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _stream(engine: Engine, entity: str, format: str) -> Iterator[bytes]:
+    export = EXPORTS[entity]
+    # Its own connection: the request's session is closed before the body is sent
+    with engine.connect() as conn:
+        batches = export_batches(conn, export)
+        if format == "csv":
+            yield from _csv(batches, export_columns(export))
+        else:
+            yield from _ndjson(batches)
+
+
+@router.get("/{entity}")
+def export_entity(
+    entity: ExportEntity,
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+    db: Session = Depends(get_read_db),
+) -> StreamingResponse:
+    """Stream every row of `entity` as NDJSON or CSV, in id order."""
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        # Read sessions are bound to the read engine, never to a connection
+        _stream(cast(Engine, db.get_bind()), entity, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{extension}"'},
+    )
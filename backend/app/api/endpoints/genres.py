@@ -5,7 +5,10 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
+from app.api.filters import GENRE_FILTERS, MatchMode, apply_filters
+from app.core.suggest import suggestions
+from app.core.versions import record_write
 from app.models import Genre
 from app.schemas import Genre as GenreSchema
 from app.schemas import GenreCreate, GenreUpdate
@@ -16,27 +19,26 @@ router = APIRouter()
 @router.get("/", response_model=List[GenreSchema])
 def get_genres(
     search: Optional[str] = Query(None, description="Search in genre name"),
-    db: Session = Depends(get_db),
+    match: MatchMode = Query(
+        "contains", description="How name filters match: exact, prefix or contains"
+    ),
+    db: Session = Depends(get_read_db),
 ) -> List[GenreSchema]:
     """Get list of all genres."""
-    query = db.query(Genre)
-
-    if search:
-        query = query.filter(Genre.name.ilike(f"%{search}%"))
-
+    query = apply_filters(db.query(Genre), GENRE_FILTERS, match, search=search)
     genres = query.all()
     return [GenreSchema.model_validate(genre) for genre in genres]
 
 
 @router.get("/{genre_id}", response_model=GenreSchema)
-def get_genre(genre_id: int, db: Session = Depends(get_db)) -> GenreSchema:
+def get_genre(genre_id: int, db: Session = Depends(get_read_db)) -> GenreSchema:
     """Get a specific genre by ID."""
     genre = db.query(Genre).filter(Genre.id == genre_id).first()
 
     if not genre:
         raise HTTPException(status_code=404, detail="Genre not found")
 
-    return genre
+    return GenreSchema.model_validate(genre)
 
 
 @router.post("/", response_model=GenreSchema, status_code=201)
@@ -51,7 +53,9 @@ def create_genre(genre_data: GenreCreate, db: Session = Depends(get_db)) -> Genr
     db.add(genre)
     db.commit()
     db.refresh(genre)
-    return genre
+    suggestions.upsert("genre", genre.id, genre.name)
+    record_write("genre", [genre.id])
+    return GenreSchema.model_validate(genre)
 
 
 @router.put("/{genre_id}", response_model=GenreSchema)
@@ -69,7 +73,9 @@ def update_genre(
 
     db.commit()
     db.refresh(genre)
-    return genre
+    suggestions.upsert("genre", genre.id, genre.name)
+    record_write("genre", [genre.id], movie=[movie.id for movie in genre.movies])
+    return GenreSchema.model_validate(genre)
 
 
 @router.delete("/{genre_id}", status_code=204)
@@ -79,6 +85,9 @@ def delete_genre(genre_id: int, db: Session = Depends(get_db)) -> None:
     if not genre:
         raise HTTPException(status_code=404, detail="Genre not found")
 
+    movie_ids = [movie.id for movie in genre.movies]
     db.delete(genre)
     db.commit()
+    suggestions.remove("genre", genre_id)
+    record_write("genre", [genre_id], movie=movie_ids)
     return None
@@ -1,48 +1,57 @@
 """Movie API endpoints with filtering support."""
 
-from typing import Any, List, Optional
+from typing import Dict, List, Literal, Optional, Set
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, insert, or_, select
 from sqlalchemy.orm import Query as SQLQuery
-from sqlalchemy.orm import Session, joinedload
-
-from app.api.deps import get_db
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.api.bulk import bulk_body, bulk_result, existing_ids, insert_rows, unknown_error
+from app.api.deps import get_db, get_read_db
+from app.api.fieldsets import MovieFieldset, MovieList, loader_options, movie_fieldset, render
+from app.api.filters import MOVIE_FILTERS, MatchMode, apply_filters
+from app.api.pagination import cursor_headers, load_by_ids, page_ids
+from app.api.responses import json_response
+from app.core.suggest import suggestions
+from app.core.versions import record_write
+from app.db import search_index
 from app.models import Actor, Director, Genre, Movie
+from app.models.movie import movie_actors, movie_genres
+from app.schemas import BulkResult
 from app.schemas import Movie as MovieSchema
 from app.schemas import MovieCreate, MovieDetail, MovieUpdate
 
 router = APIRouter()
 
+# Loader options for a single movie: the many-to-one director is joined, while
+# collections are fetched with one IN query each. List endpoints derive their
+# options from the requested fieldset (see app.api.fieldsets).
+MOVIE_DETAIL_OPTIONS = (
+    joinedload(Movie.director),
+    selectinload(Movie.genres),
+    selectinload(Movie.actors),
+    selectinload(Movie.ratings),
+)
 
-def apply_movie_filters(query: SQLQuery, **filters: Any) -> SQLQuery:
-    """Apply filters to movie query in a clean way."""
-    filter_mappings = [
-        ("genre", lambda q, v: q.join(Movie.genres).filter(Genre.name.ilike(f"%{v}%"))),
-        (
-            "director",
-            lambda q, v: q.join(Movie.director).filter(Director.name.ilike(f"%{v}%")),
-        ),
-        ("actor", lambda q, v: q.join(Movie.actors).filter(Actor.name.ilike(f"%{v}%"))),
-        ("year", lambda q, v: q.filter(Movie.release_year == v)),
-        ("min_year", lambda q, v: q.filter(Movie.release_year >= v)),
-        ("max_year", lambda q, v: q.filter(Movie.release_year <= v)),
-        ("status", lambda q, v: q.filter(Movie.status.ilike(f"%{v}%"))),
-        ("search", lambda q, v: q.filter(Movie.title.ilike(f"%{v}%"))),
-    ]
-
-    for filter_name, filter_func in filter_mappings:
-        if filters.get(filter_name):
-            query = filter_func(query, filters[filter_name])
+# MovieCreate/MovieUpdate field -> (association table, linked id column, entity id, label)
+MOVIE_LINKS = {
+    "genre_ids": (movie_genres, movie_genres.c.genre_id, Genre.id, "genre"),
+    "actor_ids": (movie_actors, movie_actors.c.actor_id, Actor.id, "actor"),
+}
 
-    return query
+MovieSort = Literal["id", "title", "release_year"]
+SearchSort = Literal["relevance", "id", "title", "release_year"]
 
 
-@router.get("/", response_model=List[MovieDetail])
+@router.get("/", response_model=MovieList)
 def get_movies(
     genre: Optional[str] = Query(None, description="Filter by genre name"),
+    genre_id: Optional[int] = Query(None, description="Filter by genre ID"),
     director: Optional[str] = Query(None, description="Filter by director name"),
+    director_id: Optional[int] = Query(None, description="Filter by director ID"),
     actor: Optional[str] = Query(None, description="Filter by actor name"),
+    actor_id: Optional[int] = Query(None, description="Filter by actor ID"),
     year: Optional[int] = Query(None, description="Filter by release year"),
     min_year: Optional[int] = Query(None, description="Minimum release year"),
     max_year: Optional[int] = Query(None, description="Maximum release year"),
@@ -50,166 +59,286 @@ def get_movies(
         None, description="Filter by status (Released, Coming Soon, etc.)"
     ),
     search: Optional[str] = Query(None, description="Search in title"),
+    match: MatchMode = Query(
+        "contains", description="How name filters match: exact, prefix or contains"
+    ),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Max records to return"),
-    db: Session = Depends(get_db),
-) -> List[MovieDetail]:
+    sort: MovieSort = Query("id", description="Sort key; ties are broken by id"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from X-Next-Cursor; replaces skip"
+    ),
+    fieldset: MovieFieldset = Depends(movie_fieldset),
+    db: Session = Depends(get_read_db),
+) -> Response:
     """
     Get list of movies with optional filters.
     All filtering is performed in the backend using SQLAlchemy queries.
     """
-    # Build base query with eager loading
-    query = db.query(Movie).options(
-        joinedload(Movie.director),
-        joinedload(Movie.genres),
-        joinedload(Movie.actors),
-        joinedload(Movie.ratings),
-    )
-
-    # Apply filters cleanly
-    query = apply_movie_filters(
-        query,
+    # Phase one: select a page of movie ids with filters applied
+    query = apply_filters(
+        db.query(Movie),
+        MOVIE_FILTERS,
+        match,
         genre=genre,
+        genre_id=genre_id,
         director=director,
+        director_id=director_id,
         actor=actor,
+        actor_id=actor_id,
         year=year,
         min_year=min_year,
         max_year=max_year,
         status=status,
         search=search,
     )
-
-    # Pagination
-    movies = query.distinct().offset(skip).limit(limit).all()
-
-    # Convert to MovieDetail (computed fields are automatic)
-    return [MovieDetail.model_validate(movie) for movie in movies]
+    ids, next_cursor = page_ids(query, Movie, skip, limit, sort, cursor)
+
+    # Phase two: load the requested columns and relationships for this page only
+    movies = load_by_ids(db, Movie, ids, loader_options(fieldset))
+    return json_response(render(db, movies, fieldset), headers=cursor_headers(next_cursor))
+
+
+def _ilike_search_query(db: Session, q: str) -> SQLQuery:
+    """Substring OR search through semi-joins, used when FTS5 is unavailable."""
+    pattern = f"%{q}%"
+    return db.query(Movie).filter(
+        or_(
+            Movie.title.ilike(pattern),
+            Movie.director.has(Director.name.ilike(pattern)),
+            Movie.actors.any(Actor.name.ilike(pattern)),
+            Movie.genres.any(Genre.name.ilike(pattern)),
+        )
+    )
 
 
-@router.get("/search", response_model=List[MovieDetail])
+@router.get("/search", response_model=MovieList)
 def search_movies(
     q: str = Query(
-        ..., min_length=1, description="Unified OR search across title, director, actor, genre"
+        ...,
+        min_length=1,
+        description="Prefix search across title, synopsis, director, actor, genre",
     ),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=100, description="Max records to return"),
-    db: Session = Depends(get_db),
-) -> List[MovieDetail]:
-    """Unified OR search across movie title, director, actor, and genre using ORM joins."""
-    # Eager load relations for response while using outer joins for filtering
-    query = (
-        db.query(Movie)
-        .options(
-            joinedload(Movie.director),
-            joinedload(Movie.genres),
-            joinedload(Movie.actors),
-            joinedload(Movie.ratings),
-        )
-        .outerjoin(Movie.director)
-        .outerjoin(Movie.actors)
-        .outerjoin(Movie.genres)
-        .filter(
-            or_(
-                Movie.title.ilike(f"%{q}%"),
-                Director.name.ilike(f"%{q}%"),
-                Actor.name.ilike(f"%{q}%"),
-                Genre.name.ilike(f"%{q}%"),
-            )
+    sort: SearchSort = Query(
+        "relevance", description="BM25 relevance or a sort key; ties are broken by id"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from X-Next-Cursor; replaces skip"
+    ),
+    fieldset: MovieFieldset = Depends(movie_fieldset),
+    db: Session = Depends(get_read_db),
+) -> Response:
+    """Full-text search across movie title, synopsis, director, actor, and genre.
+
+    Every word of `q` is matched as a prefix against the FTS5 index and results
+    are ranked by BM25. Without FTS5 support this degrades to substring matching.
+    """
+    sort_column = None
+    if search_index.fts5_available():
+        expression = search_index.match_expression(q)
+        if expression is None:
+            return json_response(render(db, [], fieldset))
+        query = (
+            db.query(Movie)
+            .join(search_index.movie_search, search_index.movie_search.c.rowid == Movie.id)
+            .filter(search_index.match_clause(expression))
         )
-        .distinct()
-    )
+        if sort == "relevance":
+            sort_column = search_index.rank_column()
+    else:
+        query = _ilike_search_query(db, q)
+        if sort == "relevance":
+            sort = "id"
+
+    ids, next_cursor = page_ids(query, Movie, skip, limit, sort, cursor, sort_column)
 
-    movies = query.offset(skip).limit(limit).all()
-    return [MovieDetail.model_validate(movie) for movie in movies]
+    movies = load_by_ids(db, Movie, ids, loader_options(fieldset))
+    return json_response(render(db, movies, fieldset), headers=cursor_headers(next_cursor))
 
 
 @router.get("/{movie_id}", response_model=MovieDetail)
-def get_movie(movie_id: int, db: Session = Depends(get_db)) -> MovieDetail:
+def get_movie(movie_id: int, db: Session = Depends(get_read_db)) -> Response:
     """Get detailed movie information by ID."""
-    movie = (
-        db.query(Movie)
-        .options(
-            joinedload(Movie.director),
-            joinedload(Movie.genres),
-            joinedload(Movie.actors),
-            joinedload(Movie.ratings),
-        )
-        .filter(Movie.id == movie_id)
-        .first()
-    )
+    movie = db.query(Movie).options(*MOVIE_DETAIL_OPTIONS).filter(Movie.id == movie_id).first()
 
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
 
-    return MovieDetail.model_validate(movie)
+    return json_response(MovieDetail.model_validate(movie), MovieDetail)
+
+
+def _check_links(db: Session, links: Dict[str, List[int]]) -> None:
+    """Raise 404 naming the ids in `links` that do not exist, with one IN query per field."""
+    problems = []
+    for field, ids in links.items():
+        if ids:
+            _, column, id_column, label = MOVIE_LINKS[field]
+            problem = unknown_error(label, ids, existing_ids(db, id_column, ids))
+            if problem:
+                problems.append(problem)
+    if problems:
+        raise HTTPException(status_code=404, detail="; ".join(problems))
+
+
+def _linked_ids(db: Session, field: str, movie_id: int) -> Set[int]:
+    table, column, _, _ = MOVIE_LINKS[field]
+    return set(db.execute(select(column).where(table.c.movie_id == movie_id)).scalars())
+
+
+def _write_links(
+    db: Session, field: str, movie_id: int, current: Set[int], wanted: Set[int]
+) -> None:
+    """Insert and delete only the links that differ between `current` and `wanted`."""
+    table, column, _, _ = MOVIE_LINKS[field]
+    removed = current - wanted
+    added = wanted - current
+    if removed:
+        db.execute(delete(table).where(table.c.movie_id == movie_id, column.in_(removed)))
+    if added:
+        db.execute(insert(table), [{"movie_id": movie_id, column.name: i} for i in sorted(added)])
 
 
 @router.post("/", response_model=MovieSchema, status_code=201)
 def create_movie(movie_data: MovieCreate, db: Session = Depends(get_db)) -> MovieSchema:
-    """Create a new movie."""
-    # Verify director exists
-    director = db.query(Director).filter(Director.id == movie_data.director_id).first()
-    if not director:
+    """Create a new movie; unknown director, genre or actor ids are a 404."""
+    if not existing_ids(db, Director.id, [movie_data.director_id]):
         raise HTTPException(status_code=404, detail="Director not found")
+    _check_links(db, {"genre_ids": movie_data.genre_ids, "actor_ids": movie_data.actor_ids})
 
-    # Create movie
     movie = Movie(**movie_data.model_dump(exclude={"genre_ids", "actor_ids"}))
     db.add(movie)
+    db.flush()
+    _write_links(db, "genre_ids", movie.id, set(), set(movie_data.genre_ids))
+    _write_links(db, "actor_ids", movie.id, set(), set(movie_data.actor_ids))
+    # Serialized before the commit expires the instance
+    result = MovieSchema.model_validate(movie)
     db.commit()
-    db.refresh(movie)
 
-    # Add genres
-    for genre_id in movie_data.genre_ids:
-        genre = db.query(Genre).filter(Genre.id == genre_id).first()
-        if genre:
-            movie.genres.append(genre)
+    suggestions.upsert("movie", result.id, result.title)
+    record_write(
+        "movie", [result.id], actor=set(movie_data.actor_ids), director=[result.director_id]
+    )
+    return result
+
 
-    # Add actors
-    for actor_id in movie_data.actor_ids:
-        actor = db.query(Actor).filter(Actor.id == actor_id).first()
-        if actor:
-            movie.actors.append(actor)
+@router.post("/bulk", response_model=BulkResult)
+def create_movies(
+    movies_data: List[MovieCreate] = bulk_body(), db: Session = Depends(get_db)
+) -> BulkResult:
+    """Create many movies with their genres and cast in one transaction.
 
+    Movies referencing an unknown director, genre or actor are reported and
+    not created.
+    """
+    directors = existing_ids(db, Director.id, (movie.director_id for movie in movies_data))
+    genres = existing_ids(db, Genre.id, (i for movie in movies_data for i in movie.genre_ids))
+    actors = existing_ids(db, Actor.id, (i for movie in movies_data for i in movie.actor_ids))
+
+    accepted, errors = [], {}
+    for index, movie_data in enumerate(movies_data):
+        problems = [
+            unknown_error("director", [movie_data.director_id], directors),
+            unknown_error("genre", movie_data.genre_ids, genres),
+            unknown_error("actor", movie_data.actor_ids, actors),
+        ]
+        if any(problems):
+            errors[index] = "; ".join(problem for problem in problems if problem)
+        else:
+            accepted.append(movie_data)
+
+    ids = insert_rows(
+        db, Movie, [movie.model_dump(exclude={"genre_ids", "actor_ids"}) for movie in accepted]
+    )
+    genre_rows = [
+        {"movie_id": movie_id, "genre_id": genre_id}
+        for movie_id, movie in zip(ids, accepted)
+        for genre_id in set(movie.genre_ids)
+    ]
+    actor_rows = [
+        {"movie_id": movie_id, "actor_id": actor_id}
+        for movie_id, movie in zip(ids, accepted)
+        for actor_id in set(movie.actor_ids)
+    ]
+    if genre_rows or actor_rows:
+        # The sync triggers would rewrite a movie's search document once per
+        # link; suspend them and index each movie once. The movie insert has
+        # opened the transaction, so the DDL is rolled back with it on failure.
+        conn = db.connection()
+        indexed = search_index.has_search_index(conn)
+        if indexed:
+            search_index.drop_search_triggers(conn)
+        if genre_rows:
+            db.execute(insert(movie_genres), genre_rows)
+        if actor_rows:
+            db.execute(insert(movie_actors), actor_rows)
+        if indexed:
+            search_index.reindex_movies(conn, ids)
+            search_index.create_search_triggers(conn)
     db.commit()
-    db.refresh(movie)
 
-    return movie
+    suggestions.upsert_many("movie", zip(ids, (movie.title for movie in accepted)))
+    record_write(
+        "movie",
+        ids,
+        actor={row["actor_id"] for row in actor_rows},
+        director={movie.director_id for movie in accepted},
+    )
+    return bulk_result(len(movies_data), ids, errors)
 
 
 @router.put("/{movie_id}", response_model=MovieSchema)
 def update_movie(
     movie_id: int, movie_data: MovieUpdate, db: Session = Depends(get_db)
 ) -> MovieSchema:
-    """Update an existing movie."""
+    """Update an existing movie.
+
+    ``genre_ids``/``actor_ids`` replace the movie's links; only the links that
+    change are inserted or deleted. Unknown ids are a 404.
+    """
     movie = db.query(Movie).filter(Movie.id == movie_id).first()
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
 
-    # Update basic fields
     update_data = movie_data.model_dump(exclude_unset=True, exclude={"genre_ids", "actor_ids"})
-    for field, value in update_data.items():
-        setattr(movie, field, value)
+    if update_data.get("director_id") is not None and not existing_ids(
+        db, Director.id, [update_data["director_id"]]
+    ):
+        raise HTTPException(status_code=404, detail="Director not found")
+    links = {
+        field: ids
+        for field, ids in (("genre_ids", movie_data.genre_ids), ("actor_ids", movie_data.actor_ids))
+        if ids is not None
+    }
+    _check_links(db, links)
 
-    # Update genres if provided
-    if movie_data.genre_ids is not None:
-        movie.genres.clear()
-        for genre_id in movie_data.genre_ids:
-            genre = db.query(Genre).filter(Genre.id == genre_id).first()
-            if genre:
-                movie.genres.append(genre)
-
-    # Update actors if provided
-    if movie_data.actor_ids is not None:
-        movie.actors.clear()
-        for actor_id in movie_data.actor_ids:
-            actor = db.query(Actor).filter(Actor.id == actor_id).first()
-            if actor:
-                movie.actors.append(actor)
+    # Actors and directors whose filmographies show this movie before the edit
+    previous_actor_ids = _linked_ids(db, "actor_ids", movie_id)
+    previous_director_id = movie.director_id
 
+    for field, value in update_data.items():
+        setattr(movie, field, value)
+    db.flush()
+
+    actor_ids = previous_actor_ids
+    for field, ids in links.items():
+        current = previous_actor_ids if field == "actor_ids" else _linked_ids(db, field, movie_id)
+        _write_links(db, field, movie_id, current, set(ids))
+        if field == "actor_ids":
+            actor_ids = set(ids)
+    # Serialized before the commit expires the instance
+    result = MovieSchema.model_validate(movie)
     db.commit()
-    db.refresh(movie)
 
-    return movie
+    suggestions.upsert("movie", result.id, result.title)
+    record_write(
+        "movie",
+        [result.id],
+        actor=previous_actor_ids | actor_ids,
+        director=[previous_director_id, result.director_id],
+    )
+    return result
 
 
 @router.delete("/{movie_id}", status_code=204)
@@ -219,5 +348,9 @@ def delete_movie(movie_id: int, db: Session = Depends(get_db)) -> None:
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
 
+    actor_ids = [actor.id for actor in movie.actors]
+    director_id = movie.director_id
     db.delete(movie)
     db.commit()
+    suggestions.remove("movie", movie_id)
+    record_write("movie", [movie_id], actor=actor_ids, director=[director_id])
@@ -5,8 +5,12 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.bulk import bulk_body, bulk_result, existing_ids, insert_rows, unknown_error
+from app.api.deps import get_db, get_read_db
+from app.core.versions import record_write
+from app.db.aggregates import refresh_rating_aggregates
 from app.models import Movie, Rating
+from app.schemas import BulkResult
 from app.schemas import Rating as RatingSchema
 from app.schemas import RatingCreate, RatingUpdate
 
@@ -14,7 +18,7 @@ router = APIRouter()
 
 
 @router.get("/movies/{movie_id}/ratings", response_model=List[RatingSchema])
-def get_movie_ratings(movie_id: int, db: Session = Depends(get_db)) -> List[RatingSchema]:
+def get_movie_ratings(movie_id: int, db: Session = Depends(get_read_db)) -> List[RatingSchema]:
     """Get all ratings for a specific movie."""
     movie = db.query(Movie).filter(Movie.id == movie_id).first()
     if not movie:
@@ -34,9 +38,36 @@ def create_rating(rating_data: RatingCreate, db: Session = Depends(get_db)) -> R
 
     rating = Rating(**rating_data.model_dump())
     db.add(rating)
+    db.flush()
+    refresh_rating_aggregates(db, [rating.movie_id])
     db.commit()
     db.refresh(rating)
-    return rating
+    record_write("rating", [rating.id], movie=[rating.movie_id])
+    return RatingSchema.model_validate(rating)
+
+
+@router.post("/ratings/bulk", response_model=BulkResult)
+def create_ratings(
+    ratings_data: List[RatingCreate] = bulk_body(), db: Session = Depends(get_db)
+) -> BulkResult:
+    """Create many ratings in one transaction; ratings of unknown movies are reported."""
+    movies = existing_ids(db, Movie.id, (rating.movie_id for rating in ratings_data))
+
+    rows, errors = [], {}
+    for index, rating_data in enumerate(ratings_data):
+        error = unknown_error("movie", [rating_data.movie_id], movies)
+        if error:
+            errors[index] = error
+        else:
+            rows.append(rating_data.model_dump())
+
+    ids = insert_rows(db, Rating, rows)
+    movie_ids = {row["movie_id"] for row in rows}
+    if movie_ids:
+        refresh_rating_aggregates(db, movie_ids)
+    db.commit()
+    record_write("rating", ids, movie=movie_ids)
+    return bulk_result(len(ratings_data), ids, errors)
 
 
 @router.put("/ratings/{rating_id}", response_model=RatingSchema)
@@ -52,9 +83,13 @@ def update_rating(
     for field, value in update_data.items():
         setattr(rating, field, value)
 
+    if "score" in update_data:
+        db.flush()
+        refresh_rating_aggregates(db, [rating.movie_id])
     db.commit()
     db.refresh(rating)
-    return rating
+    record_write("rating", [rating.id], movie=[rating.movie_id])
+    return RatingSchema.model_validate(rating)
 
 
 @router.delete("/ratings/{rating_id}", status_code=204)
@@ -64,6 +99,10 @@ def delete_rating(rating_id: int, db: Session = Depends(get_db)) -> None:
     if not rating:
         raise HTTPException(status_code=404, detail="Rating not found")
 
+    movie_id = rating.movie_id
     db.delete(rating)
+    db.flush()
+    refresh_rating_aggregates(db, [movie_id])
     db.commit()
+    record_write("rating", [rating_id], movie=[movie_id])
     return None
@@ -0,0 +1,33 @@
+"""Typeahead suggestion endpoint."""
+
+from typing import List, Optional, cast
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_read_db
+from app.core.suggest import suggestions
+from app.schemas import Suggestion, SuggestionType
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[Suggestion])
+def suggest(
+    q: str = Query(..., min_length=1, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Max suggestions to return"),
+    types: Optional[List[SuggestionType]] = Query(
+        None, alias="type", description="Restrict to these suggestion types"
+    ),
+    db: Session = Depends(get_read_db),
+) -> List[Suggestion]:
+    """Suggest movies, actors, directors and genres whose names start with `q`.
+
+    Served from the in-memory prefix index; the database is only read when the
+    index has not been built yet.
+    """
+    suggestions.ensure_built(db)
+    return [
+        Suggestion(type=cast(SuggestionType, kind), id=entity_id, label=label)
+        for kind, entity_id, label in suggestions.suggest(q, limit, types)
+    ]
@@ -0,0 +1,238 @@
+"""Sparse fieldsets for movie list endpoints.
+
+``fields`` selects the scalar movie columns to return and ``include`` the
+relationships. The selection drives loading as well as serialization:
+unrequested columns are deferred with ``load_only`` and unrequested
+relationships are never queried, so a grid that only needs titles and posters
+does not pay for cast bios, reviews or director records.
+
+``shape=sideload`` replaces the embedded director, genres and actors with
+``director_id``/``genre_ids``/``actor_ids`` on each movie and a top-level
+``included`` map holding every referenced entity once. The ids come straight
+from the association tables and each entity type is fetched with one ``IN``
+query, so a page that shares a handful of genres and a few popular actors
+serializes them once instead of once per movie.
+"""
+
+from collections import defaultdict
+from typing import (
+    Any,
+    Collection,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Table, select
+from sqlalchemy.orm import Session, joinedload, load_only, noload, selectinload
+
+from app.api.responses import schema_fields, trusted_row
+from app.models import Actor, Director, Genre, Movie
+from app.models.movie import movie_actors, movie_genres
+from app.schemas import Actor as ActorSchema
+from app.schemas import Director as DirectorSchema
+from app.schemas import Genre as GenreSchema
+from app.schemas import MovieListItem
+from app.schemas import Rating as RatingSchema
+from app.schemas import SideloadedMovies
+
+MOVIE_FIELDS = (
+    "id",
+    "title",
+    "release_year",
+    "synopsis",
+    "poster_url",
+    "duration_minutes",
+    "status",
+    "director_id",
+    "average_rating",
+    "rating_count",
+)
+
+# Relationship -> loader used when it is included
+MOVIE_RELATIONSHIPS = {
+    "director": joinedload(Movie.director),
+    "genres": selectinload(Movie.genres),
+    "actors": selectinload(Movie.actors),
+    "ratings": selectinload(Movie.ratings),
+}
+
+DEFAULT_INCLUDE = ("director", "genres", "actors")
+
+# Relationship -> fields of its schema, in output order
+RELATED_FIELDS = {
+    "director": schema_fields(DirectorSchema),
+    "genres": schema_fields(GenreSchema),
+    "actors": schema_fields(ActorSchema),
+    "ratings": schema_fields(RatingSchema),
+}
+
+# Relationships moved to `included` by shape=sideload; ratings stay embedded
+# because no two movies share one
+SIDELOADED = ("director", "genres", "actors")
+
+MovieShape = Literal["embedded", "sideload"]
+
+# Documented response model of the movie list endpoints
+MovieList = Union[List[MovieListItem], SideloadedMovies]
+
+
+class MovieFieldset(NamedTuple):
+    """Scalar fields and relationships requested for each movie."""
+
+    fields: Tuple[str, ...]
+    include: Tuple[str, ...]
+    shape: MovieShape = "embedded"
+
+    @property
+    def embedded(self) -> Tuple[str, ...]:
+        """Relationships serialized inside each movie."""
+        if self.shape == "embedded":
+            return self.include
+        return tuple(name for name in self.include if name not in SIDELOADED)
+
+
+def _parse(
+    value: Optional[str], allowed: Collection[str], default: Sequence[str], name: str
+) -> Tuple[str, ...]:
+    if value is None:
+        return tuple(default)
+
+    requested = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {name}: {', '.join(unknown)}")
+    # Keep the canonical order so equivalent requests produce identical output
+    return tuple(item for item in allowed if item in requested)
+
+
+def movie_fieldset(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated movie fields to return; id is always included"
+    ),
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated relationships to embed: director, genres, actors, "
+        "ratings (default: director,genres,actors)",
+    ),
+    shape: MovieShape = Query(
+        "embedded",
+        description="embedded nests relationships in each movie; sideload returns "
+        "{movies, included} with director, genres and actors referenced by id",
+    ),
+) -> MovieFieldset:
+    """Dependency parsing the `fields`, `include` and `shape` query parameters."""
+    selected = _parse(fields, MOVIE_FIELDS, MOVIE_FIELDS, "fields")
+    if "id" not in selected:
+        selected = ("id",) + selected
+    included = _parse(include, MOVIE_RELATIONSHIPS, DEFAULT_INCLUDE, "include")
+    return MovieFieldset(selected, included, shape)
+
+
+def loader_options(fieldset: MovieFieldset) -> List[Any]:
+    """Column deferral and relationship loaders for `fieldset`."""
+    columns = fieldset.fields
+    if fieldset.shape == "sideload" and "director" in fieldset.include:
+        columns += ("director_id",)
+    options: List[Any] = [load_only(*(getattr(Movie, field) for field in columns))]
+    for name, loader in MOVIE_RELATIONSHIPS.items():
+        options.append(loader if name in fieldset.embedded else noload(getattr(Movie, name)))
+    return options
+
+
+def _round_average(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+def _movie_row(movie: Movie, fields: Sequence[str], relationships: Sequence[str]) -> Dict[str, Any]:
+    data = trusted_row(movie, fields)
+    if "average_rating" in data:
+        data["average_rating"] = _round_average(data["average_rating"])
+    for name in relationships:
+        related_fields = RELATED_FIELDS[name]
+        value = getattr(movie, name)
+        if name == "director":
+            data[name] = None if value is None else trusted_row(value, related_fields)
+        else:
+            data[name] = [trusted_row(item, related_fields) for item in value]
+    return data
+
+
+def serialize(movie: Movie, fieldset: MovieFieldset) -> Dict[str, Any]:
+    """Build a list item with only the attributes selected by `fieldset`.
+
+    The result is a trusted row shaped like `MovieListItem` (see
+    `app.api.responses`).
+    """
+    return _movie_row(movie, fieldset.fields, fieldset.include)
+
+
+def _related_ids(
+    db: Session, association: Table, column: str, movie_ids: Sequence[int]
+) -> Dict[int, List[int]]:
+    """Map each movie id to the ids it links to through `association`."""
+    related = association.c[column]
+    rows = db.execute(
+        select(association.c.movie_id, related)
+        .where(association.c.movie_id.in_(movie_ids))
+        .order_by(association.c.movie_id, related)
+    )
+    links: Dict[int, List[int]] = defaultdict(list)
+    for movie_id, related_id in rows:
+        links[movie_id].append(related_id)
+    return links
+
+
+def _included(db: Session, model: Type[Any], fields: Sequence[str], ids: Any) -> Dict[int, Any]:
+    """Load and serialize each entity in `ids` once, keyed by id."""
+    if not ids:
+        return {}
+    entities = db.query(model).filter(model.id.in_(ids)).order_by(model.id)
+    return {entity.id: trusted_row(entity, fields) for entity in entities}
+
+
+def sideload(db: Session, movies: Sequence[Movie], fieldset: MovieFieldset) -> Dict[str, Any]:
+    """Build a side-loaded page shaped like `SideloadedMovies`.
+
+    Movies reference the entities held in `included`.
+    """
+    movie_ids = [movie.id for movie in movies]
+    items = []
+    for movie in movies:
+        data = _movie_row(movie, fieldset.fields, fieldset.embedded)
+        if "director" in fieldset.include:
+            data["director_id"] = movie.director_id
+        items.append(data)
+
+    included: Dict[str, Any] = {}
+    if "director" in fieldset.include:
+        director_ids = {movie.director_id for movie in movies}
+        included["directors"] = _included(db, Director, RELATED_FIELDS["director"], director_ids)
+    if "genres" in fieldset.include:
+        genre_ids = _related_ids(db, movie_genres, "genre_id", movie_ids)
+        for data in items:
+            data["genre_ids"] = genre_ids.get(data["id"], [])
+        all_genre_ids = {i for ids in genre_ids.values() for i in ids}
+        included["genres"] = _included(db, Genre, RELATED_FIELDS["genres"], all_genre_ids)
+    if "actors" in fieldset.include:
+        actor_ids = _related_ids(db, movie_actors, "actor_id", movie_ids)
+        for data in items:
+            data["actor_ids"] = actor_ids.get(data["id"], [])
+        all_actor_ids = {i for ids in actor_ids.values() for i in ids}
+        included["actors"] = _included(db, Actor, RELATED_FIELDS["actors"], all_actor_ids)
+
+    return {"movies": items, "included": included}
+
+
+def render(db: Session, movies: Sequence[Movie], fieldset: MovieFieldset) -> Any:
+    """Trusted payload for a page of movies in the shape requested by `fieldset`."""
+    if fieldset.shape == "sideload":
+        return sideload(db, movies, fieldset)
+    return [serialize(movie, fieldset) for movie in movies]
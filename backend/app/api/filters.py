@@ -0,0 +1,120 @@
+"""Filter compilation for the movie, actor, director and genre list endpoints.
+
+Each filter name maps to a builder returning a single predicate on the listed
+entity. Relationship filters are ``IN`` semi-joins over the association
+tables, so they never multiply rows and list queries never need ``DISTINCT``,
+however many filters are combined.
+
+Name filters honour a match mode. ``exact`` and ``prefix`` compare the
+case-folded shadow columns (see `app.models.folded`) with ``=`` or a range, so
+SQLite answers them with an index seek; ``contains`` keeps the substring
+``ILIKE`` behaviour, which has to scan.
+"""
+
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Query as SQLQuery
+from sqlalchemy.orm import QueryableAttribute
+from sqlalchemy.sql import ColumnElement
+
+from app.core.text import fold
+from app.models import Actor, Director, Genre, Movie
+from app.models.movie import movie_actors, movie_genres
+
+MatchMode = Literal["exact", "prefix", "contains"]
+
+# Builders receive the filter value and the match mode
+FilterMap = Dict[str, Callable[[Any, MatchMode], ColumnElement]]
+
+# Sorts after every string that starts with a given prefix
+_PREFIX_UPPER_BOUND = "\U0010ffff"
+
+
+def match_name(
+    column: QueryableAttribute[str],
+    folded_column: QueryableAttribute[Optional[str]],
+    value: str,
+    match: MatchMode,
+) -> ColumnElement:
+    """Predicate comparing a name column with `value` under `match`."""
+    if match == "exact":
+        return folded_column == fold(value)
+    if match == "prefix":
+        prefix = fold(value)
+        return and_(folded_column >= prefix, folded_column < prefix + _PREFIX_UPPER_BOUND)
+    return column.ilike(f"%{value}%")
+
+
+def _genre_ids(value: str, match: MatchMode) -> Any:
+    return select(Genre.id).where(match_name(Genre.name, Genre.name_folded, value, match))
+
+
+def _movies_in_genres(genre_ids: Any) -> Any:
+    return select(movie_genres.c.movie_id).where(movie_genres.c.genre_id.in_(genre_ids))
+
+
+def _movies_with_actors(actor_ids: Any) -> Any:
+    return select(movie_actors.c.movie_id).where(movie_actors.c.actor_id.in_(actor_ids))
+
+
+def _actors_in_movies(movie_ids: Any) -> Any:
+    return select(movie_actors.c.actor_id).where(movie_actors.c.movie_id.in_(movie_ids))
+
+
+MOVIE_FILTERS: FilterMap = {
+    "genre": lambda v, m: Movie.id.in_(_movies_in_genres(_genre_ids(v, m))),
+    "genre_id": lambda v, m: Movie.id.in_(_movies_in_genres([v])),
+    "director": lambda v, m: Movie.director_id.in_(
+        select(Director.id).where(match_name(Director.name, Director.name_folded, v, m))
+    ),
+    "director_id": lambda v, m: Movie.director_id == v,
+    "actor": lambda v, m: Movie.id.in_(
+        _movies_with_actors(select(Actor.id).where(match_name(Actor.name, Actor.name_folded, v, m)))
+    ),
+    "actor_id": lambda v, m: Movie.id.in_(_movies_with_actors([v])),
+    "year": lambda v, m: Movie.release_year == v,
+    "min_year": lambda v, m: Movie.release_year >= v,
+    "max_year": lambda v, m: Movie.release_year <= v,
+    "status": lambda v, m: Movie.status.ilike(f"%{v}%"),
+    "search": lambda v, m: match_name(Movie.title, Movie.title_folded, v, m),
+}
+
+ACTOR_FILTERS: FilterMap = {
+    "genre": lambda v, m: Actor.id.in_(_actors_in_movies(_movies_in_genres(_genre_ids(v, m)))),
+    "genre_id": lambda v, m: Actor.id.in_(_actors_in_movies(_movies_in_genres([v]))),
+    "movie": lambda v, m: Actor.id.in_(
+        _actors_in_movies(select(Movie.id).where(match_name(Movie.title, Movie.title_folded, v, m)))
+    ),
+    "movie_id": lambda v, m: Actor.id.in_(_actors_in_movies([v])),
+    "search": lambda v, m: match_name(Actor.name, Actor.name_folded, v, m),
+}
+
+DIRECTOR_FILTERS: FilterMap = {
+    "genre": lambda v, m: Director.id.in_(
+        select(Movie.director_id).where(Movie.id.in_(_movies_in_genres(_genre_ids(v, m))))
+    ),
+    "genre_id": lambda v, m: Director.id.in_(
+        select(Movie.director_id).where(Movie.id.in_(_movies_in_genres([v])))
+    ),
+    "search": lambda v, m: match_name(Director.name, Director.name_folded, v, m),
+}
+
+GENRE_FILTERS: FilterMap = {
+    "search": lambda v, m: match_name(Genre.name, Genre.name_folded, v, m),
+}
+
+
+def compile_filters(
+    filter_map: FilterMap, match: MatchMode = "contains", **filters: Any
+) -> List[ColumnElement]:
+    """Build the predicates for every filter that was given a value."""
+    return [build(filters[name], match) for name, build in filter_map.items() if filters.get(name)]
+
+
+def apply_filters(
+    query: SQLQuery, filter_map: FilterMap, match: MatchMode = "contains", **filters: Any
+) -> SQLQuery:
+    """Apply the compiled predicates of `filters` to `query`."""
+    predicates = compile_filters(filter_map, match, **filters)
+    return query.filter(*predicates) if predicates else query
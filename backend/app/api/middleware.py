@@ -0,0 +1,348 @@
+"""ASGI middleware for the API."""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics, querystats
+from app.core.cache import CachedResponse, Headers, ResponseCache, response_cache
+from app.core.versions import VersionCounters, record_external_write, versions
+from app.db.data_versions import DataVersions, data_versions
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache"
+ETAG_HEADER = "ETag"
+STATEMENTS_HEADER = "X-DB-Statements"
+DB_TIME_HEADER = "X-DB-Time-Ms"
+
+# Path prefix -> entity types whose writes invalidate responses under it
+CACHED_ROUTES = (
+    ("/api/movies", ("movie", "director", "genre", "actor", "rating")),
+    ("/api/actors", ("actor", "movie", "genre")),
+    ("/api/directors", ("director", "movie", "genre")),
+    ("/api/genres", ("genre",)),
+    ("/api/suggest", ("movie", "actor", "director", "genre")),
+)
+
+# Detail routes versioned by a single row: /api/<collection>/<id>[/ratings]
+DETAIL_ROUTE = re.compile(r"^/api/(movies|actors|directors|genres)/(\d+)(?:/ratings)?$")
+DETAIL_TABLES = {"movies": "movie", "actors": "actor", "directors": "director", "genres": "genre"}
+
+
+def route_tags(path: str) -> Optional[Tuple[str, ...]]:
+    """Entity types a GET of `path` depends on, or ``None`` if it is not cached."""
+    for prefix, tags in CACHED_ROUTES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return tags
+    return None
+
+
+def cache_key(scope: Scope) -> str:
+    """Path plus query parameters in a canonical order."""
+    params = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    return f"{scope['path']}?{urlencode(sorted(params))}"
+
+
+def entity_tag(scope: Scope, counters: VersionCounters = versions) -> Optional[str]:
+    """Strong ETag for a GET of `scope`, or ``None`` if the route is not versioned."""
+    tags = route_tags(scope["path"])
+    if tags is None:
+        return None
+    detail = DETAIL_ROUTE.match(scope["path"])
+    if detail:
+        row = counters.row_version(DETAIL_TABLES[detail.group(1)], int(detail.group(2)))
+        # Writes from other processes name no rows, so they move every detail that may embed them
+        state: Any = (row, counters.external_versions(tags))
+    else:
+        state = counters.table_versions(tags)
+    digest = hashlib.blake2b(f"{cache_key(scope)}|{state}".encode(), digest_size=12)
+    return f'"{counters.epoch}-{digest.hexdigest()}"'
+
+
+def _if_none_match(scope: Scope) -> Optional[str]:
+    headers: List[Tuple[bytes, bytes]] = scope["headers"]
+    for name, value in headers:
+        if name == b"if-none-match":
+            return value.decode("latin-1")
+    return None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of `etag` against an ``If-None-Match`` header value."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+class DataVersionMiddleware:
+    """Apply writes committed by other processes before a GET is answered.
+
+    Sits outside `ETagMiddleware` and `ResponseCacheMiddleware` so neither
+    answers from state another worker or the CLI has since made stale. Only
+    GETs of routes with entity tags are checked, in the thread pool since the
+    check is a database query that may wait on another process's write lock:
+    one ``PRAGMA data_version`` unless something was committed.
+    """
+
+    def __init__(self, app: ASGIApp, watcher: DataVersions = data_versions) -> None:
+        self.app = app
+        self.watcher = watcher
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and route_tags(scope["path"]) is not None
+        ):
+            changed = await run_in_threadpool(self.watcher.changed)
+            if changed:
+                record_external_write(changed)
+        await self.app(scope, receive, send)
+
+
+class ETagMiddleware:
+    """Tag GET responses with version-derived ETags and answer matches with 304.
+
+    The ETag depends only on the path, the query and the version counters, so
+    a conditional request is answered without querying the catalog (only
+    `DataVersionMiddleware`'s version check runs first).
+    """
+
+    def __init__(self, app: ASGIApp, counters: VersionCounters = versions) -> None:
+        self.app = app
+        self.counters = counters
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        etag = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            etag = entity_tag(scope, self.counters)
+        if etag is None:
+            await self.app(scope, receive, send)
+            return
+
+        header = (b"etag", etag.encode())
+        if_none_match = _if_none_match(scope)
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": [header]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": list(message.get("headers", [])) + [header]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+class QueryStatsMiddleware:
+    """Count the SQL statements and database time of each request.
+
+    In debug mode (``API_DEBUG=1``) the totals are added to the response as
+    `STATEMENTS_HEADER` and `DB_TIME_HEADER`; responses served from the cache
+    or answered with 304 report the zero queries they cost.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = f"{scope['method']} {route_template(scope.get('app'), scope['path'])}"
+        with querystats.track_queries(route) as stats:
+            if not querystats.DEBUG_HEADERS:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((STATEMENTS_HEADER.lower().encode(), b"%d" % stats.statements))
+                    milliseconds = f"{stats.seconds * 1000:.3f}".encode()
+                    headers.append((DB_TIME_HEADER.lower().encode(), milliseconds))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+
+@lru_cache(maxsize=4096)
+def route_template(app: Any, path: str) -> str:
+    """Path template of the route serving `path`, e.g. ``/api/movies/{movie_id}``.
+
+    Used as the metrics and slow-query label so ids do not create a series
+    each; paths no route matches share ``unmatched``.
+    """
+    for route in getattr(app, "routes", ()):
+        regex = getattr(route, "path_regex", None)
+        if regex is not None and regex.match(path):
+            return str(route.path)
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """Record request counts, latency, size, in-flight requests and DB time.
+
+    Sits inside `QueryStatsMiddleware` so the request's query stats are
+    still current when the response completes.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_and_measure(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.requests_in_flight.dec(method)
+            route = route_template(scope.get("app"), scope["path"])
+            metrics.requests_total.inc(method, route, str(status))
+            metrics.request_duration.observe(elapsed, method, route)
+            metrics.response_size.observe(size, method, route)
+            stats = querystats.current_stats.get()
+            if stats is not None:
+                metrics.db_duration.observe(stats.seconds, method, route)
+                metrics.db_statements.inc(method, route, amount=stats.statements)
+
+
+class _Recorder:
+    """Collects the messages of one response so it can be stored."""
+
+    def __init__(self) -> None:
+        self.status = 0
+        self.headers: Headers = []
+        self.chunks: List[bytes] = []
+        self.complete = False
+
+    def record(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            self.chunks.append(message.get("body", b""))
+            self.complete = not message.get("more_body", False)
+
+
+def _with_cache_status(headers: Headers, state: str) -> Headers:
+    return headers + [(CACHE_STATUS_HEADER.lower().encode(), state.encode())]
+
+
+class ResponseCacheMiddleware:
+    """Serve cacheable GET requests from `ResponseCache`.
+
+    Stale entries are returned immediately while a worker thread re-runs the
+    request against the application and stores the fresh response.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache = response_cache) -> None:
+        self.app = app
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tags = None
+        if scope["type"] == "http" and scope["method"] == "GET" and self.cache.enabled:
+            tags = route_tags(scope["path"])
+        if tags is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope)
+        entry, stale = self.cache.get(key)
+        if entry is not None:
+            if stale and self.cache.begin_refresh(key):
+                self._executor.submit(self._refresh, dict(scope), key, tags)
+            await self._replay(send, entry, "STALE" if stale else "HIT")
+            return
+
+        generation = self.cache.generation(tags)
+        recorder = _Recorder()
+
+        async def send_and_record(message: Message) -> None:
+            recorder.record(message)
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": _with_cache_status(recorder.headers, "MISS")}
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
+        self._store(key, tags, generation, recorder)
+
+    async def _replay(self, send: Send, entry: CachedResponse, state: str) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": _with_cache_status(entry.headers, state),
+            }
+        )
+        await send({"type": "http.response.body", "body": entry.body})
+
+    def _store(
+        self, key: str, tags: Tuple[str, ...], generation: Tuple[int, ...], recorder: _Recorder
+    ) -> None:
+        if recorder.complete and recorder.status == 200:
+            body = b"".join(recorder.chunks)
+            self.cache.put(key, recorder.status, recorder.headers, body, tags, generation)
+
+    def _refresh(self, scope: Dict[str, Any], key: str, tags: Tuple[str, ...]) -> None:
+        """Re-run a request on a worker thread and store the response."""
+        try:
+            asyncio.run(self._fetch(scope, key, tags))
+        except Exception:
+            logger.exception("Refreshing cached response for %s failed", key)
+        finally:
+            self.cache.end_refresh(key)
+
+    async def _fetch(self, scope: Dict[str, Any], key: str, tags: Tuple[str, ...]) -> None:
+        generation = self.cache.generation(tags)
+        recorder = _Recorder()
+        received = False
+
+        async def receive() -> Message:
+            nonlocal received
+            if received:
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: Message) -> None:
+            recorder.record(message)
+
+        await self.app(scope, receive, send)
+        self._store(key, tags, generation, recorder)
@@ -0,0 +1,114 @@
+"""Two-phase pagination helpers for list endpoints.
+
+Phase one selects a page of primary keys with all filters applied; filters
+are semi-joins (see `app.api.filters`), so ``OFFSET``/``LIMIT`` count entities
+instead of rows of a joined relationship product. Phase two loads the page by
+primary key, letting the caller attach loader options that fetch relationships in set-based batches (``selectinload``
+issues one ``IN`` query per relationship for the whole page).
+
+Pages can be addressed by ``skip`` or by an opaque keyset ``cursor``. A cursor
+encodes the sort key of the last row of the previous page, so the next page
+starts with an index seek on ``(sort column, id)`` instead of rescanning every
+earlier row; each page costs the same regardless of its depth.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query as SQLQuery
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# JSON types a sort column value can decode to; anything else cannot be bound
+SORT_VALUE_TYPES = (str, int, float, type(None))
+
+
+def encode_cursor(sort: str, key: Sequence[Any]) -> str:
+    """Encode a sort name and the last row's sort key as an opaque cursor."""
+    payload = json.dumps({"s": sort, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def cursor_headers(next_cursor: Optional[str]) -> Optional[Dict[str, str]]:
+    """Response headers announcing `next_cursor`, if there is a next page."""
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    """Decode a cursor produced by `encode_cursor` for the given sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key: List[Any] = payload["k"]
+        valid = (
+            payload["s"] == sort
+            and isinstance(key, list)
+            and len(key) == 2
+            and isinstance(key[0], SORT_VALUE_TYPES)
+            # bool is an int subclass
+            and isinstance(key[1], int)
+            and not isinstance(key[1], bool)
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        valid = False
+
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def page_ids(
+    query: SQLQuery,
+    model: Type[Any],
+    skip: int,
+    limit: int,
+    sort: str = "id",
+    cursor: Optional[str] = None,
+    sort_column: Optional[ColumnElement] = None,
+) -> Tuple[List[int], Optional[str]]:
+    """Return one page of primary keys and the cursor for the next page.
+
+    Rows are ordered by ``(sort, id)``; ``sort`` names a column of ``model``
+    unless ``sort_column`` supplies the expression to order by. When ``cursor``
+    is given it replaces ``skip``. The next cursor is ``None`` once the last
+    page has been reached.
+    """
+    if sort_column is None:
+        sort_column = getattr(model, sort)
+    order = [model.id] if sort == "id" else [sort_column, model.id]
+    query = query.with_entities(sort_column, model.id).order_by(*order)
+
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort)
+        if sort == "id":
+            query = query.filter(model.id > last_id)
+        else:
+            query = query.filter(tuple_(sort_column, model.id) > tuple_(last_value, last_id))
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort, rows[-1])
+    return [row[1] for row in rows], next_cursor
+
+
+def load_by_ids(
+    db: Session, model: Type[Any], ids: Sequence[int], options: Sequence[Any] = ()
+) -> List[Any]:
+    """Load entities for ``ids`` with loader ``options``, preserving id order."""
+    if not ids:
+        return []
+
+    entities = db.query(model).options(*options).filter(model.id.in_(ids)).all()
+    by_id = {entity.id: entity for entity in entities}
+    return [by_id[entity_id] for entity_id in ids if entity_id in by_id]
@@ -0,0 +1,52 @@
+"""Single-pass JSON responses for read endpoints.
+
+When an endpoint returns plain data, FastAPI validates it again against the
+route's ``response_model``, converts the result to ``jsonable`` Python objects
+and only then encodes it with ``json.dumps``. The read endpoints return
+`json_response` instead, which writes JSON bytes directly with pydantic-core.
+Returning a `Response` skips FastAPI's response handling entirely; the routes
+keep ``response_model`` so the OpenAPI schema is unchanged.
+
+List pages are built as trusted rows: plain dicts read from ORM objects in
+schema field order, with no validation, since every row was validated on its
+way into the database. Detail responses validate their schema once.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Type
+
+import pydantic_core
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def schema_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Field names of `schema` in declaration (and output) order."""
+    return tuple(schema.model_fields)
+
+
+def trusted_row(entity: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """Read `fields` from an ORM object into a dict without validation."""
+    return {name: getattr(entity, name) for name in fields}
+
+
+def json_response(
+    content: Any,
+    schema: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serialize `content` into a JSON response.
+
+    With a `schema`, `content` holds validated instances of it and is dumped
+    through a cached `TypeAdapter`; without one it is trusted plain data.
+    """
+    if schema is None:
+        body = pydantic_core.to_json(content)
+    else:
+        body = _adapter(schema).dump_json(content)
+    return Response(body, headers=headers, media_type="application/json")
@@ -0,0 +1,130 @@
+"""Management commands for the Movie Explorer backend.
+
+Usage:
+    python -m app.cli init
+    python -m app.cli seed
+    python -m app.cli reset
+    python -m app.cli build-snapshot
+    python -m app.cli generate --movies 100000 [--seed 0]
+    python -m app.cli import-imdb DIRECTORY [--title-types movie tvMovie] [--chunk-size 10000]
+    python -m app.cli rebuild-ratings
+    python -m app.cli rebuild-search
+"""
+
+import argparse
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from app.db.aggregates import refresh_rating_aggregates
+from app.db.bootstrap import database_lock, prepare_database, reset_database
+from app.db.database import DB_PATH, SessionLocal, engine, init_db
+from app.db.imdb import import_imdb as load_imdb
+from app.db.search_index import fts5_available, rebuild_search_index
+from app.db.snapshot import build_snapshot
+from app.db.synthetic import CatalogSpec, generate_catalog
+
+logger = logging.getLogger(__name__)
+
+
+def init() -> None:
+    """Create missing tables, columns and indexes without seeding."""
+    with database_lock():
+        init_db()
+    logger.info("Schema ready at %s", DB_PATH)
+
+
+def seed() -> None:
+    """Prepare the database as the server does on startup, seeding it if empty."""
+    prepare_database()
+    logger.info("Database ready at %s", DB_PATH)
+
+
+def reset() -> None:
+    """Drop all data and reseed the sample catalog."""
+    reset_database()
+    logger.info("Database reset at %s", DB_PATH)
+
+
+def generate(**options: Any) -> None:
+    """Append a deterministic synthetic catalog for scale testing."""
+    spec = CatalogSpec(**options)
+    with database_lock():
+        init_db()
+        counts = generate_catalog(engine, spec)
+    logger.info("Generated %s", ", ".join(f"{count} {table}" for table, count in counts.items()))
+
+
+def import_imdb(**options) -> None:
+    """Append the IMDb dataset dumps found in a directory."""
+    with database_lock():
+        init_db()
+        counts = load_imdb(engine, **options)
+    logger.info("Imported %s", ", ".join(f"{count} {table}" for table, count in counts.items()))
+
+
+def rebuild_ratings() -> None:
+    """Recompute the stored rating aggregates of every movie from `ratings`."""
+    init_db()
+    db = SessionLocal()
+    try:
+        refresh_rating_aggregates(db)
+        db.commit()
+    finally:
+        db.close()
+    logger.info("Rating aggregates rebuilt")
+
+
+def rebuild_search() -> None:
+    """Rewrite the full-text search index from the source tables."""
+    if not fts5_available():
+        logger.error("SQLite was built without FTS5; search uses ILIKE matching")
+        return
+    init_db()
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    logger.info("Search index rebuilt")
+
+
+COMMANDS: Dict[str, Callable[..., Any]] = {
+    "init": init,
+    "seed": seed,
+    "reset": reset,
+    "build-snapshot": build_snapshot,
+    "generate": generate,
+    "import-imdb": import_imdb,
+    "rebuild-ratings": rebuild_ratings,
+    "rebuild-search": rebuild_search,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse arguments and run the selected command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description=(__doc__ or "").splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for name, command in COMMANDS.items():
+        commands.add_parser(name, help=(command.__doc__ or "").splitlines()[0])
+
+    defaults = CatalogSpec._field_defaults
+    for option in ("movies", "actors", "directors", "seed", "chunk_size"):
+        commands.choices["generate"].add_argument(
+            f"--{option.replace('_', '-')}", type=int, default=defaults[option]
+        )
+    commands.choices["generate"].add_argument(
+        "--mean-ratings", type=float, default=defaults["mean_ratings"]
+    )
+
+    imdb = commands.choices["import-imdb"]
+    imdb.add_argument("directory", help="directory holding the title.*/name.* .tsv.gz files")
+    imdb.add_argument("--title-types", nargs="+", default=["movie"], metavar="TYPE")
+    imdb.add_argument("--include-adult", action="store_true")
+    imdb.add_argument("--chunk-size", type=int, default=10_000)
+
+    options = vars(parser.parse_args(argv))
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    COMMANDS[options.pop("command")](**options)
+
+
+if __name__ == "__main__":
+    main()
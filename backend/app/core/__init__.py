@@ -0,0 +1 @@
+"""In-process services shared by the API routers."""
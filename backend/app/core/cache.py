@@ -0,0 +1,195 @@
+"""In-process LRU + TTL cache for GET responses.
+
+Entries hold the complete response (status, headers and body bytes) keyed by
+path and normalized query string, so a hit skips the database, the ORM and
+serialization. Each entry is tagged with the entity types it was built from
+("movie", "actor", ...). The write endpoints call `invalidate` with the type
+they changed after committing, which drops every entry carrying that tag.
+
+Entries are fresh for ``ttl`` seconds and may then be served stale for
+another ``stale_ttl`` seconds while one background request refreshes them
+(stale-while-revalidate). Per-tag generations guard against a slow request
+storing a response computed before an invalidation it raced with.
+
+The cache is bounded by entry count and by total body/header bytes, evicting
+least recently used entries first. It is per process. Writes committed by
+other workers or the CLI invalidate it through the shared versions of
+`app.db.data_versions`, checked before every GET (see
+`app.core.versions.record_external_write`).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_ENTRIES", "1024"))
+DEFAULT_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+DEFAULT_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", "30"))
+
+
+class CachedResponse:
+    """A stored response and the bookkeeping needed to expire and evict it."""
+
+    __slots__ = ("status", "headers", "body", "tags", "stored_at", "size")
+
+    def __init__(
+        self, status: int, headers: Headers, body: bytes, tags: Sequence[str], stored_at: float
+    ) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.tags = frozenset(tags)
+        self.stored_at = stored_at
+        self.size = len(body) + sum(len(name) + len(value) for name, value in headers)
+
+
+class ResponseCache:
+    """Bounded LRU cache of responses with TTL expiry and tag invalidation."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Tuple[Optional[CachedResponse], bool]:
+        """Look up `key`, returning the entry (or ``None``) and whether it is stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._clock() - entry.stored_at
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    if age < self.ttl:
+                        self.hits += 1
+                        return entry, False
+                    self.stale_hits += 1
+                    return entry, True
+                self._discard(key)
+            self.misses += 1
+            return None, False
+
+    def generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Current invalidation generation of each tag, to pass back to `put`."""
+        return tuple(self._generations[tag] for tag in tags)
+
+    def put(
+        self,
+        key: str,
+        status: int,
+        headers: Headers,
+        body: bytes,
+        tags: Sequence[str],
+        generation: Tuple[int, ...],
+    ) -> bool:
+        """Store a response unless one of `tags` was invalidated since `generation`."""
+        entry = CachedResponse(status, headers, body, tags, self._clock())
+        if entry.size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if self.generation(tags) != generation:
+                return False
+            self._discard(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry built from any of `tags`."""
+        changed = set(tags)
+        with self._lock:
+            for tag in changed:
+                self._generations[tag] += 1
+            stale = [key for key, entry in self._entries.items() if entry.tags & changed]
+            for key in stale:
+                self._discard(key)
+            self.invalidations += len(stale)
+
+    def begin_refresh(self, key: str) -> bool:
+        """Claim the background refresh of `key`; ``False`` if one is running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: str) -> None:
+        """Release the claim taken by `begin_refresh`."""
+        with self._lock:
+            self._refreshing.discard(key)
+            self.refreshes += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._reset_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, configuration and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "refreshes": self.refreshes,
+                "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,238 @@
+"""Process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms keep one shard of values per thread, so the
+hot path updates a plain list or dict owned by the calling thread without
+taking a lock. Shards are summed only when ``/metrics`` is scraped. Values
+are per process: with several workers, each one reports its own.
+"""
+
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """Named metric with per-thread shards of `label values -> state`."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._local = threading.local()
+        self._shards: List[Dict[LabelValues, List[float]]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[LabelValues, List[float]]:
+        try:
+            shard: Dict[LabelValues, List[float]] = self._local.shard
+            return shard
+        except AttributeError:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _state(self, labels: LabelValues) -> List[float]:
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            state = shard[labels] = self._new_state()
+        return state
+
+    def _new_state(self) -> List[float]:
+        return [0.0]
+
+    def collect(self) -> Dict[LabelValues, List[float]]:
+        """Sum of every thread's shard."""
+        with self._lock:
+            shards = list(self._shards)
+        totals: Dict[LabelValues, List[float]] = {}
+        for shard in shards:
+            for labels, state in list(shard.items()):
+                total = totals.setdefault(labels, self._new_state())
+                for index, value in enumerate(state):
+                    total[index] += value
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, state in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(state[0])}")
+        return lines
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._state(labels)[0] += amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. requests in flight."""
+
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._state(labels)[0] += amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._state(labels)[0] -= amount
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative ``le`` buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = ()
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets or LATENCY_BUCKETS)
+
+    def _new_state(self) -> List[float]:
+        # one slot per bucket, one for +Inf, then sum and count
+        return [0.0] * (len(self.buckets) + 3)
+
+    def observe(self, value: float, *labels: str) -> None:
+        state = self._state(labels)
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        names = self.label_names + ("le",)
+        bounds = [_number(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, state in sorted(self.collect().items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                bucket = _labels(names, labels + (bound,))
+                lines.append(f"{self.name}_bucket{bucket} {_number(cumulative)}")
+            suffix = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{suffix} {_number(state[-2])}")
+            lines.append(f"{self.name}_count{suffix} {_number(state[-1])}")
+        return lines
+
+
+class Registry:
+    """Metrics rendered together, plus callbacks for values read at scrape time."""
+
+    def __init__(self) -> None:
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = ()
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def _add(self, metric: MetricT) -> MetricT:
+        self.metrics.append(metric)
+        return metric
+
+    def reset(self) -> None:
+        for metric in self.metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collect in self.collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+requests_total = registry.counter(
+    "http_requests_total", "HTTP requests served.", ("method", "route", "status")
+)
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time to serve HTTP requests.", ("method", "route")
+)
+requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests being served.", ("method",)
+)
+response_size = registry.histogram(
+    "http_response_size_bytes",
+    "Size of HTTP response bodies.",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+db_duration = registry.histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request.", ("method", "route")
+)
+db_statements = registry.counter(
+    "http_request_db_statements_total", "SQL statements executed by requests.", ("method", "route")
+)
+pool_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a connection from the pool.",
+    ("pool",),
+    WAIT_BUCKETS,
+)
+
+
+def sample_lines(name: str, kind: str, help: str, value: float) -> List[str]:
+    """Exposition lines of a single unlabeled sample read at scrape time."""
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+
+
+def cache_lines(stats: Dict[str, Any]) -> List[str]:
+    """Response cache counters and gauges from `ResponseCache.stats`."""
+    lines = []
+    for key, kind, help in (
+        ("hits", "counter", "Fresh response cache hits."),
+        ("stale_hits", "counter", "Stale response cache hits served while refreshing."),
+        ("misses", "counter", "Response cache misses."),
+        ("evictions", "counter", "Responses evicted to stay within the cache bounds."),
+        ("invalidations", "counter", "Cache invalidations caused by writes."),
+        ("entries", "gauge", "Responses held in the cache."),
+        ("bytes", "gauge", "Bytes of response bodies held in the cache."),
+        ("hit_ratio", "gauge", "Share of cache lookups answered from the cache."),
+    ):
+        suffix = "_total" if kind == "counter" else ""
+        lines.extend(sample_lines(f"response_cache_{key}{suffix}", kind, help, stats[key]))
+    return lines
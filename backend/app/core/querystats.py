@@ -0,0 +1,96 @@
+"""Per-request SQL statement counts and database time.
+
+Listeners on every SQLAlchemy `Engine` time each statement and add it to the
+`QueryStats` of the request being served, held in a context variable that
+`QueryStatsMiddleware` sets. Sync endpoints and dependencies run in worker
+threads that inherit the request's context, so their statements are counted
+too. With ``API_DEBUG=1`` the totals are returned as response headers.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEBUG_HEADERS = os.getenv("API_DEBUG", "0") == "1"
+
+
+class QueryStats:
+    """Number of statements executed and seconds spent executing them.
+
+    `route` names the request they were executed for, e.g.
+    ``GET /api/movies/{movie_id}``.
+    """
+
+    __slots__ = ("statements", "seconds", "route")
+
+    def __init__(self, route: Optional[str] = None) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+        self.route = route
+
+    def add(self, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+
+
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Process-wide collectors installed by `count_queries`
+_collectors: List[QueryStats] = []
+
+
+@contextmanager
+def track_queries(route: Optional[str] = None) -> Iterator[QueryStats]:
+    """Collect the statements executed in the current context (one request)."""
+    stats = QueryStats(route)
+    token = current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_stats.reset(token)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Collect every statement executed in the process while the block runs.
+
+    Unlike `track_queries` this does not depend on context propagation, so it
+    also sees requests served on another thread, e.g. through `TestClient`.
+    """
+    stats = QueryStats()
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+
+
+def _before_execute(conn: Any, *args: Any) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn: Any, *args: Any) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = current_stats.get()
+    if stats is not None:
+        stats.add(elapsed)
+    for collector in _collectors:
+        collector.add(elapsed)
+
+
+def _on_error(context: Any) -> None:
+    # after_cursor_execute is skipped for failed statements
+    if context.execution_context is not None and context.connection is not None:
+        started = context.connection.info.get("query_started")
+        if started:
+            started.pop()
+
+
+event.listen(Engine, "before_cursor_execute", _before_execute)
+event.listen(Engine, "after_cursor_execute", _after_execute)
+event.listen(Engine, "handle_error", _on_error)
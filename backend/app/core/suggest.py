@@ -0,0 +1,210 @@
+"""In-memory prefix index for typeahead suggestions.
+
+Names of movies, actors, directors and genres are folded (see
+`app.core.text.fold`) and stored in one sorted array of
+``(key, type, id)`` tuples. Every word suffix of a name is a key, so
+"nol" finds "Christopher Nolan". A lookup is a `bisect` to the first key with
+the prefix followed by a bounded forward scan, so suggestions cost
+microseconds regardless of catalog size and never touch the database.
+
+The index is built from the database on first use and kept current by the CRUD
+endpoints calling `upsert`/`remove` after they commit. It is per process.
+Writes of names committed by other workers or the CLI mark it stale through the
+shared versions of `app.db.data_versions`, and a later lookup rebuilds it: one
+at a time, at most every ``SUGGEST_REBUILD_INTERVAL`` seconds, with the old
+index answering meanwhile.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.text import fold
+from app.models import Actor, Director, Genre, Movie
+
+# Suggestion type -> (id column, label column)
+SOURCES = {
+    "movie": (Movie.id, Movie.title),
+    "actor": (Actor.id, Actor.name),
+    "director": (Director.id, Director.name),
+    "genre": (Genre.id, Genre.name),
+}
+
+# Matching keys examined per requested suggestion before ranking
+SCAN_FACTOR = 5
+
+# Seconds after a rebuild during which a stale index is still served, so an import
+# committing chunk after chunk does not cost a rebuild per chunk
+REBUILD_INTERVAL = float(os.getenv("SUGGEST_REBUILD_INTERVAL", "1"))
+
+
+def normalize(text: str) -> str:
+    """Folded text with runs of whitespace collapsed."""
+    return " ".join(fold(text).split())
+
+
+def index_keys(label: str) -> Set[str]:
+    """Folded keys for `label`: the whole name and every later word suffix."""
+    words = normalize(label).split(" ")
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+class SuggestIndex:
+    """Sorted-array prefix index over entity names."""
+
+    def __init__(self, rebuild_interval: float = REBUILD_INTERVAL) -> None:
+        self._keys: List[Tuple[str, str, int]] = []
+        # (type, id) -> (label, whole-name key)
+        self._labels: Dict[Tuple[str, int], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        # Held for a whole rebuild, so concurrent lookups do not each run one
+        self._rebuilding = threading.Lock()
+        self._rebuilt_at = float("-inf")
+        self.rebuild_interval = rebuild_interval
+        self.built = False
+        self.stale = False
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def rebuild(self, db: Session) -> None:
+        """Replace the index contents with every name currently in the database."""
+        with self._rebuilding:
+            self._rebuild(db)
+
+    def _rebuild(self, db: Session) -> None:
+        with self._lock:
+            # Cleared before reading, so a write landing meanwhile triggers another rebuild
+            self.stale = False
+        labels = {}
+        for kind, (id_column, label_column) in SOURCES.items():
+            for entity_id, label in db.query(id_column, label_column):
+                labels[(kind, entity_id)] = (label, normalize(label))
+
+        keys = sorted(
+            (key, kind, entity_id)
+            for (kind, entity_id), (label, _) in labels.items()
+            for key in index_keys(label)
+        )
+        with self._lock:
+            self._keys = keys
+            self._labels = labels
+            self.built = True
+        self._rebuilt_at = time.monotonic()
+
+    def ensure_built(self, db: Session) -> None:
+        """Build the index from `db` on first use and rebuild it when stale.
+
+        A stale index keeps being served while another lookup rebuilds it and
+        for `rebuild_interval` seconds after the previous rebuild.
+        """
+        if not self.built:
+            with self._rebuilding:
+                if not self.built:
+                    self._rebuild(db)
+            return
+        if not self.stale or time.monotonic() - self._rebuilt_at < self.rebuild_interval:
+            return
+        if not self._rebuilding.acquire(blocking=False):
+            return
+        try:
+            # Another lookup may have rebuilt it since the check above
+            if self.stale:
+                self._rebuild(db)
+        finally:
+            self._rebuilding.release()
+
+    def mark_stale(self) -> None:
+        """Have the next `ensure_built` rebuild, e.g. after another process wrote names."""
+        with self._lock:
+            self.stale = self.built
+
+    def reset(self) -> None:
+        """Drop the contents so the next `ensure_built` rebuilds from the database."""
+        with self._lock:
+            self._keys = []
+            self._labels = {}
+            self.built = False
+            self.stale = False
+        self._rebuilt_at = float("-inf")
+
+    def upsert(self, kind: str, entity_id: int, label: str) -> None:
+        """Add an entity or replace its name."""
+        if not self.built:
+            return
+        with self._lock:
+            self._discard(kind, entity_id)
+            self._labels[(kind, entity_id)] = (label, normalize(label))
+            for key in index_keys(label):
+                insort(self._keys, (key, kind, entity_id))
+
+    def upsert_many(self, kind: str, entries: Iterable[Tuple[int, str]]) -> None:
+        """Add or rename many entities of one `kind` with a single merge of the keys."""
+        if not self.built:
+            return
+        with self._lock:
+            added: List[Tuple[str, str, int]] = []
+            for entity_id, label in entries:
+                self._discard(kind, entity_id)
+                self._labels[(kind, entity_id)] = (label, normalize(label))
+                added.extend((key, kind, entity_id) for key in index_keys(label))
+            # Timsort merges the sorted keys with the sorted run of new ones
+            self._keys.extend(sorted(added))
+            self._keys.sort()
+
+    def remove(self, kind: str, entity_id: int) -> None:
+        """Remove an entity from the index."""
+        if not self.built:
+            return
+        with self._lock:
+            self._discard(kind, entity_id)
+
+    def _discard(self, kind: str, entity_id: int) -> None:
+        labels = self._labels.pop((kind, entity_id), None)
+        if labels is None:
+            return
+        for key in index_keys(labels[0]):
+            entry = (key, kind, entity_id)
+            position = bisect_left(self._keys, entry)
+            if position < len(self._keys) and self._keys[position] == entry:
+                del self._keys[position]
+
+    def suggest(
+        self, q: str, limit: int = 10, types: Optional[Sequence[str]] = None
+    ) -> List[Tuple[str, int, str]]:
+        """Return up to `limit` ``(type, id, label)`` suggestions for prefix `q`.
+
+        Whole-name matches rank before word matches, then shorter names first.
+        """
+        prefix = normalize(q)
+        if not prefix:
+            return []
+
+        best: Dict[Tuple[str, int], Tuple[bool, int, str]] = {}
+        budget = limit * SCAN_FACTOR
+        with self._lock:
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and budget > 0:
+                key, kind, entity_id = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if types and kind not in types:
+                    continue
+                budget -= 1
+
+                label, whole = self._labels[(kind, entity_id)]
+                rank = (key != whole, len(label), label)
+                current = best.get((kind, entity_id))
+                if current is None or rank < current:
+                    best[(kind, entity_id)] = rank
+
+        ranked = sorted(best.items(), key=lambda item: item[1])[:limit]
+        return [(kind, entity_id, rank[2]) for (kind, entity_id), rank in ranked]
+
+
+suggestions = SuggestIndex()
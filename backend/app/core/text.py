@@ -0,0 +1,9 @@
+"""Text normalization helpers."""
+
+import unicodedata
+
+
+def fold(text: str) -> str:
+    """Case-fold `text` and strip diacritics, e.g. ``"Timothée" -> "timothee"``."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
@@ -0,0 +1,101 @@
+"""Version counters for conditional GET.
+
+Every committed write bumps a counter for the table it changed and for the
+rows it touched. ETags are derived from these counters (see
+`app.api.middleware.ETagMiddleware`), so a matching ``If-None-Match`` can be
+answered before any query runs. List responses depend on whole tables; detail
+responses depend on a single row, which is also bumped when a row embedded in
+that detail changes (an actor's filmography lists the movies they appear in),
+so one edit only changes the ETags of the details that show it.
+
+Counters are per process and start from zero; the random ``epoch`` in each
+ETag keeps tags from an earlier process, or another worker, from matching.
+Writes committed by other processes are picked up through the shared versions
+of `app.db.data_versions` and published with `record_external_write`. Which
+rows they changed is unknown, so they move an external counter per table that
+every ETag depending on that table includes.
+"""
+
+import secrets
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+from app.core.cache import response_cache
+from app.core.suggest import SOURCES, suggestions
+
+
+class VersionCounters:
+    """Per-table and per-row write counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all counters and start a new epoch."""
+        with self._lock:
+            self.epoch = secrets.token_hex(4)
+            self._tables: Dict[str, int] = defaultdict(int)
+            self._rows: Dict[Tuple[str, int], int] = defaultdict(int)
+            self._external: Dict[str, int] = defaultdict(int)
+
+    def bump(self, table: str, ids: Iterable[int] = ()) -> None:
+        """Record a write to `table` that changed the rows `ids`."""
+        with self._lock:
+            self._tables[table] += 1
+            for row_id in ids:
+                self._rows[(table, row_id)] += 1
+
+    def touch(self, table: str, ids: Iterable[int]) -> None:
+        """Record that rows of `table` embed data changed by a write elsewhere."""
+        with self._lock:
+            for row_id in ids:
+                if row_id is not None:
+                    self._rows[(table, row_id)] += 1
+
+    def bump_external(self, tables: Iterable[str]) -> None:
+        """Record writes to `tables` made by another process, rows unknown."""
+        with self._lock:
+            for table in tables:
+                self._tables[table] += 1
+                self._external[table] += 1
+
+    def table_versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._tables[table] for table in tables)
+
+    def row_version(self, table: str, row_id: int) -> int:
+        return self._rows[(table, row_id)]
+
+    def external_versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._external[table] for table in tables)
+
+
+versions = VersionCounters()
+
+
+def record_write(table: str, ids: Iterable[int] = (), **related: Iterable[int]) -> None:
+    """Publish a committed write to `table` touching `ids`.
+
+    Keyword arguments name related tables whose rows embed the written ones,
+    e.g. ``actor=[...]`` for the cast of an edited movie. Cached responses are
+    dropped before the versions move, so a request that already sees the new
+    versions can never be answered from a response cached before the write.
+    """
+    response_cache.invalidate(table)
+    versions.bump(table, ids)
+    for related_table, related_ids in related.items():
+        versions.touch(related_table, related_ids)
+
+
+def record_external_write(tables: Iterable[str]) -> None:
+    """Publish writes to `tables` committed by another process.
+
+    Like `record_write`, cached responses are dropped before the versions move.
+    Writes to named tables also mark the suggestion index stale.
+    """
+    tables = list(tables)
+    if SOURCES.keys() & set(tables):
+        suggestions.mark_stale()
+    response_cache.invalidate(*tables)
+    versions.bump_external(tables)
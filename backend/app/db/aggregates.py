@@ -0,0 +1,34 @@
+"""Denormalized rating aggregates stored on `movies`.
+
+`rating_count`, `rating_sum` and `average_rating` are recomputed from the
+`ratings` table with set-based correlated subqueries, so list responses can
+report ratings without loading every `Rating` row. Callers run the refresh in
+the same transaction as the rating write it reflects.
+"""
+
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Movie, Rating
+
+
+def refresh_rating_aggregates(db: Session, movie_ids: Optional[Iterable[int]] = None) -> None:
+    """Recompute rating aggregates for `movie_ids`, or for every movie when omitted.
+
+    Does not commit; the caller's commit makes the aggregates visible together
+    with the rating change.
+    """
+    of_movie = Rating.movie_id == Movie.id
+    stmt = update(Movie).values(
+        rating_count=select(func.count(Rating.id)).where(of_movie).scalar_subquery(),
+        rating_sum=select(func.coalesce(func.sum(Rating.score), 0.0))
+        .where(of_movie)
+        .scalar_subquery(),
+        average_rating=select(func.avg(Rating.score)).where(of_movie).scalar_subquery(),
+    )
+    if movie_ids is not None:
+        stmt = stmt.where(Movie.id.in_(set(movie_ids)))
+
+    db.execute(stmt.execution_options(synchronize_session=False))
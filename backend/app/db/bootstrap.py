@@ -0,0 +1,95 @@
+"""Schema creation and seeding, serialized across processes.
+
+Every uvicorn worker prepares the database when it starts (see the lifespan
+hook in `app.main`), and the management CLI can do the same ahead of time.
+An exclusive lock on ``<DATABASE_PATH>.lock`` makes sure only one process
+creates tables or seeds at a time; the others wait and then find the work done.
+It is taken with ``flock`` on POSIX and ``msvcrt.locking`` on Windows.
+A missing database is restored from the prebuilt seed snapshot when one exists.
+"""
+
+import logging
+import os
+import sys
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+from app.db.database import DB_PATH, Base, SessionLocal, engine, init_db
+from app.db.seed_data import seed_database
+from app.db.snapshot import restore_snapshot
+from app.models import Movie
+
+logger = logging.getLogger(__name__)
+
+LOCK_PATH = f"{DB_PATH}.lock"
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(lock_file: IO[str]) -> None:
+        # Byte 0 stands for the whole file; LK_LOCK gives up after ~10 s, so keep trying
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock(lock_file: IO[str]) -> None:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(lock_file: IO[str]) -> None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+    def _unlock(lock_file: IO[str]) -> None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def database_lock(path: Optional[str] = None) -> Iterator[None]:
+    """Hold an exclusive advisory lock on `path` (default: next to the database)."""
+    path = path or LOCK_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "a") as lock_file:
+        _lock(lock_file)
+        try:
+            yield
+        finally:
+            _unlock(lock_file)
+
+
+def seed_if_empty() -> bool:
+    """Seed the sample catalog when there are no movies. Returns True if seeded."""
+    db = SessionLocal()
+    try:
+        if db.query(Movie.id).first() is not None:
+            return False
+        seed_database(db)
+        return True
+    finally:
+        db.close()
+
+
+def prepare_database() -> None:
+    """Restore or create the schema and seed an empty database."""
+    with database_lock():
+        restore_snapshot(DB_PATH)
+        init_db()
+        if seed_if_empty():
+            logger.info("Seeded empty database at %s", DB_PATH)
+
+
+def reset_database() -> None:
+    """Drop every table, recreate the schema and seed it again."""
+    with database_lock():
+        Base.metadata.drop_all(bind=engine)
+        init_db()
+        seed_if_empty()
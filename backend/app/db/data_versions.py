@@ -0,0 +1,181 @@
+"""Write versions shared by every process using the database.
+
+ETags, the response cache and the suggestion index are kept in process memory
+and updated by the writes each process makes itself (see
+`app.core.versions.record_write`). Writes from other uvicorn workers or from
+the management CLI would otherwise go unnoticed, so every committing
+transaction that changed a catalog table also bumps that entity type's row in
+`data_versions` (``movie``, ``actor``, ``director``, ``genre`` or
+``rating``), inside the same transaction.
+
+Before answering a GET, each process calls `DataVersions.changed`. It runs
+``PRAGMA data_version`` on a dedicated connection, which only changes after
+another connection commits, and reads `data_versions` only then. Bumps this
+process made itself were already applied in memory and are recognized as its
+own. Any other bump is reported, so the caller can drop what depends on it.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Set, cast
+
+from sqlalchemy import Column, Integer, String, Table, event
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.database import Base, engine, read_engine
+
+logger = logging.getLogger(__name__)
+
+data_versions_table = Table(
+    "data_versions",
+    Base.metadata,
+    Column("tag", String(50), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+# Written table -> entity type whose version it moves
+TABLE_TAGS = {
+    "movies": "movie",
+    "movie_actors": "movie",
+    "movie_genres": "movie",
+    "actors": "actor",
+    "directors": "director",
+    "genres": "genre",
+    "ratings": "rating",
+}
+
+_WRITTEN_TABLE = re.compile(
+    r"\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)"
+    r"\s+\"?(\w+)",
+    re.IGNORECASE,
+)
+
+_BUMP = (
+    "INSERT INTO data_versions (tag, version) VALUES (?, 1) "
+    "ON CONFLICT (tag) DO UPDATE SET version = version + 1 RETURNING version"
+)
+
+
+class DataVersions:
+    """Shared per-entity write versions and this process's view of them."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._connection: Any = None
+        self._data_version: Optional[int] = None
+        # Versions this process has accounted for; None until the first check
+        self._seen: Optional[Dict[str, int]] = None
+
+    def install(self, engine: Engine) -> None:
+        """Bump the versions of the tables written through `engine` when it commits."""
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "commit", self._on_commit)
+        event.listen(engine, "rollback", self._on_rollback)
+
+    def remove(self, engine: Engine) -> None:
+        event.remove(engine, "after_cursor_execute", self._after_execute)
+        event.remove(engine, "commit", self._on_commit)
+        event.remove(engine, "rollback", self._on_rollback)
+
+    def watch(self, engine: Optional[Engine]) -> None:
+        """Check the versions of the database behind `engine` from now on (None: stop)."""
+        with self._lock:
+            self._close()
+            self._engine = engine
+            self._data_version = None
+            self._seen = None
+
+    def reset(self) -> None:
+        """Forget what has been seen; the next check takes the current versions as known."""
+        with self._lock:
+            self._data_version = None
+            self._seen = None
+
+    def _after_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        written = _WRITTEN_TABLE.match(statement)
+        if written is None:
+            return
+        tag = TABLE_TAGS.get(written.group(1).lower())
+        if tag is not None:
+            conn.info.setdefault("written_tags", set()).add(tag)
+
+    def _on_commit(self, conn: Connection) -> None:
+        tags = conn.info.pop("written_tags", None)
+        if not tags:
+            return
+        # Raw cursor: the bump joins the committing transaction without re-entering events
+        # Set while the connection is checked out, as it is during its commit
+        dbapi_connection = cast(sqlite3.Connection, conn.connection.dbapi_connection)
+        cursor = dbapi_connection.cursor()
+        try:
+            bumped = {}
+            for tag in sorted(tags):
+                cursor.execute(_BUMP, (tag,))
+                bumped[tag] = cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            # Database without the table yet, e.g. while the schema is being created
+            logger.debug("Could not bump data versions", exc_info=True)
+            return
+        finally:
+            cursor.close()
+
+        with self._lock:
+            if self._seen is None:
+                return
+            for tag, version in bumped.items():
+                # Ours alone only if nobody else wrote the tag since the last check
+                if self._seen.get(tag, 0) == version - 1:
+                    self._seen[tag] = version
+
+    def _on_rollback(self, conn: Connection) -> None:
+        conn.info.pop("written_tags", None)
+
+    def changed(self) -> Set[str]:
+        """Entity types written by other processes since the previous call."""
+        with self._lock:
+            if self._engine is None:
+                return set()
+            if self._connection is None:
+                # Detached, so the watcher does not hold a slot of the pool
+                self._connection = self._engine.raw_connection()
+                self._connection.detach()
+            cursor = self._connection.cursor()
+            try:
+                data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+                if data_version == self._data_version:
+                    return set()
+                self._data_version = data_version
+                try:
+                    current = dict(cursor.execute("SELECT tag, version FROM data_versions"))
+                except sqlite3.OperationalError:
+                    current = {}
+            finally:
+                cursor.close()
+
+            seen, self._seen = self._seen, current
+            if seen is None:
+                return set()
+            return {
+                tag for tag in current.keys() | seen.keys() if current.get(tag) != seen.get(tag)
+            }
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+data_versions = DataVersions()
+data_versions.install(engine)
+data_versions.watch(read_engine)
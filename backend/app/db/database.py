@@ -6,21 +6,144 @@ https://www.researchgate.net/figure/Complete-schema-of-the-IMDb-database-with-8-
 """
 
 import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import DefaultClause, create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+
+from app.db.slowlog import SlowQueryLog
+
+# Connection tuning profiles: PRAGMAs applied to every new SQLite connection.
+# "wal" lets readers proceed while a write is in progress; "performance" also
+# sizes the page cache and memory map so hot pages are served from memory.
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "wal": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+    },
+    "performance": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,  # negative values are KiB: 64 MiB per connection
+        "mmap_size": 268435456,  # 256 MiB
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def sqlite_pragmas(profile: str, overrides: str = "") -> Dict[str, Any]:
+    """PRAGMAs of `profile` updated with comma-separated ``name=value`` overrides."""
+    if profile not in SQLITE_PROFILES:
+        choices = ", ".join(SQLITE_PROFILES)
+        raise ValueError(f"Unknown database profile {profile!r}; expected one of: {choices}")
+
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for item in overrides.split(","):
+        if item.strip():
+            name, _, value = item.partition("=")
+            pragmas[name.strip()] = value.strip()
+    return pragmas
+
+
+def create_sqlite_engine(
+    url: str,
+    pragmas: Optional[Dict[str, Any]] = None,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    pool_timeout: float = 30,
+    statement_cache: int = 128,
+    read_only: bool = False,
+) -> Engine:
+    """Engine for a SQLite file that applies `pragmas` to each new connection.
+
+    ``statement_cache`` is the number of prepared statements sqlite3 keeps per
+    connection. ``read_only`` engines set ``query_only`` so any write through
+    them fails.
+    """
+    pragmas = dict(pragmas or {})
+    if read_only:
+        # Last, so that journal_mode can still be switched on first connect
+        pragmas["query_only"] = 1
+
+    sqlite_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "cached_statements": statement_cache},
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+
+    if pragmas:
+
+        @event.listens_for(sqlite_engine, "connect")
+        def apply_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            cursor.close()
+
+    return sqlite_engine
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 # Use environment variable for database path (Docker-friendly)
 # Default to ./movies.db for local development, /code/data/movies.db for Docker
 DB_PATH = os.getenv("DATABASE_PATH", "./movies.db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# Tuning profile and pool sizing; see SQLITE_PROFILES. The read pool serves GET
+# requests; SQLite admits one writer at a time, so the write pool stays small.
+DB_PROFILE = os.getenv("DATABASE_PROFILE", "performance")
+DB_PRAGMAS = os.getenv("DATABASE_PRAGMAS", "")
+DB_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DB_WRITE_POOL_SIZE = int(os.getenv("DATABASE_WRITE_POOL_SIZE", "1"))
+DB_WRITE_MAX_OVERFLOW = int(os.getenv("DATABASE_WRITE_MAX_OVERFLOW", "2"))
+DB_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+DB_STATEMENT_CACHE = int(os.getenv("DATABASE_STATEMENT_CACHE", "256"))
+# Opt-in slow-query log: statements slower than this are kept with their plan
+DB_SLOW_QUERY_MS = float(os.getenv("DATABASE_SLOW_QUERY_MS", "0"))
+DB_SLOW_QUERY_LOG_SIZE = int(os.getenv("DATABASE_SLOW_QUERY_LOG_SIZE", "200"))
+
+# Read-write engine used by mutations, schema management and seeding
+engine = create_sqlite_engine(
+    SQLALCHEMY_DATABASE_URL,
+    sqlite_pragmas(DB_PROFILE, DB_PRAGMAS),
+    pool_size=DB_WRITE_POOL_SIZE,
+    max_overflow=DB_WRITE_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    statement_cache=DB_STATEMENT_CACHE,
+)
+
+# Read-only engine with its own pool for GET requests
+read_engine = create_sqlite_engine(
+    SQLALCHEMY_DATABASE_URL,
+    sqlite_pragmas(DB_PROFILE, DB_PRAGMAS),
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    statement_cache=DB_STATEMENT_CACHE,
+    read_only=True,
+)
+
+slow_queries = SlowQueryLog(DB_SLOW_QUERY_MS, DB_SLOW_QUERY_LOG_SIZE)
+if slow_queries.enabled:
+    slow_queries.install(engine)
+    slow_queries.install(read_engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
+# Read sessions never flush and keep loaded attributes after commit/rollback
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
+)
+
+
+class Base(DeclarativeBase):
+    """Declarative base of the ORM models."""
 
 
 def init_db() -> None:
@@ -30,3 +153,54 @@ def init_db() -> None:
     from app.models import Actor, Director, Genre, Movie, Rating  # noqa: F401
 
     Base.metadata.create_all(bind=engine)
+    added = upgrade_schema()
+
+    # Databases created before derived columns existed need them backfilled
+    backfill_ratings = "movies.rating_count" in added
+    backfill_folded = any(column.endswith("_folded") for column in added)
+    if backfill_ratings or backfill_folded:
+        from app.db.aggregates import refresh_rating_aggregates
+        from app.db.folding import refresh_folded_names
+
+        db = SessionLocal()
+        try:
+            if backfill_ratings:
+                refresh_rating_aggregates(db)
+            if backfill_folded:
+                refresh_folded_names(db)
+            db.commit()
+        finally:
+            db.close()
+
+
+def upgrade_schema() -> List[str]:
+    """Add columns and indexes declared on models but missing from existing tables.
+
+    `create_all` only creates missing tables, so databases created by earlier
+    versions are brought up to date here. Returns the added "table.column" names.
+    """
+    inspector = inspect(engine)
+    added = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                ddl += column.type.compile(dialect=engine.dialect)
+                if isinstance(column.server_default, DefaultClause):
+                    if not column.nullable:
+                        ddl += " NOT NULL"
+                    ddl += f" DEFAULT '{column.server_default.arg}'"
+                conn.exec_driver_sql(ddl)
+                added.append(f"{table.name}.{column.name}")
+
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+    return added
@@ -0,0 +1,32 @@
+"""Backfill of the case-folded shadow name columns (see `app.models.folded`)."""
+
+from typing import Dict, Type, Union
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.text import fold
+from app.models import Actor, Director, Genre, Movie
+
+# Model -> source column whose folded copy is stored in "<source>_folded"
+FOLDED_SOURCES: Dict[Type[Union[Movie, Actor, Director, Genre]], str] = {
+    Movie: "title",
+    Actor: "name",
+    Director: "name",
+    Genre: "name",
+}
+
+BATCH_SIZE = 5000
+
+
+def refresh_folded_names(db: Session) -> None:
+    """Recompute every folded name column from its source column. Does not commit."""
+    for model, source in FOLDED_SOURCES.items():
+        target = f"{source}_folded"
+        rows = db.query(model.id, getattr(model, source)).all()
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start : start + BATCH_SIZE]
+            db.execute(
+                update(model),
+                [{"id": entity_id, target: fold(value)} for entity_id, value in batch],
+            )
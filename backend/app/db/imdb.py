@@ -0,0 +1,466 @@
+"""Streaming importer for IMDb dataset dumps.
+
+`import_imdb` loads the tab-separated files published at
+https://datasets.imdbws.com/ into the catalog:
+
+- ``title.basics.tsv.gz``: titles of the selected ``titleType`` become movies,
+  their comma-separated ``genres`` become genres and ``movie_genres`` rows;
+- ``title.principals.tsv.gz``: ``actor`` and ``actress`` credits become
+  ``movie_actors`` rows, the first ``director`` credit the movie's director;
+- ``name.basics.tsv.gz``: names of the credited people become actors and
+  directors;
+- ``title.ratings.tsv.gz``: each title's average becomes one rating of the
+  movie, with the stored aggregates set to match.
+
+Files are read line by line, gzipped or not, so memory does not grow with
+their size: only the ids matter between files, kept in maps from the numeric
+part of IMDb's ``tt``/``nm`` identifiers to the new row ids, which also drop
+duplicate titles and credits. People's rows are inserted in the transaction of
+the credits that first link them, named by their IMDb identifier, so a failed
+load never leaves links to missing rows; ``name.basics`` then renames those it
+lists. Movies start with a placeholder director until their credits are read.
+
+Rows are written with Core ``executemany`` statements, one transaction per
+``chunk_size`` rows. The secondary indexes of the loaded tables and the
+full-text search triggers are dropped for the load; indexes are recreated and
+the search index rebuilt once at the end, also after a failed load.
+"""
+
+import gzip
+import logging
+import os
+import time
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Index, bindparam, delete, exists, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.text import fold
+from app.db.database import Base
+from app.db.search_index import (
+    create_search_triggers,
+    drop_search_triggers,
+    has_search_index,
+    rebuild_search_index,
+)
+from app.models import Actor, Director, Genre, Movie, Rating
+from app.models.movie import movie_actors, movie_genres
+
+logger = logging.getLogger(__name__)
+
+# IMDb file of each dataset, looked up in the import directory
+FILES = {
+    "titles": "title.basics.tsv.gz",
+    "principals": "title.principals.tsv.gz",
+    "names": "name.basics.tsv.gz",
+    "ratings": "title.ratings.tsv.gz",
+}
+
+# IMDb's marker for a missing value
+NULL = "\\N"
+
+ACTOR_CATEGORIES = frozenset(("actor", "actress"))
+
+PLACEHOLDER_DIRECTOR = "Unknown director"
+
+# Lines between progress messages
+PROGRESS_LINES = 500_000
+
+# Bounds of the movie schemas; values outside them are not imported
+MAX_NAME_LENGTH = 255
+YEARS = range(1888, 2101)
+RUNTIMES = range(1, 601)
+
+
+def _key(identifier: Optional[str]) -> int:
+    """Numeric part of a ``tt``/``nm`` identifier, a smaller dict key than the string."""
+    if identifier is None:
+        raise ValueError("Missing IMDb identifier")
+    return int(identifier[2:])
+
+
+def _int(value: Optional[str], valid: range) -> Optional[int]:
+    if value is None or not value.isdigit():
+        return None
+    number = int(value)
+    return number if number in valid else None
+
+
+def read_tsv(path: str, columns: Sequence[str]) -> Iterator[Tuple[Optional[str], ...]]:
+    """Values of `columns` for each line of the TSV file at `path`, ``\\N`` as None.
+
+    Gzipped files are decompressed as they are read. Lines with the wrong number
+    of fields are skipped; progress is logged every `PROGRESS_LINES` lines.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    name = os.path.basename(path)
+    started = time.perf_counter()
+    lines = skipped = 0
+    # IMDb does not quote fields, so a tab or newline always ends one
+    with opener(path, "rt", encoding="utf-8", newline="\n") as stream:
+        header = stream.readline().rstrip("\n").split("\t")
+        positions = [header.index(column) for column in columns]
+        for line in stream:
+            lines += 1
+            if lines % PROGRESS_LINES == 0:
+                logger.info(
+                    "%s: %d lines (%.0f lines/s)",
+                    name,
+                    lines,
+                    lines / (time.perf_counter() - started),
+                )
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != len(header):
+                skipped += 1
+                continue
+            yield tuple(None if fields[i] == NULL else fields[i] for i in positions)
+    logger.info(
+        "%s: %d lines in %.1fs, %d malformed",
+        name,
+        lines,
+        time.perf_counter() - started,
+        skipped,
+    )
+
+
+def _next_id(conn: Connection, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _deferred_indexes() -> List[Index]:
+    """Secondary indexes of the loaded tables; unique ones stay as they enforce integrity."""
+    tables = [
+        Base.metadata.tables[name]
+        for name in ("movies", "actors", "directors", "ratings", "movie_actors", "movie_genres")
+    ]
+    return [index for table in tables for index in table.indexes if not index.unique]
+
+
+class _Loader:
+    """State of one import: id maps, pending rows and counts."""
+
+    def __init__(self, engine: Engine, chunk_size: int) -> None:
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.counts = dict.fromkeys(
+            (
+                "movies",
+                "genres",
+                "movie_genres",
+                "actors",
+                "directors",
+                "movie_actors",
+                "ratings",
+            ),
+            0,
+        )
+        # IMDb key -> row id
+        self.movies: Dict[int, int] = {}
+        self.actors: Dict[int, int] = {}
+        self.directors: Dict[int, int] = {}
+
+        with engine.begin() as conn:
+            self.genres: Dict[str, int] = dict(
+                conn.execute(select(Genre.name, Genre.id)).tuples().all()
+            )
+            self.next_movie = _next_id(conn, Movie.id)
+            self.next_actor = _next_id(conn, Actor.id)
+            self.next_director = _next_id(conn, Director.id)
+            self.placeholder = self.next_director
+            self.next_director += 1
+            conn.execute(
+                insert(Director),
+                [
+                    {
+                        "id": self.placeholder,
+                        "name": PLACEHOLDER_DIRECTOR,
+                        "name_folded": fold(PLACEHOLDER_DIRECTOR),
+                    }
+                ],
+            )
+
+    def _genre_id(self, conn: Connection, name: str) -> int:
+        genre_id = self.genres.get(name)
+        if genre_id is None:
+            genre_id = conn.execute(
+                insert(Genre).values(name=name, name_folded=fold(name)).returning(Genre.id)
+            ).scalar_one()
+            self.genres[name] = genre_id
+            self.counts["genres"] += 1
+        return genre_id
+
+    def load_titles(self, path: str, title_types: Sequence[str], include_adult: bool) -> None:
+        """Insert the movies of title.basics with their genres."""
+        current_year = date.today().year
+        movies: List[Dict] = []
+        genres: List[Tuple[int, str]] = []
+        rows = read_tsv(
+            path,
+            (
+                "tconst",
+                "titleType",
+                "primaryTitle",
+                "isAdult",
+                "startYear",
+                "runtimeMinutes",
+                "genres",
+            ),
+        )
+        for tconst, title_type, title, adult, year, runtime, names in rows:
+            if title_type not in title_types or not title or (adult == "1" and not include_adult):
+                continue
+            release_year = _int(year, YEARS)
+            key = _key(tconst)
+            if release_year is None or key in self.movies:
+                continue
+            movie_id = self.movies[key] = self.next_movie
+            self.next_movie += 1
+            title = title[:MAX_NAME_LENGTH]
+            movies.append(
+                {
+                    "id": movie_id,
+                    "title": title,
+                    "title_folded": fold(title),
+                    "release_year": release_year,
+                    "synopsis": None,
+                    "poster_url": None,
+                    "duration_minutes": _int(runtime, RUNTIMES),
+                    "status": "Coming Soon" if release_year > current_year else "Released",
+                    "director_id": self.placeholder,
+                    "rating_count": 0,
+                    "rating_sum": 0.0,
+                    "average_rating": None,
+                }
+            )
+            if names:
+                genres.extend((movie_id, name) for name in dict.fromkeys(names.split(",")))
+            if len(movies) >= self.chunk_size:
+                self._flush_titles(movies, genres)
+        self._flush_titles(movies, genres)
+
+    def _flush_titles(self, movies: List[Dict], genres: List[Tuple[int, str]]) -> None:
+        if not movies:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(insert(Movie), movies)
+            links = [
+                {"movie_id": movie_id, "genre_id": self._genre_id(conn, name)}
+                for movie_id, name in genres
+            ]
+            if links:
+                conn.execute(insert(movie_genres), links)
+        self.counts["movies"] += len(movies)
+        self.counts["movie_genres"] += len(genres)
+        movies.clear()
+        genres.clear()
+
+    def load_principals(self, path: str) -> None:
+        """Link the credited actors and set each movie's first credited director."""
+        cast: List[Dict] = []
+        directed: Dict[int, int] = {}
+        directed_movies = set()
+        # People first credited since the last flush, inserted along with their links
+        actors: List[Dict] = []
+        directors: List[Dict] = []
+        for tconst, nconst, category in read_tsv(path, ("tconst", "nconst", "category")):
+            movie_id = self.movies.get(_key(tconst))
+            if movie_id is None:
+                continue
+            if category in ACTOR_CATEGORIES:
+                key = _key(nconst)
+                actor_id = self.actors.get(key)
+                if actor_id is None:
+                    actor_id = self.actors[key] = self.next_actor
+                    self.next_actor += 1
+                    actors.append(_person(actor_id, f"nm{key:07d}"))
+                cast.append({"movie_id": movie_id, "actor_id": actor_id})
+            elif category == "director" and movie_id not in directed_movies:
+                key = _key(nconst)
+                director_id = self.directors.get(key)
+                if director_id is None:
+                    director_id = self.directors[key] = self.next_director
+                    self.next_director += 1
+                    directors.append(_person(director_id, f"nm{key:07d}"))
+                directed[movie_id] = director_id
+                directed_movies.add(movie_id)
+            if len(cast) + len(directed) >= self.chunk_size:
+                self._flush_principals(cast, directed, actors, directors)
+        self._flush_principals(cast, directed, actors, directors)
+
+    def _flush_principals(
+        self, cast: List[Dict], directed: Dict[int, int], actors: List[Dict], directors: List[Dict]
+    ) -> None:
+        with self.engine.begin() as conn:
+            # People before the links to them, in the same transaction
+            if actors:
+                conn.execute(insert(Actor), actors)
+            if directors:
+                conn.execute(insert(Director), directors)
+            if cast:
+                # A person credited twice in one title is linked once
+                result = conn.execute(insert(movie_actors).prefix_with("OR IGNORE"), cast)
+                self.counts["movie_actors"] += result.rowcount
+            if directed:
+                conn.execute(
+                    update(Movie)
+                    .where(Movie.id == bindparam("b_movie_id"))
+                    .values(director_id=bindparam("b_director_id")),
+                    [
+                        {"b_movie_id": movie_id, "b_director_id": director_id}
+                        for movie_id, director_id in directed.items()
+                    ],
+                )
+        self.counts["actors"] += len(actors)
+        self.counts["directors"] += len(directors)
+        cast.clear()
+        directed.clear()
+        actors.clear()
+        directors.clear()
+
+    def load_names(self, path: Optional[str]) -> None:
+        """Rename the credited people listed in name.basics from their IMDb identifier."""
+        actors: List[Dict] = []
+        directors: List[Dict] = []
+        if path is not None:
+            for nconst, name in read_tsv(path, ("nconst", "primaryName")):
+                key = _key(nconst)
+                # Popped so a person listed twice is renamed once
+                actor_id = self.actors.pop(key, None)
+                director_id = self.directors.pop(key, None)
+                if (actor_id is None and director_id is None) or not name:
+                    continue
+                name = name[:MAX_NAME_LENGTH]
+                if actor_id is not None:
+                    actors.append(_renamed(actor_id, name))
+                if director_id is not None:
+                    directors.append(_renamed(director_id, name))
+                if len(actors) + len(directors) >= self.chunk_size:
+                    self._flush_names(actors, directors)
+        self.actors.clear()
+        self.directors.clear()
+        self._flush_names(actors, directors)
+
+    def _flush_names(self, actors: List[Dict], directors: List[Dict]) -> None:
+        with self.engine.begin() as conn:
+            for model, renamed in ((Actor, actors), (Director, directors)):
+                if renamed:
+                    conn.execute(
+                        update(model)
+                        .where(model.id == bindparam("b_id"))
+                        .values(name=bindparam("b_name"), name_folded=bindparam("b_name_folded")),
+                        renamed,
+                    )
+        actors.clear()
+        directors.clear()
+
+    def load_ratings(self, path: str) -> None:
+        """Store each title's average rating as one rating of its movie."""
+        ratings: List[Dict] = []
+        for tconst, average in read_tsv(path, ("tconst", "averageRating")):
+            movie_id = self.movies.get(_key(tconst))
+            if movie_id is None or average is None:
+                continue
+            ratings.append({"movie_id": movie_id, "score": float(average), "review": None})
+            if len(ratings) >= self.chunk_size:
+                self._flush_ratings(ratings)
+        self._flush_ratings(ratings)
+
+    def _flush_ratings(self, ratings: List[Dict]) -> None:
+        if not ratings:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(insert(Rating), ratings)
+            conn.execute(
+                update(Movie)
+                .where(Movie.id == bindparam("b_movie_id"))
+                .values(
+                    rating_count=Movie.rating_count + 1,
+                    rating_sum=Movie.rating_sum + bindparam("b_score"),
+                    average_rating=(Movie.rating_sum + bindparam("b_score"))
+                    / (Movie.rating_count + 1),
+                ),
+                [{"b_movie_id": row["movie_id"], "b_score": row["score"]} for row in ratings],
+            )
+        self.counts["ratings"] += len(ratings)
+        ratings.clear()
+
+    def drop_unused_placeholder(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                delete(Director).where(
+                    Director.id == self.placeholder,
+                    ~exists().where(Movie.director_id == self.placeholder),
+                )
+            )
+
+
+def _person(person_id: int, name: str) -> Dict:
+    return {
+        "id": person_id,
+        "name": name,
+        "name_folded": fold(name),
+        "bio": None,
+        "photo_url": None,
+    }
+
+
+def _renamed(person_id: int, name: str) -> Dict:
+    return {"b_id": person_id, "b_name": name, "b_name_folded": fold(name)}
+
+
+def import_imdb(
+    engine: Engine,
+    directory: str,
+    title_types: Sequence[str] = ("movie",),
+    include_adult: bool = False,
+    chunk_size: int = 10_000,
+) -> Dict[str, int]:
+    """Append the IMDb dumps in `directory` to the database; returns row counts.
+
+    Only title.basics is required; without principals movies keep the
+    placeholder director, without ratings they stay unrated. The schema must
+    already exist; new rows take ids after the current maximum of each table.
+    """
+    titles = os.path.join(directory, FILES["titles"])
+    if not os.path.exists(titles):
+        raise FileNotFoundError(titles)
+    paths: Dict[str, Optional[str]] = {}
+    for name in ("principals", "names", "ratings"):
+        path = os.path.join(directory, FILES[name])
+        if not os.path.exists(path):
+            logger.warning("%s not found, skipping", path)
+        paths[name] = path if os.path.exists(path) else None
+
+    loader = _Loader(engine, chunk_size)
+    indexes = _deferred_indexes()
+    with engine.begin() as conn:
+        search_index = has_search_index(conn)
+        if search_index:
+            drop_search_triggers(conn)
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+
+    try:
+        loader.load_titles(titles, title_types, include_adult)
+        principals, ratings = paths["principals"], paths["ratings"]
+        if principals:
+            loader.load_principals(principals)
+        loader.load_names(paths["names"])
+        if ratings:
+            loader.load_ratings(ratings)
+        loader.drop_unused_placeholder()
+    finally:
+        # Also after a failed load, so indexes and search match whatever was committed
+        logger.info("Rebuilding indexes")
+        with engine.begin() as conn:
+            for index in indexes:
+                index.create(conn, checkfirst=True)
+            if search_index:
+                rebuild_search_index(conn)
+                create_search_triggers(conn)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    return loader.counts
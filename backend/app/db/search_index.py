@@ -0,0 +1,174 @@
+"""SQLite FTS5 full-text index over movies.
+
+`movie_search` holds one document per movie (rowid = movie id) with the
+title, synopsis, director name, actor names and genre names. Triggers on the
+source tables re-index the affected movies inside the writing transaction, so
+every create/update/delete through the routers (or any other writer) keeps the
+index in sync without application code. Queries are prefix matches ranked by
+BM25, which keeps search cost proportional to the matching documents instead
+of the size of the movie/actor/genre join product.
+
+The index is created by `Base.metadata.create_all` through the DDL events
+registered below; when the SQLite build lacks FTS5 the search endpoint falls
+back to ``ILIKE`` matching.
+"""
+
+import re
+import sqlite3
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import column, event, func, literal_column, table
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import ColumnElement
+
+from app.db.database import Base
+
+FTS_TABLE = "movie_search"
+
+# Lightweight handle for joining the index (rowid = movie id) in ORM queries
+movie_search = table(FTS_TABLE, column("rowid"))
+
+# BM25 column weights: title, synopsis, director, actors, genres
+BM25_WEIGHTS = (10.0, 1.0, 5.0, 5.0, 3.0)
+
+_DOCUMENT_SELECT = f"""
+INSERT INTO {FTS_TABLE} (rowid, title, synopsis, director, actors, genres)
+SELECT m.id, m.title, m.synopsis,
+    (SELECT d.name FROM directors d WHERE d.id = m.director_id),
+    (SELECT group_concat(a.name, ' ') FROM movie_actors ma
+        JOIN actors a ON a.id = ma.actor_id WHERE ma.movie_id = m.id),
+    (SELECT group_concat(g.name, ' ') FROM movie_genres mg
+        JOIN genres g ON g.id = mg.genre_id WHERE mg.movie_id = m.id)
+FROM movies m"""
+
+
+def _reindex(movie_ids: str) -> str:
+    """Trigger body that rewrites the documents of the movies selected by `movie_ids`."""
+    return (
+        f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({movie_ids}); "
+        f"{_DOCUMENT_SELECT} WHERE m.id IN ({movie_ids});"
+    )
+
+
+# name -> (trigger event, body)
+_TRIGGERS = {
+    "movies_ai": ("AFTER INSERT ON movies", _reindex("NEW.id")),
+    "movies_au": ("AFTER UPDATE OF title, synopsis, director_id ON movies", _reindex("NEW.id")),
+    "movies_ad": ("AFTER DELETE ON movies", f"DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id;"),
+    "movie_actors_ai": ("AFTER INSERT ON movie_actors", _reindex("NEW.movie_id")),
+    "movie_actors_ad": ("AFTER DELETE ON movie_actors", _reindex("OLD.movie_id")),
+    "movie_genres_ai": ("AFTER INSERT ON movie_genres", _reindex("NEW.movie_id")),
+    "movie_genres_ad": ("AFTER DELETE ON movie_genres", _reindex("OLD.movie_id")),
+    "actors_au": (
+        "AFTER UPDATE OF name ON actors",
+        _reindex("SELECT movie_id FROM movie_actors WHERE actor_id = NEW.id"),
+    ),
+    "directors_au": (
+        "AFTER UPDATE OF name ON directors",
+        _reindex("SELECT id FROM movies WHERE director_id = NEW.id"),
+    ),
+    "genres_au": (
+        "AFTER UPDATE OF name ON genres",
+        _reindex("SELECT movie_id FROM movie_genres WHERE genre_id = NEW.id"),
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def fts5_available() -> bool:
+    """Whether the linked SQLite library was built with FTS5."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def create_search_index(conn: Connection) -> None:
+    """Create the FTS table and sync triggers, populating the table if it is new."""
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    if not exists:
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, synopsis, director, actors, genres, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    create_search_triggers(conn)
+    if not exists:
+        rebuild_search_index(conn)
+
+
+def create_search_triggers(conn: Connection) -> None:
+    """Create the triggers that keep `movie_search` in sync with its source tables."""
+    for name, (when, body) in _TRIGGERS.items():
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_{name} {when} BEGIN {body} END"
+        )
+
+
+def drop_search_triggers(conn: Connection) -> None:
+    """Drop the sync triggers, e.g. before a bulk load followed by a rebuild."""
+    for name in _TRIGGERS:
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{name}")
+
+
+def has_search_index(conn: Connection) -> bool:
+    """Whether the database has the `movie_search` table (and so its triggers)."""
+    return (
+        conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,)).first()
+        is not None
+    )
+
+
+def reindex_movies(conn: Connection, movie_ids: Sequence[int]) -> None:
+    """Rewrite the documents of `movie_ids`, e.g. after loading their links with triggers off."""
+    for start in range(0, len(movie_ids), 10000):
+        ids = ",".join(str(int(movie_id)) for movie_id in movie_ids[start : start + 10000])
+        conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({ids})")
+        conn.exec_driver_sql(f"{_DOCUMENT_SELECT} WHERE m.id IN ({ids})")
+
+
+def rebuild_search_index(conn: Connection) -> None:
+    """Rewrite every document in `movie_search` from the source tables."""
+    conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+    conn.exec_driver_sql(_DOCUMENT_SELECT)
+
+
+def _on_create(target: Any, connection: Connection, **kw: Any) -> None:
+    if fts5_available():
+        create_search_index(connection)
+
+
+def _on_drop(target: Any, connection: Connection, **kw: Any) -> None:
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+event.listen(Base.metadata, "after_create", _on_create)
+event.listen(Base.metadata, "before_drop", _on_drop)
+
+
+def match_expression(q: str) -> Optional[str]:
+    """Build an FTS5 query matching every word of `q` as a prefix.
+
+    Returns ``None`` when `q` contains no searchable words.
+    """
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def match_clause(expression: str) -> ColumnElement:
+    """SQL predicate matching `expression` against the whole index."""
+    return literal_column(FTS_TABLE).op("MATCH")(expression)
+
+
+def rank_column() -> ColumnElement:
+    """Weighted BM25 score; lower is more relevant."""
+    return func.bm25(literal_column(FTS_TABLE), *BM25_WEIGHTS)
@@ -1,9 +1,11 @@
 """Database seeding script with sample movie data."""
 
 import logging
+from typing import Any, Dict, List
 
 from sqlalchemy.orm import Session
 
+from app.db.aggregates import refresh_rating_aggregates
 from app.models import Actor, Director, Genre, Movie, Rating
 
 logger = logging.getLogger(__name__)
@@ -175,18 +177,22 @@ def seed_database(db: Session) -> None:
     db.add_all(actors_data)
     db.commit()
 
-    # Helper to get objects by name
+    # Helpers to get objects by name, loaded with one query per table
+    genres_by_name = {genre.name: genre for genre in db.query(Genre)}
+    directors_by_name = {director.name: director for director in db.query(Director)}
+    actors_by_name = {actor.name: actor for actor in db.query(Actor)}
+
     def get_genre(name):
-        return db.query(Genre).filter(Genre.name == name).first()
+        return genres_by_name.get(name)
 
     def get_director(name):
-        return db.query(Director).filter(Director.name == name).first()
+        return directors_by_name.get(name)
 
     def get_actor(name):
-        return db.query(Actor).filter(Actor.name == name).first()
+        return actors_by_name.get(name)
 
     # Create Movies with relationships
-    movies_data = [
+    movies_data: List[Dict[str, Any]] = [
         {
             "movie": Movie(
                 title="Inception",
@@ -425,5 +431,7 @@ def seed_database(db: Session) -> None:
 
         db.add(movie)
 
+    db.flush()
+    refresh_rating_aggregates(db)
     db.commit()
     print("Database seeded successfully with sample data!")
@@ -0,0 +1,135 @@
+"""Opt-in log of slow SQL statements with their query plans.
+
+`SlowQueryLog.install` adds listeners to an engine that time every statement.
+Statements slower than the threshold are kept in a bounded ring buffer with
+their duration, the route of the request that ran them and the
+``EXPLAIN QUERY PLAN`` output, so full table scans (``SCAN movies``) and
+temporary B-trees (``USE TEMP B-TREE FOR ORDER BY``) stand out. Bound
+parameters are only used to explain the statement and are not kept, since they
+can hold user data. Entries are served at ``/debug/slow-queries`` when the log
+is enabled and can be dumped as JSON lines.
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import querystats
+
+logger = logging.getLogger(__name__)
+
+# Statements EXPLAIN QUERY PLAN says something useful about
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def _plan_lines(rows: Sequence[Sequence[Any]]) -> List[str]:
+    """Rows of EXPLAIN QUERY PLAN as indented lines, like the sqlite3 shell shows them."""
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return lines
+
+
+class SlowQueryLog:
+    """Ring buffer of the latest `size` statements slower than `threshold_ms`.
+
+    A threshold of 0 disables the log.
+    """
+
+    def __init__(self, threshold_ms: float = 0, size: int = 200) -> None:
+        self.threshold_ms = threshold_ms
+        self.entries: deque = deque(maxlen=size)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def install(self, engine: Engine) -> None:
+        """Time the statements executed through `engine`."""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def remove(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before_execute)
+        event.remove(engine, "after_cursor_execute", self._after_execute)
+        event.remove(engine, "handle_error", self._on_error)
+
+    def _before_execute(self, conn: Any, *args: Any) -> None:
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def _after_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        elapsed_ms = (time.perf_counter() - conn.info["slow_query_started"].pop()) * 1000
+        if elapsed_ms >= self.threshold_ms:
+            if executemany:
+                parameters = parameters[0] if parameters else ()
+            self.record(conn, statement, parameters, elapsed_ms)
+
+    def _on_error(self, context: Any) -> None:
+        # after_cursor_execute is skipped for failed statements
+        if context.execution_context is not None and context.connection is not None:
+            started = context.connection.info.get("slow_query_started")
+            if started:
+                started.pop()
+
+    def record(self, conn: Any, statement: str, parameters: Any, duration_ms: float) -> None:
+        """Add `statement` to the log with the plan SQLite chooses for it."""
+        stats = querystats.current_stats.get()
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration_ms, 3),
+            "route": stats.route if stats is not None else None,
+            "statement": statement,
+            "plan": self._explain(conn, statement, parameters or ()),
+        }
+        self.entries.append(entry)
+        logger.warning(
+            "Slow query (%.1f ms, %s): %.200s",
+            duration_ms,
+            entry["route"],
+            " ".join(statement.split()),
+        )
+
+    def _explain(self, conn: Any, statement: str, parameters: Any) -> Optional[List[str]]:
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        # A cursor of its own, so the rows of the slow statement stay unread
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return _plan_lines(cursor.fetchall())
+        except Exception:
+            logger.debug("Could not explain slow query", exc_info=True)
+            return None
+        finally:
+            cursor.close()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Logged statements, newest first."""
+        return list(reversed(self.entries))
+
+    def dump(self, stream: IO[str]) -> int:
+        """Write the logged statements to `stream` as JSON lines, oldest first."""
+        entries = list(self.entries)
+        for entry in entries:
+            stream.write(json.dumps(entry) + "\n")
+        return len(entries)
+
+    def clear(self) -> None:
+        self.entries.clear()
@@ -0,0 +1,82 @@
+"""Prebuilt seed snapshots.
+
+Seeding through the ORM on every cold start is slow compared to copying a
+finished database. `build_snapshot` writes a seeded, indexed and ANALYZEd
+SQLite file once (at image build time), and `restore_snapshot` copies it into
+place with SQLite's online backup API when the configured database does not
+exist yet.
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+from typing import Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, create_sqlite_engine, sqlite_pragmas
+from app.db.seed_data import seed_database
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.getenv("DATABASE_SNAPSHOT", "./seed.db")
+
+
+def _temporary_path(target: str) -> str:
+    """Reserve a scratch file in the directory of `target` for an atomic rename."""
+    directory = os.path.dirname(os.path.abspath(target))
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    os.close(fd)
+    return path
+
+
+def build_snapshot(path: Optional[str] = None) -> str:
+    """Write a seeded, ANALYZEd database to `path` (default: DATABASE_SNAPSHOT)."""
+    # Register every table, and the search index DDL events, with the metadata
+    import app.db.search_index  # noqa: F401
+    import app.models  # noqa: F401
+
+    path = path or SNAPSHOT_PATH
+    scratch = _temporary_path(path)
+    engine = create_sqlite_engine(f"sqlite:///{scratch}", sqlite_pragmas("default"))
+    try:
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            seed_database(db)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
+    except BaseException:
+        engine.dispose()
+        os.unlink(scratch)
+        raise
+    engine.dispose()
+    os.chmod(scratch, 0o644)
+    os.replace(scratch, path)
+    logger.info("Seed snapshot written to %s", path)
+    return path
+
+
+def restore_snapshot(target: str, snapshot: Optional[str] = None) -> bool:
+    """Copy `snapshot` to `target` if the target is missing. Returns True if copied."""
+    snapshot = snapshot or SNAPSHOT_PATH
+    if os.path.exists(target) or not os.path.exists(snapshot):
+        return False
+
+    scratch = _temporary_path(target)
+    source = sqlite3.connect(f"file:{snapshot}?mode=ro", uri=True)
+    destination = sqlite3.connect(scratch)
+    try:
+        source.backup(destination)
+    except BaseException:
+        os.unlink(scratch)
+        raise
+    finally:
+        destination.close()
+        source.close()
+    os.replace(scratch, target)
+    logger.info("Restored %s from seed snapshot %s", target, snapshot)
+    return True
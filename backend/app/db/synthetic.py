@@ -0,0 +1,295 @@
+"""Deterministic synthetic catalogs for scale testing.
+
+`generate_catalog` appends a made-up catalog of any size to a database: the
+same `CatalogSpec` (including its ``seed``) always produces the same rows.
+Distributions follow what real catalogs look like rather than uniform noise:
+
+- actor and director popularity is Zipf-distributed, so a few names appear in
+  thousands of movies and most in one or two;
+- each movie has a cast of ``cast_size`` actors and ``genres_per_movie``
+  genres, both uniform within their bounds;
+- ratings per movie have a Pareto long tail: most movies have a handful,
+  a few have hundreds (capped at ``max_ratings``);
+- about ``review_share`` of the ratings carry a review whose word count is
+  log-normal around ``review_words``.
+
+Rows are written through SQLAlchemy Core ``executemany`` inserts, one
+transaction per ``chunk_size`` movies with their links and ratings. Rating
+aggregates and folded names are computed in Python and inserted with the rows;
+the full-text search triggers are dropped for the load and the index is
+rebuilt once at the end.
+"""
+
+import bisect
+import itertools
+import logging
+import math
+import random
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.text import fold
+from app.db.search_index import (
+    FTS_TABLE,
+    create_search_triggers,
+    drop_search_triggers,
+    rebuild_search_index,
+)
+from app.models import Actor, Director, Genre, Movie, Rating
+from app.models.movie import movie_actors, movie_genres
+
+logger = logging.getLogger(__name__)
+
+# fmt: off
+GENRE_NAMES = (
+    "Action", "Adventure", "Animation", "Biography", "Comedy", "Crime", "Documentary",
+    "Drama", "Family", "Fantasy", "History", "Horror", "Music", "Musical", "Mystery",
+    "Romance", "Sci-Fi", "Sport", "Thriller", "War", "Western",
+)
+
+FIRST_NAMES = (
+    "Ada", "Ben", "Chloé", "Dev", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+    "Kira", "Luca", "Maya", "Nikolai", "Olga", "Pedro", "Quinn", "Rosa", "Sven", "Tara",
+    "Umar", "Vera", "Wen", "Ximena", "Yusuf", "Zoë",
+)
+
+LAST_NAMES = (
+    "Abbott", "Brandt", "Castillo", "Dumont", "Eriksen", "Fischer", "García", "Hoffman",
+    "Ishikawa", "Jensen", "Kowalski", "Lindqvist", "Moreau", "Novak", "Okafor", "Petrov",
+    "Quintero", "Rossi", "Schmidt", "Takahashi", "Umeh", "Varga", "Walsh", "Yilmaz",
+)
+
+WORDS = (
+    "night", "city", "last", "silent", "river", "shadow", "empire", "summer", "broken",
+    "golden", "road", "storm", "secret", "heart", "winter", "machine", "garden", "fire",
+    "lost", "distant", "echo", "glass", "iron", "midnight", "ocean", "paper", "quiet",
+    "red", "signal", "stone", "tide", "velvet", "wild", "years", "zero", "return",
+)
+# fmt: on
+
+# max_length of `review` in the rating schemas
+MAX_REVIEW_LENGTH = 2000
+# Words that fit it whatever words are drawn, with separators and the final period
+MAX_REVIEW_WORDS = MAX_REVIEW_LENGTH // (max(map(len, WORDS)) + 1)
+
+STATUSES = ("Released", "Released", "Released", "Released", "Coming Soon", "In Production")
+
+
+class CatalogSpec(NamedTuple):
+    """Size and shape of a synthetic catalog."""
+
+    movies: int = 10_000
+    # Defaults scale with `movies`: one actor per two movies, one director per twenty
+    actors: Optional[int] = None
+    directors: Optional[int] = None
+    genres: int = len(GENRE_NAMES)
+    cast_size: Tuple[int, int] = (3, 12)
+    genres_per_movie: Tuple[int, int] = (1, 3)
+    # Zipf exponent of actor and director popularity
+    popularity_skew: float = 1.1
+    mean_ratings: float = 5.0
+    # Pareto shape of ratings per movie; smaller values give a longer tail
+    rating_tail: float = 1.5
+    max_ratings: int = 2000
+    review_share: float = 0.3
+    review_words: int = 40
+    seed: int = 0
+    chunk_size: int = 2000
+
+    @property
+    def actor_count(self) -> int:
+        return self.actors if self.actors is not None else max(self.movies // 2, 1)
+
+    @property
+    def director_count(self) -> int:
+        return self.directors if self.directors is not None else max(self.movies // 20, 1)
+
+
+class _Zipf:
+    """Sampler of ids whose popularity follows Zipf's law with exponent `skew`.
+
+    The most popular id is drawn at random so popularity does not follow id order.
+    """
+
+    def __init__(self, ids: Sequence[int], skew: float, rng: random.Random) -> None:
+        self.ids = array("q", ids)
+        rng.shuffle(self.ids)
+        weights = (1.0 / rank**skew for rank in range(1, len(ids) + 1))
+        self.cum_weights = array("d", itertools.accumulate(weights))
+        self.total = self.cum_weights[-1]
+
+    def sample(self, rng: random.Random, k: int) -> List[int]:
+        """Draw up to `k` distinct ids."""
+        picked = {
+            self.ids[bisect.bisect(self.cum_weights, rng.random() * self.total)] for _ in range(k)
+        }
+        return sorted(picked)
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def _chunks(start: int, stop: int, size: int) -> Iterator[range]:
+    for low in range(start, stop, size):
+        yield range(low, min(low + size, stop))
+
+
+def _next_id(conn: Connection, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _people(rng: random.Random, ids: range, label: str) -> List[Dict]:
+    rows = []
+    for person_id in ids:
+        name = _name(rng)
+        rows.append(
+            {
+                "id": person_id,
+                "name": name,
+                "name_folded": fold(name),
+                "bio": f"Synthetic {label} #{person_id}.",
+                "photo_url": None,
+            }
+        )
+    return rows
+
+
+def _ensure_genres(conn: Connection, count: int) -> List[int]:
+    """Ids of `count` genres, inserting the missing ones by name."""
+    names = list(GENRE_NAMES[:count]) + [f"Genre {n}" for n in range(len(GENRE_NAMES), count)]
+    query = select(Genre.name, Genre.id).where(Genre.name.in_(names))
+    existing = dict(conn.execute(query).tuples().all())
+    missing = [{"name": name, "name_folded": fold(name)} for name in names if name not in existing]
+    if missing:
+        conn.execute(insert(Genre), missing)
+        existing = dict(conn.execute(query).tuples().all())
+    return [existing[name] for name in names]
+
+
+def _ratings_count(rng: random.Random, spec: CatalogSpec) -> int:
+    """Long-tailed number of ratings with mean `spec.mean_ratings` (before capping)."""
+    tail = rng.paretovariate(spec.rating_tail) - 1.0
+    return min(int(tail * spec.mean_ratings * (spec.rating_tail - 1.0)), spec.max_ratings)
+
+
+def _review(rng: random.Random, spec: CatalogSpec) -> Optional[str]:
+    if rng.random() >= spec.review_share:
+        return None
+    words = max(1, int(rng.lognormvariate(math.log(spec.review_words), 0.8)))
+    # Reviews longer than the API accepts would make the movie unreadable; all
+    # words are still drawn so the cap leaves the rest of the catalog unchanged
+    drawn = rng.choices(WORDS, k=words)[:MAX_REVIEW_WORDS]
+    return " ".join(drawn).capitalize() + "."
+
+
+def generate_catalog(engine: Engine, spec: CatalogSpec = CatalogSpec()) -> Dict[str, int]:
+    """Append the catalog described by `spec` to the database; returns row counts.
+
+    The schema must already exist. New rows take ids after the current maximum
+    of each table, so the generator can add to a seeded database.
+    """
+    rng = random.Random(spec.seed)
+    counts = dict.fromkeys(
+        ("actors", "directors", "movies", "movie_actors", "movie_genres", "ratings"), 0
+    )
+
+    with engine.begin() as conn:
+        genre_ids = _ensure_genres(conn, spec.genres)
+        first_actor = _next_id(conn, Actor.id)
+        first_director = _next_id(conn, Director.id)
+        first_movie = _next_id(conn, Movie.id)
+        search_index = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,)
+        ).first()
+        if search_index:
+            drop_search_triggers(conn)
+
+    try:
+        actor_ids = range(first_actor, first_actor + spec.actor_count)
+        director_ids = range(first_director, first_director + spec.director_count)
+        for ids, model, label in (
+            (actor_ids, Actor, "actor"),
+            (director_ids, Director, "director"),
+        ):
+            for chunk in _chunks(ids.start, ids.stop, spec.chunk_size * 5):
+                with engine.begin() as conn:
+                    conn.execute(insert(model), _people(rng, chunk, label))
+            counts[f"{label}s"] = len(ids)
+
+        actors = _Zipf(actor_ids, spec.popularity_skew, rng)
+        directors = _Zipf(director_ids, spec.popularity_skew, rng)
+
+        movie_ids = range(first_movie, first_movie + spec.movies)
+        for chunk in _chunks(movie_ids.start, movie_ids.stop, spec.chunk_size):
+            movies: List[Dict] = []
+            cast: List[Dict] = []
+            genres: List[Dict] = []
+            ratings: List[Dict] = []
+            for movie_id in chunk:
+                title = _phrase(rng, rng.randint(1, 4)).title()
+                quality = rng.uniform(3.0, 9.0)
+                scores = [
+                    min(10.0, max(0.0, round(rng.gauss(quality, 1.5), 1)))
+                    for _ in range(_ratings_count(rng, spec))
+                ]
+                movies.append(
+                    {
+                        "id": movie_id,
+                        "title": title,
+                        "title_folded": fold(title),
+                        "release_year": rng.randint(1920, 2025),
+                        "synopsis": _phrase(rng, rng.randint(8, 30)).capitalize() + ".",
+                        "poster_url": None,
+                        "duration_minutes": rng.randint(75, 200),
+                        "status": rng.choice(STATUSES),
+                        "director_id": directors.sample(rng, 1)[0],
+                        "rating_count": len(scores),
+                        "rating_sum": sum(scores),
+                        "average_rating": sum(scores) / len(scores) if scores else None,
+                    }
+                )
+                cast.extend(
+                    {"movie_id": movie_id, "actor_id": actor_id}
+                    for actor_id in actors.sample(rng, rng.randint(*spec.cast_size))
+                )
+                genres.extend(
+                    {"movie_id": movie_id, "genre_id": genre_id}
+                    for genre_id in rng.sample(
+                        genre_ids, min(rng.randint(*spec.genres_per_movie), len(genre_ids))
+                    )
+                )
+                ratings.extend(
+                    {"movie_id": movie_id, "score": score, "review": _review(rng, spec)}
+                    for score in scores
+                )
+
+            with engine.begin() as conn:
+                conn.execute(insert(Movie), movies)
+                conn.execute(insert(movie_actors), cast)
+                conn.execute(insert(movie_genres), genres)
+                if ratings:
+                    conn.execute(insert(Rating), ratings)
+            counts["movies"] += len(movies)
+            counts["movie_actors"] += len(cast)
+            counts["movie_genres"] += len(genres)
+            counts["ratings"] += len(ratings)
+            logger.info("Generated %d/%d movies", counts["movies"], spec.movies)
+    finally:
+        # Also after a failed load, so the index matches whatever was committed
+        if search_index:
+            with engine.begin() as conn:
+                rebuild_search_index(conn)
+                create_search_triggers(conn)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    return counts
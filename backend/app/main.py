@@ -4,27 +4,43 @@ Main FastAPI application.
 Movie Explorer Platform - RESTful API with comprehensive filtering.
 """
 
-from typing import Any, Dict
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.endpoints import actors, directors, genres, movies, ratings
-from app.db.database import SessionLocal, init_db
-from app.db.seed_data import seed_database
-from app.models import Movie
+from app.api.endpoints import actors, debug, directors, export, genres, movies, ratings, suggest
+from app.api.middleware import (
+    CACHE_STATUS_HEADER,
+    DB_TIME_HEADER,
+    ETAG_HEADER,
+    STATEMENTS_HEADER,
+    DataVersionMiddleware,
+    ETagMiddleware,
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    ResponseCacheMiddleware,
+)
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core import metrics
+from app.core.cache import response_cache
+from app.db.bootstrap import prepare_database
+from app.db.database import slow_queries
+
+# Set to 0 when the database is prepared ahead of time with `python -m app.cli init`
+PREPARE_ON_STARTUP = os.getenv("DATABASE_PREPARE_ON_STARTUP", "1") != "0"
+
 
-# Initialize database
-init_db()
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create and seed the database before serving; the typeahead index builds on first use."""
+    if PREPARE_ON_STARTUP:
+        await run_in_threadpool(prepare_database)
+    yield
 
-# Seed database with sample data (only if empty)
-db = SessionLocal()
-try:
-    existing_movies = db.query(Movie).count()
-    if existing_movies == 0:
-        seed_database(db)
-finally:
-    db.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -33,8 +49,19 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# Cache GET responses and answer conditional GETs; added before CORS so cached
+# and 304 responses still get CORS headers
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(ETagMiddleware)
+# Outside both, so writes by other workers or the CLI are applied first
+app.add_middleware(DataVersionMiddleware)
+# Outside the cache so hits report the queries they did not run
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -42,6 +69,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        NEXT_CURSOR_HEADER,
+        CACHE_STATUS_HEADER,
+        ETAG_HEADER,
+        STATEMENTS_HEADER,
+        DB_TIME_HEADER,
+    ],
 )
 
 # Include routers
@@ -50,6 +84,11 @@ app.include_router(actors.router, prefix="/api/actors", tags=["Actors"])
 app.include_router(directors.router, prefix="/api/directors", tags=["Directors"])
 app.include_router(genres.router, prefix="/api/genres", tags=["Genres"])
 app.include_router(ratings.router, prefix="/api", tags=["Ratings"])
+app.include_router(suggest.router, prefix="/api/suggest", tags=["Suggest"])
+app.include_router(export.router, prefix="/api/export", tags=["Export"])
+# Statements and plans are internal details, so the log is only served when enabled
+if slow_queries.enabled:
+    app.include_router(debug.router, prefix="/debug", tags=["Health"])
 
 
 @app.get("/", tags=["Root"])
@@ -65,6 +104,8 @@ def root() -> Dict[str, Any]:
             "directors": "/api/directors",
             "genres": "/api/genres",
             "ratings": "/api/ratings",
+            "suggest": "/api/suggest",
+            "export": "/api/export/{movies|actors|directors|ratings}",
         },
     }
 
@@ -73,3 +114,20 @@ def root() -> Dict[str, Any]:
 def health_check() -> Dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/health/cache", tags=["Health"])
+def cache_stats() -> Dict[str, Any]:
+    """Response cache size and hit/miss/eviction counters."""
+    return response_cache.stats()
+
+
+metrics.registry.collectors.append(lambda: metrics.cache_lines(response_cache.stats()))
+
+
+@app.get("/metrics", tags=["Health"], response_class=Response)
+def prometheus_metrics() -> Response:
+    """Request, database and cache metrics in the Prometheus text format."""
+    return Response(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,3 +1,6 @@
+from app.db import data_versions  # noqa: F401 registers the shared write versions table
+from app.db import search_index  # registers the FTS index DDL with Base.metadata
+
 from .actor import Actor
 from .director import Director
 from .genre import Genre
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
 
+from .folded import fold_on_set, folded_column
+
 """SQLAlchemy model for actors appearing in movies."""
 
 
@@ -15,10 +19,14 @@ class Actor(Base):
 
     __tablename__ = "actors"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, index=True)
-    bio = Column(Text, nullable=True)
-    photo_url = Column(String(500), nullable=True)  # URL to actor photo
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    name_folded: Mapped[Optional[str]] = folded_column("name", 255)
+    bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # URL to actor photo
+    photo_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Many-to-many relationship with movies
     movies = relationship("Movie", secondary="movie_actors", back_populates="actors")
+
+    _fold_name = fold_on_set("name", "name_folded")
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
 
+from .folded import fold_on_set, folded_column
+
 """SQLAlchemy model for directors of movies."""
 
 
@@ -14,10 +18,14 @@ class Director(Base):
 
     __tablename__ = "directors"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, index=True)
-    bio = Column(Text, nullable=True)
-    photo_url = Column(String(500), nullable=True)  # URL to director photo
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    name_folded: Mapped[Optional[str]] = folded_column("name", 255)
+    bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # URL to director photo
+    photo_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Relationship: one director can have many movies
     movies = relationship("Movie", back_populates="director")
+
+    _fold_name = fold_on_set("name", "name_folded")
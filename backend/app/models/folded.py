@@ -0,0 +1,38 @@
+from typing import Any, Callable, Optional
+
+from sqlalchemy import String
+from sqlalchemy.orm import MappedColumn, mapped_column, validates
+
+from app.core.text import fold
+
+"""Case-folded shadow columns for index-backed name lookups.
+
+SQLite cannot serve ``ILIKE '%v%'`` (or Unicode-aware case-insensitive
+comparisons) from an index, so each searchable name has a folded copy that
+exact and prefix filters compare against with plain ``=``/range predicates.
+"""
+
+
+def folded_column(source: str, length: int) -> MappedColumn[Optional[str]]:
+    """Indexed column holding `fold` of `source`.
+
+    The insert default covers Core inserts; ORM writes set it through
+    `fold_on_set`.
+    """
+
+    def default(context: Any) -> Any:
+        value = context.get_current_parameters().get(source)
+        return None if value is None else fold(value)
+
+    return mapped_column(String(length), nullable=True, index=True, default=default)
+
+
+def fold_on_set(source: str, target: str) -> Callable:
+    """Validator that keeps `target` equal to `fold` of `source` on assignment."""
+
+    @validates(source)
+    def _fold(self: Any, key: str, value: Any) -> Any:
+        setattr(self, target, None if value is None else fold(value))
+        return value
+
+    return _fold
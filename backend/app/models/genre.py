@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
 
+from .folded import fold_on_set, folded_column
+
 """SQLAlchemy model for genres that categorize movies."""
 
 
@@ -14,8 +18,11 @@ class Genre(Base):
 
     __tablename__ = "genres"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False, unique=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True, index=True)
+    name_folded: Mapped[Optional[str]] = folded_column("name", 100)
 
     # Many-to-many relationship with movies
     movies = relationship("Movie", secondary="movie_genres", back_populates="genres")
+
+    _fold_name = fold_on_set("name", "name_folded")
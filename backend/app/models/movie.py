@@ -1,8 +1,12 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Table, Text
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, String, Table, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
 
+from .folded import fold_on_set, folded_column
+
 """SQLAlchemy models for movie entities and association tables.
 
 Defines:
@@ -17,6 +21,8 @@ movie_genres = Table(
     Base.metadata,
     Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
     Column("genre_id", Integer, ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key serves lookups by movie; this serves semi-joins by genre
+    Index("ix_movie_genres_genre_id", "genre_id"),
 )
 
 # Association table for many-to-many relationship between movies and actors
@@ -25,6 +31,7 @@ movie_actors = Table(
     Base.metadata,
     Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
     Column("actor_id", Integer, ForeignKey("actors.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_movie_actors_actor_id", "actor_id"),
 )
 
 
@@ -37,17 +44,34 @@ class Movie(Base):
 
     __tablename__ = "movies"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False, index=True)
-    release_year = Column(Integer, nullable=False, index=True)
-    synopsis = Column(Text, nullable=True)
-    poster_url = Column(String(500), nullable=True)  # URL to movie poster image
-    duration_minutes = Column(Integer, nullable=True)  # Movie duration in minutes
-    status = Column(String(50), default="Released")  # Released, Coming Soon, etc.
-    director_id = Column(Integer, ForeignKey("directors.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    title_folded: Mapped[Optional[str]] = folded_column("title", 255)
+    release_year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    synopsis: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # URL to movie poster image
+    poster_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Movie duration in minutes
+    duration_minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Released, Coming Soon, etc.
+    status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, default="Released")
+    director_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("directors.id"), nullable=False, index=True
+    )
+
+    # Rating aggregates, maintained by the rating endpoints (see app.db.aggregates)
+    rating_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    rating_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
+    average_rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     # Relationships
     director = relationship("Director", back_populates="movies")
     actors = relationship("Actor", secondary=movie_actors, back_populates="movies")
     genres = relationship("Genre", secondary=movie_genres, back_populates="movies")
     ratings = relationship("Rating", back_populates="movie", cascade="all, delete-orphan")
+
+    _fold_title = fold_on_set("title", "title_folded")
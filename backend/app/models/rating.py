@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Float, ForeignKey, Integer, Text
-from sqlalchemy.orm import relationship
+from typing import Optional
+
+from sqlalchemy import Float, ForeignKey, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
 
@@ -14,10 +16,12 @@ class Rating(Base):
 
     __tablename__ = "ratings"
 
-    id = Column(Integer, primary_key=True, index=True)
-    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
-    score = Column(Float, nullable=False)  # e.g., 0.0 to 10.0
-    review = Column(Text, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    movie_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)  # e.g., 0.0 to 10.0
+    review: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relationship
     movie = relationship("Movie", back_populates="ratings")
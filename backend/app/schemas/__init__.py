@@ -1,8 +1,19 @@
 from .actor import Actor, ActorCreate, ActorDetail, ActorUpdate
+from .bulk import BulkItemResult, BulkResult
 from .director import Director, DirectorCreate, DirectorDetail, DirectorUpdate
 from .genre import Genre, GenreCreate, GenreUpdate
-from .movie import Movie, MovieCreate, MovieDetail, MovieUpdate
+from .movie import (
+    Movie,
+    MovieCreate,
+    MovieDetail,
+    MovieIncluded,
+    MovieListItem,
+    MovieUpdate,
+    SideloadedMovie,
+    SideloadedMovies,
+)
 from .rating import Rating, RatingCreate, RatingUpdate
+from .suggest import Suggestion, SuggestionType
 
 # Rebuild models to resolve forward references
 ActorDetail.model_rebuild()
@@ -14,6 +25,10 @@ __all__ = [
     "MovieCreate",
     "MovieUpdate",
     "MovieDetail",
+    "MovieListItem",
+    "MovieIncluded",
+    "SideloadedMovie",
+    "SideloadedMovies",
     "Actor",
     "ActorCreate",
     "ActorUpdate",
@@ -28,4 +43,8 @@ __all__ = [
     "Rating",
     "RatingCreate",
     "RatingUpdate",
+    "Suggestion",
+    "SuggestionType",
+    "BulkItemResult",
+    "BulkResult",
 ]
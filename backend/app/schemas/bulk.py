@@ -0,0 +1,17 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item of a bulk write, by its position in the request."""
+
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkItemResult]
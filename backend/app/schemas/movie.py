@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .actor import Actor
 from .director import Director
@@ -55,24 +55,68 @@ class Movie(MovieBase):
 
 
 class MovieDetail(Movie):
-    """Movie with all relationships and computed fields."""
+    """Movie with all relationships and stored rating aggregates."""
 
     director: Director
     genres: List[Genre] = []
     actors: List[Actor] = []
     ratings: List[Rating] = []
+    average_rating: Optional[float] = None
+    rating_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
-    @computed_field
-    def average_rating(self) -> Optional[float]:
-        """Calculate average rating from all ratings."""
-        if not self.ratings:
-            return None
-        avg = sum(r.score for r in self.ratings) / len(self.ratings)
-        return round(avg, 1)
-
-    @computed_field
-    def rating_count(self) -> int:
-        """Get total number of ratings."""
-        return len(self.ratings)
+    @field_validator("average_rating")
+    @classmethod
+    def round_average(cls, v):
+        return None if v is None else round(v, 1)
+
+
+class MovieListItem(BaseModel):
+    """Movie in a list response.
+
+    Only the requested fields and relationships are set; the list endpoints
+    exclude unset fields from the response.
+    """
+
+    id: int
+    title: Optional[str] = None
+    release_year: Optional[int] = None
+    synopsis: Optional[str] = None
+    poster_url: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    status: Optional[str] = None
+    director_id: Optional[int] = None
+    average_rating: Optional[float] = None
+    rating_count: Optional[int] = None
+    director: Optional[Director] = None
+    genres: Optional[List[Genre]] = None
+    actors: Optional[List[Actor]] = None
+    ratings: Optional[List[Rating]] = None
+
+    @field_validator("average_rating")
+    @classmethod
+    def round_average(cls, v):
+        return None if v is None else round(v, 1)
+
+
+class SideloadedMovie(MovieListItem):
+    """Movie referencing its director, genres and actors by id."""
+
+    genre_ids: Optional[List[int]] = None
+    actor_ids: Optional[List[int]] = None
+
+
+class MovieIncluded(BaseModel):
+    """Entities referenced by a page of side-loaded movies, keyed by id."""
+
+    directors: Optional[Dict[int, Director]] = None
+    genres: Optional[Dict[int, Genre]] = None
+    actors: Optional[Dict[int, Actor]] = None
+
+
+class SideloadedMovies(BaseModel):
+    """Movie list with each referenced entity serialized once under `included`."""
+
+    movies: List[SideloadedMovie]
+    included: MovieIncluded
@@ -0,0 +1,13 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+SuggestionType = Literal["movie", "actor", "director", "genre"]
+
+
+class Suggestion(BaseModel):
+    """Typeahead suggestion pointing at a movie, actor, director or genre."""
+
+    type: SuggestionType
+    id: int
+    label: str
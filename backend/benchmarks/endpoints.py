@@ -0,0 +1,375 @@
+"""Latency, SQL statements and response size of every API route.
+
+Each dataset tier is a fresh database filled by `app.db.synthetic`. Every
+scenario (list pages, filter combinations, search, details, suggestions and
+create/update/delete of each entity) is requested ``--requests`` times through
+`TestClient` with the response cache disabled, and reported as p50/p95/p99
+latency, SQL statements per request and response bytes.
+
+``--save`` writes the results to a JSON baseline; ``--check`` compares them
+with the baseline and exits with status 1 when a scenario got slower (by
+``--metric``, the median by default) or larger by more than ``--threshold``,
+or issues more SQL statements. Latencies are compared after scaling by a
+fixed calibration workload timed alongside each tier, which absorbs the
+machine being uniformly faster or slower than when the baseline was recorded.
+
+Run from ``backend/``::
+
+    python -m benchmarks.endpoints --tiers small medium --requests 50
+    python -m benchmarks.endpoints --save
+    python -m benchmarks.endpoints --check --threshold 0.5
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_db, get_read_db
+from app.core.cache import response_cache
+from app.core.querystats import count_queries
+from app.core.suggest import suggestions
+from app.core.versions import versions
+from app.db.database import Base, create_sqlite_engine, sqlite_pragmas
+from app.db.synthetic import CatalogSpec, generate_catalog
+from app.main import app
+
+# Tier -> number of movies
+TIERS = {"small": 1_000, "medium": 10_000, "large": 100_000}
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "endpoints.json")
+
+# method, url, JSON body
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class Dataset(NamedTuple):
+    """Sizes of the generated catalog, used to pick ids for requests."""
+
+    movies: int
+    actors: int
+    directors: int
+    genres: int
+
+    def pick(self, total: int, i: int) -> int:
+        """A different id in ``1..total`` for every request number `i`."""
+        return 1 + (i * 7919) % total
+
+
+# Scenario builders receive the client, the dataset and the request number.
+# Anything they send themselves (e.g. creating the row a DELETE removes) is
+# setup and not measured.
+Scenario = Callable[[TestClient, Dataset, int], Request]
+
+
+def _get(url: str) -> Scenario:
+    return lambda client, data, i: ("GET", url, None)
+
+
+def _detail(prefix: str, size: str, suffix: str = "") -> Scenario:
+    return lambda client, data, i: (
+        "GET",
+        f"{prefix}/{data.pick(getattr(data, size), i)}{suffix}",
+        None,
+    )
+
+
+def _movie_body(data: Dataset, i: int) -> Dict[str, Any]:
+    return {
+        "title": f"Benchmark movie {i}",
+        "release_year": 2000 + i % 25,
+        "director_id": data.pick(data.directors, i),
+        "genre_ids": [data.pick(data.genres, i), data.pick(data.genres, i + 1)],
+        "actor_ids": [data.pick(data.actors, i + n) for n in range(6)],
+    }
+
+
+def _second_page(client: TestClient, data: Dataset, i: int) -> Request:
+    cursor = client.get("/api/movies/?sort=title&limit=50").headers["X-Next-Cursor"]
+    return "GET", f"/api/movies/?sort=title&limit=50&cursor={cursor}", None
+
+
+def _created(url: str, body: Callable[[Dataset, int], Dict[str, Any]]) -> Callable:
+    """Builder of `url`/{id} for a row created (unmeasured) from `body`."""
+
+    def create(client: TestClient, data: Dataset, i: int) -> str:
+        response = client.post(url, json=body(data, i))
+        response.raise_for_status()
+        return f"{url.rstrip('/')}/{response.json()['id']}"
+
+    return create
+
+
+_new_movie = _created("/api/movies/", _movie_body)
+_new_actor = _created("/api/actors/", lambda data, i: {"name": f"Benchmark actor {i}"})
+_new_director = _created("/api/directors/", lambda data, i: {"name": f"Benchmark director {i}"})
+_new_genre = _created("/api/genres/", lambda data, i: {"name": f"Benchmark genre {i}"})
+_new_rating = _created(
+    "/api/ratings", lambda data, i: {"movie_id": data.pick(data.movies, i), "score": 7.5}
+)
+
+READS: Dict[str, Scenario] = {
+    "movies list": _get("/api/movies/"),
+    "movies list with ratings": _get("/api/movies/?include=director,genres,actors,ratings"),
+    "movies list sideloaded": _get("/api/movies/?shape=sideload"),
+    "movies list id,title": _get("/api/movies/?fields=id,title&include="),
+    "movies by genre": _get("/api/movies/?genre=Drama"),
+    "movies by genre and years": _get("/api/movies/?genre_id=3&min_year=1980&max_year=2010"),
+    "movies by actor": lambda client, data, i: (
+        "GET",
+        f"/api/movies/?actor_id={data.pick(data.actors, i)}",
+        None,
+    ),
+    "movies by director and status": _get("/api/movies/?director_id=1&status=Released"),
+    "movies title search": _get("/api/movies/?search=night&sort=title"),
+    "movies deep offset": lambda client, data, i: (
+        "GET",
+        f"/api/movies/?skip={data.movies // 2}",
+        None,
+    ),
+    "movies cursor page": _second_page,
+    "movies search": _get("/api/movies/search?q=silent river"),
+    "movie detail": _detail("/api/movies", "movies"),
+    "movie ratings": _detail("/api/movies", "movies", "/ratings"),
+    "actors list": _get("/api/actors/"),
+    "actors by genre": _get("/api/actors/?genre=Comedy"),
+    "actors name search": _get("/api/actors/?search=ada&sort=name"),
+    "actor detail": _detail("/api/actors", "actors"),
+    "directors list": _get("/api/directors/"),
+    "director detail": _detail("/api/directors", "directors"),
+    "genres list": _get("/api/genres/"),
+    "genre detail": _detail("/api/genres", "genres"),
+    "suggest": _get("/api/suggest?q=mi"),
+}
+
+WRITES: Dict[str, Scenario] = {
+    "movie create": lambda client, data, i: ("POST", "/api/movies/", _movie_body(data, i)),
+    "movie update": lambda client, data, i: (
+        "PUT",
+        f"/api/movies/{data.pick(data.movies, i)}",
+        {"title": f"Retitled {i}", "genre_ids": [data.pick(data.genres, i)]},
+    ),
+    "movie delete": lambda client, data, i: ("DELETE", _new_movie(client, data, i), None),
+    "actor create": lambda client, data, i: ("POST", "/api/actors/", {"name": f"Actor {i}"}),
+    "actor update": lambda client, data, i: (
+        "PUT",
+        f"/api/actors/{data.pick(data.actors, i)}",
+        {"bio": f"Updated {i}"},
+    ),
+    "actor delete": lambda client, data, i: ("DELETE", _new_actor(client, data, i), None),
+    "director create": lambda client, data, i: (
+        "POST",
+        "/api/directors/",
+        {"name": f"Director {i}"},
+    ),
+    "director update": lambda client, data, i: (
+        "PUT",
+        f"/api/directors/{data.pick(data.directors, i)}",
+        {"bio": f"Updated {i}"},
+    ),
+    "director delete": lambda client, data, i: ("DELETE", _new_director(client, data, i), None),
+    "genre create": lambda client, data, i: ("POST", "/api/genres/", {"name": f"Genre #{i}"}),
+    "genre update": lambda client, data, i: ("PUT", _new_genre(client, data, i), {"name": f"G{i}"}),
+    "genre delete": lambda client, data, i: ("DELETE", _new_genre(client, data, -i - 1), None),
+    "rating create": lambda client, data, i: (
+        "POST",
+        "/api/ratings",
+        {"movie_id": data.pick(data.movies, i), "score": 6.0, "review": "Fine."},
+    ),
+    "rating update": lambda client, data, i: ("PUT", _new_rating(client, data, i), {"score": 9.0}),
+    "rating delete": lambda client, data, i: ("DELETE", _new_rating(client, data, i), None),
+}
+
+
+def _calibrate(rounds: int = 15) -> float:
+    """Median time in ms of a fixed workload (SQLite queries and JSON encoding)."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT, value REAL)")
+    conn.executemany(
+        "INSERT INTO t VALUES (?, ?, ?)", ((n, f"row {n}", n / 3) for n in range(2000))
+    )
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        rows = conn.execute("SELECT * FROM t WHERE value > 10 ORDER BY name").fetchall()
+        json.dumps([{"id": i, "name": name, "value": value} for i, name, value in rows])
+        timings.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    return statistics.median(timings)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+class _Tier:
+    """A generated database wired into the app in place of the configured one."""
+
+    def __init__(self, movies: int) -> None:
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, "benchmark.db")
+        self.engine = create_sqlite_engine(f"sqlite:///{path}", sqlite_pragmas("performance"))
+        Base.metadata.create_all(bind=self.engine)
+        counts = generate_catalog(self.engine, CatalogSpec(movies=movies))
+        with self.engine.connect() as conn:
+            genres = conn.exec_driver_sql("SELECT COUNT(*) FROM genres").scalar_one()
+        self.data = Dataset(counts["movies"], counts["actors"], counts["directors"], genres)
+        self.sessions = sessionmaker(bind=self.engine, autoflush=False)
+
+    def override(self) -> Iterator[Any]:
+        db = self.sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def close(self) -> None:
+        self.engine.dispose()
+        for name in os.listdir(self.directory):
+            os.unlink(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+
+def run_tier(movies: int, requests: int, warmup: int) -> Dict[str, Any]:
+    """Measure every scenario against a catalog of `movies` movies."""
+    tier = _Tier(movies)
+    app.dependency_overrides[get_db] = tier.override
+    app.dependency_overrides[get_read_db] = tier.override
+    suggestions.reset()
+    versions.reset()
+    # Measure the endpoints themselves, not cache hits
+    max_entries, response_cache.max_entries = response_cache.max_entries, 0
+    client = TestClient(app)
+    results = {}
+    calibration = [_calibrate()]
+    try:
+        for name, scenario in itertools.chain(READS.items(), WRITES.items()):
+            latencies, statements, sizes = [], [], []
+            for i in range(warmup + requests):
+                method, url, body = scenario(client, tier.data, i)
+                # Collections run between requests rather than inside the timed one
+                gc.disable()
+                with count_queries() as queries:
+                    start = time.perf_counter()
+                    response = client.request(method, url, json=body)
+                    elapsed = time.perf_counter() - start
+                gc.enable()
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{name}: {method} {url} -> {response.status_code}")
+                if i >= warmup:
+                    latencies.append(elapsed * 1000)
+                    statements.append(queries.statements)
+                    sizes.append(len(response.content))
+            results[name] = {
+                "p50_ms": round(_percentile(latencies, 50), 3),
+                "p95_ms": round(_percentile(latencies, 95), 3),
+                "p99_ms": round(_percentile(latencies, 99), 3),
+                "statements": max(statements),
+                "bytes": round(statistics.median(sizes)),
+            }
+        calibration.append(_calibrate())
+    finally:
+        response_cache.max_entries = max_entries
+        app.dependency_overrides.clear()
+        suggestions.reset()
+        versions.reset()
+        tier.close()
+    return {"calibration_ms": round(statistics.mean(calibration), 4), "scenarios": results}
+
+
+def regressions(
+    baseline: Dict[str, Any],
+    results: Dict[str, Any],
+    threshold: float,
+    slack_ms: float,
+    metric: str = "p50_ms",
+) -> List[str]:
+    """Describe every scenario of `results` that regressed against `baseline`."""
+    found = []
+    for tier, measured in results.items():
+        if tier not in baseline:
+            continue
+        speed = measured["calibration_ms"] / baseline[tier]["calibration_ms"]
+        for name, current in measured["scenarios"].items():
+            previous = baseline[tier]["scenarios"].get(name)
+            if previous is None:
+                continue
+            label = f"{tier} / {name}"
+            expected = previous[metric] * speed
+            if current[metric] > max(expected * (1 + threshold), expected + slack_ms):
+                found.append(f"{label}: {metric} {expected:.3f} -> {current[metric]} (scaled)")
+            if current["statements"] > previous["statements"]:
+                found.append(
+                    f"{label}: statements {previous['statements']} -> {current['statements']}"
+                )
+            if current["bytes"] > previous["bytes"] * (1 + threshold):
+                found.append(f"{label}: bytes {previous['bytes']} -> {current['bytes']}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tiers", nargs="+", choices=TIERS, default=["small", "medium"])
+    parser.add_argument("--requests", type=int, default=30, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=3, help="unmeasured requests per scenario")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON baseline file")
+    parser.add_argument("--save", action="store_true", help="write the results as the baseline")
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed relative growth")
+    parser.add_argument(
+        "--metric", choices=["p50_ms", "p95_ms", "p99_ms"], default="p50_ms", help="latency gate"
+    )
+    parser.add_argument(
+        "--slack-ms", type=float, default=1.0, help="latency growth always allowed, in ms"
+    )
+    args = parser.parse_args()
+
+    columns = ["p50_ms", "p95_ms", "p99_ms", "statements", "bytes"]
+    results = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for tier in args.tiers:
+            results[tier] = run_tier(TIERS[tier], args.requests, args.warmup)
+            print(f"\n{tier} ({TIERS[tier]} movies)")
+            print(f"{'scenario':<32}" + "".join(f"{column:>12}" for column in columns))
+            for name, metrics in results[tier]["scenarios"].items():
+                print(f"{name:<32}" + "".join(f"{metrics[column]:>12}" for column in columns))
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        found = regressions(baseline, results, args.threshold, args.slack_ms, args.metric)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Per-item cost of serializing read responses.
+
+Compares the previous path of the movie, actor and director read endpoints
+(schema objects re-validated against ``response_model``, converted to
+``jsonable`` data and encoded with ``json.dumps``) with the current one
+(`app.api.responses.json_response`: trusted rows for list pages, a single
+validation for details, JSON bytes written by pydantic-core). Both paths start
+from loaded ORM rows and must produce the same JSON.
+
+Run from ``backend/``::
+
+    python -m benchmarks.serialization --items 100 --rounds 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.api.endpoints.actors import ACTOR_FIELDS
+from app.api.endpoints.movies import MOVIE_DETAIL_OPTIONS
+from app.api.fieldsets import DEFAULT_INCLUDE, MOVIE_FIELDS, MovieFieldset, serialize
+from app.api.responses import json_response, trusted_row
+from app.db.database import Base
+from app.db.seed_data import seed_database
+from app.models import Actor, Director, Movie
+from app.schemas import Actor as ActorSchema
+from app.schemas import ActorDetail, DirectorDetail, MovieDetail, MovieListItem
+
+FIELDSET = MovieFieldset(MOVIE_FIELDS, DEFAULT_INCLUDE)
+
+
+def _response_model(loop: asyncio.AbstractEventLoop, schema: Any, exclude_unset: bool = False):
+    """Render like a route returning `content` with ``response_model=schema``."""
+    field = create_response_field(name="benchmark", type_=schema, mode="serialization")
+
+    def render(content: Any) -> bytes:
+        jsonable = loop.run_until_complete(
+            serialize_response(
+                field=field,
+                response_content=content,
+                exclude_unset=exclude_unset,
+                is_coroutine=False,
+            )
+        )
+        return JSONResponse(jsonable).body
+
+    return render
+
+
+def _per_item_us(render: Callable[[], bytes], items: int, rounds: int) -> float:
+    render()  # warm up adapters and validators
+    start = time.perf_counter()
+    for _ in range(rounds):
+        render()
+    return (time.perf_counter() - start) / (rounds * items) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="items per response")
+    parser.add_argument("--rounds", type=int, default=200, help="responses rendered per case")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    engine = create_engine(f"sqlite:///{path}")
+    loop = asyncio.new_event_loop()
+    try:
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        seed_database(db)
+
+        movies = db.query(Movie).options(*MOVIE_DETAIL_OPTIONS).all()
+        actors = db.query(Actor).options(joinedload(Actor.movies)).all()
+        directors = db.query(Director).options(joinedload(Director.movies)).all()
+
+        def page(rows: List[Any]) -> List[Any]:
+            copies: int = args.items // len(rows) + 1
+            return (rows * copies)[: args.items]
+
+        movie_page, actor_page, director_page = page(movies), page(actors), page(directors)
+
+        movie_list = _response_model(loop, List[MovieListItem], exclude_unset=True)
+        movie_detail = _response_model(loop, List[MovieDetail])
+        actor_list = _response_model(loop, List[ActorSchema])
+        actor_detail = _response_model(loop, List[ActorDetail])
+        director_detail = _response_model(loop, List[DirectorDetail])
+
+        # payload -> (previous path, current path)
+        cases: Dict[str, Tuple[Callable[[], bytes], Callable[[], bytes]]] = {
+            "movie list": (
+                lambda: movie_list(
+                    [MovieListItem.model_validate(serialize(m, FIELDSET)) for m in movie_page]
+                ),
+                lambda: json_response([serialize(m, FIELDSET) for m in movie_page]).body,
+            ),
+            "movie detail": (
+                lambda: movie_detail([MovieDetail.model_validate(m) for m in movie_page]),
+                lambda: json_response(
+                    [MovieDetail.model_validate(m) for m in movie_page], List[MovieDetail]
+                ).body,
+            ),
+            "actor list": (
+                lambda: actor_list([ActorSchema.model_validate(a) for a in actor_page]),
+                lambda: json_response([trusted_row(a, ACTOR_FIELDS) for a in actor_page]).body,
+            ),
+            "actor detail": (
+                lambda: actor_detail(actor_page),
+                lambda: json_response(
+                    [ActorDetail.model_validate(a) for a in actor_page], List[ActorDetail]
+                ).body,
+            ),
+            "director detail": (
+                lambda: director_detail(director_page),
+                lambda: json_response(
+                    [DirectorDetail.model_validate(d) for d in director_page],
+                    List[DirectorDetail],
+                ).body,
+            ),
+        }
+
+        print(f"{'payload':<16}{'before µs/item':>16}{'after µs/item':>16}{'speedup':>10}")
+        for name, (before_path, after_path) in cases.items():
+            assert json.loads(before_path()) == json.loads(after_path()), name
+            before = _per_item_us(before_path, args.items, args.rounds)
+            after = _per_item_us(after_path, args.items, args.rounds)
+            print(f"{name:<16}{before:>16.1f}{after:>16.1f}{before / after:>9.1f}x")
+    finally:
+        loop.close()
+        engine.dispose()
+        os.close(fd)
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Mixed read/write throughput under each SQLite tuning profile.
+
+For every profile in `app.db.database.SQLITE_PROFILES` a fresh seeded database
+is hammered by reader threads loading a page of movies with their
+relationships while one writer thread adds ratings and refreshes the stored
+aggregates, as the ratings endpoint does.
+
+Run from ``backend/``::
+
+    python -m benchmarks.sqlite_profiles --readers 8 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import warnings
+from typing import Dict, List
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.endpoints.movies import MOVIE_DETAIL_OPTIONS
+from app.db.aggregates import refresh_rating_aggregates
+from app.db.database import SQLITE_PROFILES, Base, create_sqlite_engine, sqlite_pragmas
+from app.db.seed_data import seed_database
+from app.models import Movie, Rating
+
+
+def run_profile(profile: str, readers: int, seconds: float) -> Dict[str, float]:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    engine = create_sqlite_engine(
+        f"sqlite:///{path}", sqlite_pragmas(profile), pool_size=readers + 1
+    )
+    Session = sessionmaker(bind=engine, autoflush=False)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with Session() as db, warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            seed_database(db)
+            movie_ids = [movie_id for (movie_id,) in db.query(Movie.id)]
+
+        stop = threading.Event()
+        latencies: List[float] = []
+        counts = {"writes": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def read() -> None:
+            local = []
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    with Session() as db:
+                        db.query(Movie).options(*MOVIE_DETAIL_OPTIONS).order_by(Movie.id).limit(
+                            20
+                        ).all()
+                    local.append(time.perf_counter() - start)
+                except OperationalError:
+                    with lock:
+                        counts["errors"] += 1
+            with lock:
+                latencies.extend(local)
+
+        def write() -> None:
+            while not stop.is_set():
+                movie_id = random.choice(movie_ids)
+                try:
+                    with Session() as db:
+                        db.add(Rating(movie_id=movie_id, score=round(random.uniform(1, 10), 1)))
+                        db.flush()
+                        refresh_rating_aggregates(db, [movie_id])
+                        db.commit()
+                    counts["writes"] += 1
+                except OperationalError:
+                    with lock:
+                        counts["errors"] += 1
+
+        threads = [threading.Thread(target=read) for _ in range(readers)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else float("nan")
+        return {
+            "reads/s": len(latencies) / seconds,
+            "writes/s": counts["writes"] / seconds,
+            "p95 read ms": p95 * 1000,
+            "errors": counts["errors"],
+        }
+    finally:
+        engine.dispose()
+        os.close(fd)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8, help="concurrent reader threads")
+    parser.add_argument("--seconds", type=float, default=5, help="duration per profile")
+    args = parser.parse_args()
+
+    columns = ["reads/s", "writes/s", "p95 read ms", "errors"]
+    print(f"{'profile':<14}" + "".join(f"{column:>14}" for column in columns))
+    for profile in SQLITE_PROFILES:
+        result = run_profile(profile, args.readers, args.seconds)
+        print(f"{profile:<14}" + "".join(f"{result[column]:>14.1f}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
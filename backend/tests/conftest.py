@@ -1,17 +1,42 @@
 """Pytest configuration and fixtures."""
 
 import os
+import shutil
 import tempfile
+from contextlib import contextmanager
 
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+# The configured database of the test session is a scratch file, never ./movies.db;
+# set before importing the app, which reads the paths at import time
+SCRATCH_DIR = tempfile.mkdtemp(prefix="movie-explorer-tests-")
+os.environ["DATABASE_PATH"] = os.path.join(SCRATCH_DIR, "movies.db")
+os.environ["DATABASE_SNAPSHOT"] = os.path.join(SCRATCH_DIR, "seed.db")
 
-from app.api.deps import get_db
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.deps import get_db, get_read_db  # noqa: E402
 
 # Import after to avoid triggering main app initialization
-from app.db.database import Base
+from app.db.data_versions import data_versions  # noqa: E402
+from app.db.database import Base, create_sqlite_engine, sqlite_pragmas  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def configured_database():
+    """Prepare the configured scratch database once for tests using a module-level TestClient.
+
+    Importing `app.main` no longer touches the database and those clients never
+    enter the app lifespan, so the startup work is done here instead.
+    """
+    from app.db.bootstrap import prepare_database
+    from app.db.database import engine, read_engine
+
+    prepare_database()
+    yield
+    engine.dispose()
+    read_engine.dispose()
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
 
 
 @pytest.fixture(scope="session")
@@ -21,11 +46,13 @@ def engine():
     db_fd, db_path = tempfile.mkstemp(suffix=".db")
     TEST_DATABASE_URL = f"sqlite:///{db_path}"
 
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_sqlite_engine(TEST_DATABASE_URL, sqlite_pragmas("performance"))
+    data_versions.install(engine)
 
     yield engine
 
     # Cleanup
+    data_versions.remove(engine)
     engine.dispose()
     os.close(db_fd)
     os.unlink(db_path)
@@ -59,6 +86,9 @@ def db_session(engine):
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a test client with test database."""
+    from app.core.cache import response_cache
+    from app.core.suggest import suggestions
+    from app.core.versions import versions
     from app.main import app
 
     def override_get_db():
@@ -67,12 +97,61 @@ def client(db_session):
         finally:
             pass
 
+    # Reads and writes share the test session so writes are visible immediately
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    # In-process indexes and caches are rebuilt from the test database on first use
+    suggestions.reset()
+    response_cache.clear()
+    versions.reset()
+    data_versions.watch(db_session.get_bind())
 
     with TestClient(app) as test_client:
         yield test_client
 
     app.dependency_overrides.clear()
+    suggestions.reset()
+    response_cache.clear()
+    versions.reset()
+
+
+@pytest.fixture
+def other_process(db_session):
+    """Engine on the test database standing in for another worker or the CLI.
+
+    It has its own `DataVersions`, so its commits bump the shared versions
+    without updating what the app's process has seen.
+    """
+    from app.db.data_versions import DataVersions
+
+    other = create_sqlite_engine(str(db_session.get_bind().url), sqlite_pragmas("performance"))
+    other_versions = DataVersions()
+    other_versions.install(other)
+    yield other
+    other_versions.remove(other)
+    other.dispose()
+
+
+@pytest.fixture
+def max_queries():
+    """Context manager failing the test if the block runs more than `limit` SQL statements.
+
+    Usage::
+
+        with max_queries(4):
+            client.get("/api/movies/")
+    """
+    from app.core.querystats import count_queries
+
+    @contextmanager
+    def check(limit):
+        with count_queries() as stats:
+            yield stats
+        assert (
+            stats.statements <= limit
+        ), f"{stats.statements} SQL statements executed, expected at most {limit}"
+
+    return check
 
 
 @pytest.fixture(scope="function")
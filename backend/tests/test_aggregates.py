@@ -0,0 +1,67 @@
+"""Test stored rating aggregates on movies."""
+
+import pytest
+
+from app.db.aggregates import refresh_rating_aggregates
+from app.models import Movie
+
+
+def _movie(client, movie_id):
+    return client.get(f"/api/movies/{movie_id}").json()
+
+
+class TestRatingAggregates:
+    """Rating writes keep `average_rating` and `rating_count` current."""
+
+    def test_seeded_aggregates_match_ratings(self, client):
+        """Test seeded movies report aggregates consistent with their ratings."""
+        movie = _movie(client, 1)
+        scores = [r["score"] for r in movie["ratings"]]
+
+        assert movie["rating_count"] == len(scores)
+        assert movie["average_rating"] == round(sum(scores) / len(scores), 1)
+
+    def test_create_update_delete_rating(self, client):
+        """Test each rating write updates the movie aggregates."""
+        before = _movie(client, 1)
+
+        created = client.post("/api/ratings", json={"movie_id": 1, "score": 1.0}).json()
+        after_create = _movie(client, 1)
+        assert after_create["rating_count"] == before["rating_count"] + 1
+        assert after_create["average_rating"] < before["average_rating"]
+
+        client.put(f"/api/ratings/{created['id']}", json={"score": 10.0})
+        after_update = _movie(client, 1)
+        assert after_update["rating_count"] == after_create["rating_count"]
+        assert after_update["average_rating"] > before["average_rating"]
+
+        client.delete(f"/api/ratings/{created['id']}")
+        assert _movie(client, 1) == before
+
+    def test_list_uses_stored_aggregates_without_ratings(self, client):
+        """Test list responses carry aggregates but do not load individual ratings."""
+        listed = next(m for m in client.get("/api/movies").json() if m["id"] == 1)
+        detail = _movie(client, 1)
+
+        assert "ratings" not in listed
+        assert listed["rating_count"] == detail["rating_count"]
+        assert listed["average_rating"] == detail["average_rating"]
+
+    def test_rebuild_repairs_drifted_aggregates(self, db_session):
+        """Test a full rebuild recomputes aggregates from the ratings table."""
+        movie = db_session.query(Movie).filter(Movie.id == 1).one()
+        expected = (movie.rating_count, movie.rating_sum)
+
+        movie.rating_count = 0
+        movie.rating_sum = 0.0
+        db_session.commit()
+
+        refresh_rating_aggregates(db_session)
+        db_session.commit()
+        db_session.refresh(movie)
+
+        assert (movie.rating_count, movie.rating_sum) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,192 @@
+"""Test database preparation at startup and through the management CLI."""
+
+import importlib
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+
+import pytest
+
+from app.db import bootstrap
+from app.db.bootstrap import database_lock
+from app.db.snapshot import build_snapshot, restore_snapshot
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def db_path():
+    """Path of a scratch database that does not exist yet."""
+    directory = tempfile.mkdtemp()
+    yield os.path.join(directory, "movies.db")
+    for name in os.listdir(directory):
+        os.unlink(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+def _run(db_path, *args, **env):
+    """Run a Python command in a fresh interpreter against `db_path`."""
+    env = dict(os.environ, DATABASE_PATH=db_path, **env)
+    result = subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+COUNT_MOVIES = (
+    "from app.db.database import SessionLocal\n"
+    "from app.models import Movie\n"
+    "print(SessionLocal().query(Movie).count())"
+)
+
+
+class TestStartup:
+    """The app prepares its database in the lifespan hook, not at import."""
+
+    def test_import_does_no_database_io(self, db_path):
+        """Test importing app.main leaves the database file uncreated."""
+        _run(db_path, "-c", "import app.main")
+
+        assert not os.path.exists(db_path)
+
+    def test_lifespan_creates_and_seeds(self, db_path):
+        """Test starting the app creates the schema and seeds sample data."""
+        _run(
+            db_path,
+            "-c",
+            "from fastapi.testclient import TestClient\n"
+            "from app.main import app\n"
+            "with TestClient(app) as client:\n"
+            "    assert client.get('/api/movies/').json()",
+        )
+
+        assert int(_run(db_path, "-c", COUNT_MOVIES)) > 0
+
+
+class TestManagementCommands:
+    """init/seed/reset commands of app.cli."""
+
+    def test_init_creates_empty_schema(self, db_path):
+        """Test init creates tables without loading data."""
+        _run(db_path, "-m", "app.cli", "init")
+
+        assert _run(db_path, "-c", COUNT_MOVIES) == "0"
+
+    def test_seed_is_idempotent(self, db_path):
+        """Test seeding twice does not duplicate the catalog."""
+        _run(db_path, "-m", "app.cli", "seed")
+        seeded = _run(db_path, "-c", COUNT_MOVIES)
+        _run(db_path, "-m", "app.cli", "seed")
+
+        assert int(seeded) > 0
+        assert _run(db_path, "-c", COUNT_MOVIES) == seeded
+
+    def test_reset_restores_sample_data(self, db_path):
+        """Test reset drops changes and reseeds."""
+        _run(db_path, "-m", "app.cli", "seed")
+        seeded = _run(db_path, "-c", COUNT_MOVIES)
+        _run(
+            db_path,
+            "-c",
+            "from app.db.database import SessionLocal\n"
+            "from app.models import Movie\n"
+            "db = SessionLocal()\n"
+            "db.query(Movie).filter(Movie.id == 1).delete()\n"
+            "db.commit()",
+        )
+        _run(db_path, "-m", "app.cli", "reset")
+
+        assert _run(db_path, "-c", COUNT_MOVIES) == seeded
+
+
+class TestSeedSnapshot:
+    """Prebuilt snapshots replace ORM seeding of a missing database."""
+
+    def test_snapshot_is_seeded_and_analyzed(self, db_path):
+        """Test the snapshot holds the sample catalog and planner statistics."""
+        snapshot = build_snapshot(db_path + ".seed")
+        conn = sqlite3.connect(snapshot)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0] > 0
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        finally:
+            conn.close()
+
+    def test_restore_only_when_missing(self, db_path):
+        """Test the snapshot is copied to a missing database but never over one."""
+        snapshot = build_snapshot(db_path + ".seed")
+
+        assert restore_snapshot(db_path, snapshot) is True
+        assert restore_snapshot(db_path, snapshot) is False
+        assert restore_snapshot(db_path + ".other", db_path + ".absent") is False
+        assert not os.path.exists(db_path + ".other")
+
+    def test_startup_restores_snapshot(self, db_path):
+        """Test preparing a missing database copies the snapshot instead of seeding."""
+        snapshot = build_snapshot(db_path + ".seed")
+        conn = sqlite3.connect(snapshot)
+        conn.execute("UPDATE movies SET title = 'From snapshot' WHERE id = 1")
+        conn.commit()
+        conn.close()
+
+        _run(db_path, "-m", "app.cli", "seed", DATABASE_SNAPSHOT=snapshot)
+        title = _run(
+            db_path,
+            "-c",
+            "from app.db.database import SessionLocal\n"
+            "from app.models import Movie\n"
+            "print(SessionLocal().get(Movie, 1).title)",
+        )
+
+        assert title == "From snapshot"
+
+
+class TestDatabaseLock:
+    """Only one holder of the database lock at a time."""
+
+    def test_lock_is_exclusive(self, db_path):
+        """Test a second holder waits until the first releases the lock."""
+        lock_path = db_path + ".lock"
+        events = []
+
+        def second():
+            with database_lock(lock_path):
+                events.append("second")
+
+        with database_lock(lock_path):
+            thread = threading.Thread(target=second)
+            thread.start()
+            time.sleep(0.2)
+            events.append("first")
+        thread.join()
+
+        assert events == ["first", "second"]
+
+    def test_windows_lock_without_fcntl(self, db_path, monkeypatch):
+        """Test the module imports without fcntl on Windows and locks through msvcrt."""
+        calls = []
+        msvcrt = types.SimpleNamespace(
+            LK_LOCK=1, LK_UNLCK=0, locking=lambda fd, mode, size: calls.append((mode, size))
+        )
+        monkeypatch.setattr(sys, "platform", "win32")
+        monkeypatch.setitem(sys.modules, "fcntl", None)
+        monkeypatch.setitem(sys.modules, "msvcrt", msvcrt)
+        try:
+            windows = importlib.reload(bootstrap)
+            with windows.database_lock(db_path + ".lock"):
+                assert calls == [(1, 1)]
+            assert calls == [(1, 1), (0, 1)]
+        finally:
+            monkeypatch.undo()
+            importlib.reload(bootstrap)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
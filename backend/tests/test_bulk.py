@@ -0,0 +1,139 @@
+"""Test the bulk write endpoints."""
+
+import pytest
+
+from app.db.search_index import fts5_available
+
+
+def _movie(title, **fields):
+    return {"title": title, "release_year": 2020, "director_id": 1, **fields}
+
+
+class TestBulkActors:
+    """POST /api/actors/bulk."""
+
+    def test_creates_every_actor(self, client):
+        """Test actors are created and their ids returned in request order."""
+        response = client.post("/api/actors/bulk", json=[{"name": "Ana Bulk"}, {"name": "Bo Bulk"}])
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["created"] == 2 and body["failed"] == 0
+        ids = [result["id"] for result in body["results"]]
+        assert [client.get(f"/api/actors/{i}").json()["name"] for i in ids] == [
+            "Ana Bulk",
+            "Bo Bulk",
+        ]
+
+    def test_created_actors_are_searchable(self, client):
+        """Test folded names and suggestions follow bulk inserts."""
+        client.post("/api/actors/bulk", json=[{"name": "Zoë Bulkova"}])
+
+        assert client.get("/api/actors/?search=zoe bulk&match=prefix").json()[0]["name"] == (
+            "Zoë Bulkova"
+        )
+        suggested = client.get("/api/suggest", params={"q": "bulkova"}).json()
+        assert [s["label"] for s in suggested] == ["Zoë Bulkova"]
+
+    def test_empty_and_invalid_payloads_rejected(self, client):
+        """Test an empty list or an invalid item fails the whole request with 422."""
+        assert client.post("/api/actors/bulk", json=[]).status_code == 422
+
+        response = client.post("/api/actors/bulk", json=[{"name": "Ok"}, {"name": ""}])
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][:2] == ["body", 1]
+
+
+class TestBulkMovies:
+    """POST /api/movies/bulk."""
+
+    def test_creates_movies_with_links(self, client):
+        """Test movies are created with their genres and cast."""
+        response = client.post(
+            "/api/movies/bulk",
+            json=[
+                _movie("Bulk One", genre_ids=[1, 2], actor_ids=[1, 2, 2]),
+                _movie("Bulk Two", genre_ids=[3]),
+            ],
+        )
+
+        results = response.json()["results"]
+        one = client.get(f"/api/movies/{results[0]['id']}").json()
+        two = client.get(f"/api/movies/{results[1]['id']}").json()
+        assert one["title"] == "Bulk One"
+        assert sorted(genre["id"] for genre in one["genres"]) == [1, 2]
+        assert sorted(actor["id"] for actor in one["actors"]) == [1, 2]
+        assert [genre["id"] for genre in two["genres"]] == [3]
+
+    def test_unknown_references_reported_per_item(self, client):
+        """Test items with unknown ids fail alone and name the missing ids."""
+        response = client.post(
+            "/api/movies/bulk",
+            json=[
+                _movie("Good"),
+                _movie("Bad", director_id=9999, genre_ids=[1, 9998, 9997]),
+                _movie("Also Bad", actor_ids=[9996]),
+            ],
+        )
+
+        body = response.json()
+        assert body["created"] == 1 and body["failed"] == 2
+        assert body["results"][0]["id"] is not None
+        assert body["results"][1] == {
+            "index": 1,
+            "id": None,
+            "error": "Unknown director id: 9999; Unknown genre ids: 9997, 9998",
+        }
+        assert body["results"][2]["error"] == "Unknown actor id: 9996"
+
+    def test_constant_statements(self, client, max_queries):
+        """Test references are checked with one IN query per table, whatever the size."""
+        one = [_movie("Solo", genre_ids=[1], actor_ids=[1])]
+        many = [_movie(f"Many {n}", genre_ids=[1, 2], actor_ids=[1, 2, 3]) for n in range(50)]
+        with max_queries(100) as small:
+            client.post("/api/movies/bulk", json=one)
+        with max_queries(100) as large:
+            client.post("/api/movies/bulk", json=many)
+
+        assert large.statements == small.statements
+
+    @pytest.mark.skipif(not fts5_available(), reason="SQLite built without FTS5")
+    def test_search_index_follows(self, client):
+        """Test bulk-created movies are searchable by title and cast."""
+        client.post("/api/movies/bulk", json=[_movie("Quokka Parade", actor_ids=[1])])
+
+        titles = [movie["title"] for movie in client.get("/api/movies/search?q=quokka").json()]
+        assert titles == ["Quokka Parade"]
+        actor = client.get("/api/actors/1").json()["name"].split()[-1]
+        found = client.get("/api/movies/search", params={"q": f"quokka {actor}"}).json()
+        assert [movie["title"] for movie in found] == ["Quokka Parade"]
+
+
+class TestBulkRatings:
+    """POST /api/ratings/bulk."""
+
+    def test_creates_ratings_and_refreshes_aggregates(self, client):
+        """Test ratings are stored and the movie's aggregates include them."""
+        before = client.get("/api/movies/1").json()["rating_count"]
+        response = client.post(
+            "/api/ratings/bulk",
+            json=[{"movie_id": 1, "score": 2.0}, {"movie_id": 1, "score": 4.0, "review": "Ok"}],
+        )
+
+        assert response.json()["created"] == 2
+        assert client.get("/api/movies/1").json()["rating_count"] == before + 2
+
+    def test_unknown_movie_reported(self, client):
+        """Test ratings of unknown movies fail alone."""
+        response = client.post(
+            "/api/ratings/bulk",
+            json=[{"movie_id": 99999, "score": 5.0}, {"movie_id": 2, "score": 5.0}],
+        )
+
+        results = response.json()["results"]
+        assert results[0]["error"] == "Unknown movie id: 99999"
+        assert results[1]["id"] is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,177 @@
+"""Test the in-process response cache."""
+
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.core.cache import ResponseCache, response_cache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _put(cache, key, body=b"{}", tags=("movie",)):
+    return cache.put(key, 200, [], body, tags, cache.generation(tags))
+
+
+class TestResponseCache:
+    """LRU, TTL and tag invalidation behaviour of `ResponseCache`."""
+
+    def test_lru_eviction_by_entries(self):
+        """Test the least recently used entry is evicted first."""
+        cache = ResponseCache(max_entries=2)
+        _put(cache, "a")
+        _put(cache, "b")
+        cache.get("a")
+        _put(cache, "c")
+
+        assert cache.get("a")[0] is not None
+        assert cache.get("b")[0] is None
+        assert cache.evictions == 1
+
+    def test_eviction_by_bytes(self):
+        """Test the byte bound evicts entries and rejects oversized bodies."""
+        cache = ResponseCache(max_bytes=10)
+        _put(cache, "a", b"x" * 6)
+        _put(cache, "b", b"x" * 6)
+
+        assert len(cache) == 1
+        assert cache.stats()["bytes"] == 6
+        assert not _put(cache, "c", b"x" * 11)
+
+    def test_ttl_and_stale_window(self):
+        """Test entries turn stale after ttl and expire after ttl + stale_ttl."""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, stale_ttl=5, clock=clock)
+        _put(cache, "a")
+
+        assert cache.get("a")[1] is False
+        clock.now = 12
+        entry, stale = cache.get("a")
+        assert entry is not None and stale is True
+        clock.now = 16
+        assert cache.get("a")[0] is None
+        assert (cache.hits, cache.stale_hits, cache.misses) == (1, 1, 1)
+
+    def test_invalidate_by_tag(self):
+        """Test invalidation drops only entries built from the written entity type."""
+        cache = ResponseCache()
+        _put(cache, "movies", tags=("movie", "actor"))
+        _put(cache, "genres", tags=("genre",))
+        cache.invalidate("actor")
+
+        assert cache.get("movies")[0] is None
+        assert cache.get("genres")[0] is not None
+        assert cache.invalidations == 1
+
+    def test_put_after_invalidation_is_rejected(self):
+        """Test a response computed before an invalidation is not stored."""
+        cache = ResponseCache()
+        generation = cache.generation(("movie",))
+        cache.invalidate("movie")
+
+        assert not cache.put("a", 200, [], b"{}", ("movie",), generation)
+        assert len(cache) == 0
+
+    def test_single_refresh_per_key(self):
+        """Test only one background refresh of a key can run at a time."""
+        cache = ResponseCache()
+
+        assert cache.begin_refresh("a")
+        assert not cache.begin_refresh("a")
+        cache.end_refresh("a")
+        assert cache.begin_refresh("a")
+
+
+class TestCachedEndpoints:
+    """GET responses are served from the cache and invalidated by writes."""
+
+    def test_second_request_hits(self, client):
+        """Test a repeated GET is answered from the cache with the same body."""
+        first = client.get("/api/movies?limit=5&sort=title")
+        second = client.get("/api/movies?sort=title&limit=5")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.content == first.content
+        assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+    def test_write_invalidates(self, client):
+        """Test creating a genre invalidates cached genre lists."""
+        before = client.get("/api/genres").json()
+        client.post("/api/genres", json={"name": "Western"})
+        response = client.get("/api/genres")
+
+        assert response.headers["X-Cache"] == "MISS"
+        assert len(response.json()) == len(before) + 1
+
+    def test_rating_write_invalidates_movies(self, client):
+        """Test a new rating refreshes the stored aggregates served for its movie."""
+        before = client.get("/api/movies/1").json()
+        client.post("/api/ratings", json={"movie_id": 1, "score": 1.0})
+        after = client.get("/api/movies/1").json()
+
+        assert after["rating_count"] == before["rating_count"] + 1
+
+    def test_write_by_other_process_invalidates(self, client, other_process):
+        """Test another worker's commit drops the cached lists and details it affects."""
+        client.get("/api/movies/1")
+        client.get("/api/movies/")
+        genres = client.get("/api/genres/")
+        with other_process.begin() as conn:
+            conn.execute(text("UPDATE movies SET title = 'Renamed Elsewhere' WHERE id = 1"))
+
+        detail = client.get("/api/movies/1")
+        assert detail.headers["X-Cache"] == "MISS"
+        assert detail.json()["title"] == "Renamed Elsewhere"
+        assert client.get("/api/movies/").headers["X-Cache"] == "MISS"
+        unaffected = client.get("/api/genres/")
+        assert unaffected.headers["X-Cache"] == "HIT"
+        assert unaffected.content == genres.content
+
+    def test_errors_not_cached(self, client):
+        """Test non-200 responses are not stored."""
+        client.get("/api/movies/9999")
+        assert client.get("/api/movies/9999").headers["X-Cache"] == "MISS"
+
+    def test_writes_not_cached(self, client):
+        """Test non-GET requests bypass the cache."""
+        response = client.post("/api/genres", json={"name": "Noir"})
+        assert "X-Cache" not in response.headers
+
+    def test_stale_entry_refreshed_in_background(self, client, monkeypatch):
+        """Test a stale hit is served immediately and refreshed by a worker."""
+        monkeypatch.setattr(response_cache, "ttl", 0.05)
+        client.get("/api/genres")
+        time.sleep(0.1)
+
+        assert client.get("/api/genres").headers["X-Cache"] == "STALE"
+        deadline = time.monotonic() + 5
+        while response_cache.refreshes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert response_cache.refreshes == 1
+        monkeypatch.setattr(response_cache, "ttl", 30)
+        assert client.get("/api/genres").headers["X-Cache"] == "HIT"
+
+    def test_stats_endpoint(self, client):
+        """Test counters are exposed for monitoring."""
+        client.get("/api/genres/")
+        client.get("/api/genres/")
+        stats = client.get("/health/cache").json()
+
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,215 @@
+"""Test ETags and conditional GET."""
+
+import pytest
+from sqlalchemy import event, text
+
+from app.api.middleware import etag_matches
+from app.db.data_versions import DataVersions, data_versions
+from app.db.database import create_sqlite_engine
+
+
+def _etag(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+class TestConditionalGet:
+    """If-None-Match is answered from version counters."""
+
+    def test_list_and_detail_tagged(self, client):
+        """Test list and detail responses carry strong ETags."""
+        for url in ["/api/movies/", "/api/movies/1", "/api/actors/1", "/api/genres/"]:
+            etag = _etag(client, url)
+            assert etag.startswith('"') and not etag.startswith("W/")
+
+    def test_not_modified(self, client):
+        """Test a matching If-None-Match returns an empty 304."""
+        etag = _etag(client, "/api/movies/?limit=5")
+        response = client.get("/api/movies/?limit=5", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    def test_not_modified_runs_no_queries(self, client, engine):
+        """Test a 304 is produced without touching the database."""
+        etag = _etag(client, "/api/movies/1")
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.get("/api/movies/1", headers={"If-None-Match": etag})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert response.status_code == 304
+        assert statements == []
+
+    def test_query_params_change_tag(self, client):
+        """Test different queries get different tags, independent of param order."""
+        assert _etag(client, "/api/movies/?limit=5") != _etag(client, "/api/movies/?limit=6")
+        assert _etag(client, "/api/movies/?limit=5&sort=title") == _etag(
+            client, "/api/movies/?sort=title&limit=5"
+        )
+
+    def test_write_changes_list_tag(self, client):
+        """Test a write to a table the list depends on changes its tag."""
+        etag = _etag(client, "/api/movies/")
+        client.put("/api/genres/1", json={"name": "Action & Adventure"})
+
+        response = client.get("/api/movies/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_row_versions_isolate_details(self, client):
+        """Test editing one movie leaves other movie details unchanged."""
+        movie_1 = _etag(client, "/api/movies/1")
+        movie_2 = _etag(client, "/api/movies/2")
+        client.put("/api/movies/1", json={"title": "Inception (Director's Cut)"})
+
+        assert _etag(client, "/api/movies/1") != movie_1
+        assert _etag(client, "/api/movies/2") == movie_2
+
+    def test_embedded_changes_bump_details(self, client):
+        """Test renaming an actor changes the tags of the movies they appear in."""
+        actor = client.get("/api/actors/1").json()
+        movie_ids = {movie["id"] for movie in actor["movies"]}
+        other_id = next(
+            m["id"] for m in client.get("/api/movies/").json() if m["id"] not in movie_ids
+        )
+        before = {movie_id: _etag(client, f"/api/movies/{movie_id}") for movie_id in movie_ids}
+        other = _etag(client, f"/api/movies/{other_id}")
+
+        client.put("/api/actors/1", json={"name": "Renamed Actor"})
+
+        assert all(_etag(client, f"/api/movies/{i}") != before[i] for i in movie_ids)
+        assert _etag(client, f"/api/movies/{other_id}") == other
+
+    def test_rating_bumps_movie(self, client):
+        """Test a new rating changes the movie detail and ratings tags."""
+        detail = _etag(client, "/api/movies/2")
+        ratings = _etag(client, "/api/movies/2/ratings")
+        client.post("/api/ratings", json={"movie_id": 2, "score": 7.0})
+
+        assert _etag(client, "/api/movies/2") != detail
+        assert _etag(client, "/api/movies/2/ratings") != ratings
+
+    def test_movie_edit_bumps_filmographies(self, client):
+        """Test editing a movie changes the tags of its director and cast."""
+        movie = client.get("/api/movies/1").json()
+        director = _etag(client, f"/api/directors/{movie['director']['id']}")
+        actor = _etag(client, f"/api/actors/{movie['actors'][0]['id']}")
+        client.put("/api/movies/1", json={"release_year": 2011})
+
+        assert _etag(client, f"/api/directors/{movie['director']['id']}") != director
+        assert _etag(client, f"/api/actors/{movie['actors'][0]['id']}") != actor
+
+    def test_errors_not_tagged(self, client):
+        """Test missing resources get no ETag."""
+        assert "ETag" not in client.get("/api/movies/9999").headers
+
+
+class TestOtherProcesses:
+    """Writes committed by other workers or the CLI move the tags too."""
+
+    def test_foreign_write_changes_tags(self, client, other_process):
+        """Test list and detail tags change after another process edits a movie."""
+        list_tag = _etag(client, "/api/movies/")
+        detail_tag = _etag(client, "/api/movies/1")
+        with other_process.begin() as conn:
+            conn.execute(text("UPDATE movies SET title = 'Renamed Elsewhere' WHERE id = 1"))
+
+        response = client.get("/api/movies/1", headers={"If-None-Match": detail_tag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != detail_tag
+        assert _etag(client, "/api/movies/") != list_tag
+
+    def test_foreign_write_moves_dependent_details_only(self, client, other_process):
+        """Test an unknown row's edit moves details embedding its table, not others."""
+        actor_tag = _etag(client, "/api/actors/1")
+        genre_tag = _etag(client, "/api/genres/1")
+        with other_process.begin() as conn:
+            conn.execute(text("UPDATE movies SET synopsis = 'Elsewhere' WHERE id = 2"))
+
+        assert _etag(client, "/api/actors/1") != actor_tag
+        assert _etag(client, "/api/genres/1") == genre_tag
+
+    def test_own_writes_stay_precise(self, client):
+        """Test writes through this process still only move the details they touch."""
+        _etag(client, "/api/movies/1")
+        other_tag = _etag(client, "/api/movies/2")
+        client.put("/api/movies/1", json={"title": "Renamed Here"})
+
+        assert _etag(client, "/api/movies/2") == other_tag
+
+    def test_untagged_routes_skip_check(self, client, monkeypatch):
+        """Test /health, /metrics and /docs never call the version watcher."""
+        checked = []
+
+        def changed():
+            checked.append(True)
+            return set()
+
+        monkeypatch.setattr(data_versions, "changed", changed)
+        for url in ("/health", "/metrics", "/docs"):
+            assert client.get(url).status_code == 200
+        assert checked == []
+
+        client.get("/api/genres/")
+        assert checked == [True]
+
+
+class TestDataVersions:
+    """Shared write versions recorded by the commit hook."""
+
+    def test_reports_only_other_processes(self, db_session, other_process):
+        """Test own commits are recognized and another process's are reported once."""
+        own = create_sqlite_engine(str(db_session.get_bind().url))
+        watcher = DataVersions()
+        watcher.install(own)
+        watcher.watch(own)
+        try:
+            assert watcher.changed() == set()
+            with own.begin() as conn:
+                conn.execute(text("UPDATE actors SET bio = 'x' WHERE id = 1"))
+            assert watcher.changed() == set()
+
+            with other_process.begin() as conn:
+                conn.execute(text("UPDATE ratings SET review = 'y' WHERE id = 1"))
+                conn.execute(text("DELETE FROM movie_genres WHERE movie_id = 1"))
+            assert watcher.changed() == {"rating", "movie"}
+            assert watcher.changed() == set()
+        finally:
+            watcher.watch(None)
+            own.dispose()
+
+    def test_rolled_back_writes_not_bumped(self, db_session, other_process):
+        """Test a transaction that rolls back leaves the versions alone."""
+        watcher = DataVersions()
+        watcher.watch(db_session.get_bind())
+        watcher.changed()
+        with other_process.connect() as conn:
+            conn.execute(text("UPDATE actors SET bio = 'x' WHERE id = 1"))
+            conn.rollback()
+
+        assert watcher.changed() == set()
+        watcher.watch(None)
+
+
+class TestEtagMatching:
+    """If-None-Match parsing."""
+
+    def test_list_and_weak_forms(self):
+        """Test lists, weak tags and the wildcard match."""
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
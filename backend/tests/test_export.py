@@ -0,0 +1,102 @@
+"""Test the streaming catalog export."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from app.api.endpoints.export import EXPORTS, export_batches
+
+
+def _ndjson(client, entity):
+    response = client.get(f"/api/export/{entity}")
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestExport:
+    """GET /api/export/{entity}."""
+
+    def test_movies_ndjson_with_flattened_links(self, client):
+        """Test every movie is exported once with its director, genres and cast."""
+        rows = _ndjson(client, "movies")
+        detail = client.get("/api/movies/1").json()
+
+        assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+        assert len(rows) == len(client.get("/api/movies/?limit=100").json())
+        first = rows[0]
+        assert first["title"] == detail["title"]
+        assert first["director"] == detail["director"]["name"]
+        assert first["genre_ids"] == sorted(genre["id"] for genre in detail["genres"])
+        assert sorted(first["actors"]) == sorted(actor["name"] for actor in detail["actors"])
+
+    def test_csv_joins_lists(self, client):
+        """Test CSV has a header row and joins linked ids and names with |."""
+        response = client.get("/api/export/actors?format=csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        detail = client.get("/api/actors/1").json()
+
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert 'filename="actors.csv"' in response.headers["content-disposition"]
+        assert rows[0]["name"] == detail["name"]
+        assert rows[0]["movie_ids"] == "|".join(
+            str(i) for i in sorted(movie["id"] for movie in detail["movies"])
+        )
+
+    def test_csv_quotes_delimiter_in_names(self, client):
+        """Test names containing | stay one element, aligned with their ids."""
+        client.put("/api/actors/1", json={"name": 'Smith | "Jones"'})
+        response = client.get("/api/export/movies?format=csv")
+        movies = [
+            row for row in csv.DictReader(io.StringIO(response.text)) if "Smith" in row["actors"]
+        ]
+
+        assert movies
+        for row in movies:
+            ids = next(csv.reader([row["actor_ids"]], delimiter="|"))
+            names = next(csv.reader([row["actors"]], delimiter="|"))
+            assert len(ids) == len(names)
+            assert names[ids.index("1")] == 'Smith | "Jones"'
+
+    def test_ratings_and_directors(self, client):
+        """Test ratings carry their movie title and directors their movies."""
+        rating = _ndjson(client, "ratings")[0]
+        director = _ndjson(client, "directors")[0]
+
+        assert (
+            rating["movie_title"] == client.get(f"/api/movies/{rating['movie_id']}").json()["title"]
+        )
+        assert director["movie_ids"] == sorted(
+            movie["id"] for movie in client.get("/api/directors/1").json()["movies"]
+        )
+
+    def test_unknown_entity_rejected(self, client):
+        """Test only the exportable entities are accepted."""
+        assert client.get("/api/export/genres").status_code == 422
+        assert client.get("/api/export/movies?format=xml").status_code == 422
+
+
+class TestExportBatches:
+    """Keyset batches behind the export."""
+
+    def test_batches_cover_every_row_once(self, engine, db_session):
+        """Test small batches return each row exactly once, in id order."""
+        with engine.connect() as conn:
+            batches = list(export_batches(conn, EXPORTS["movies"], batch_size=3))
+            everything = next(export_batches(conn, EXPORTS["movies"], batch_size=10_000))
+
+        assert all(len(batch) <= 3 for batch in batches)
+        assert [row for batch in batches for row in batch] == everything
+
+    def test_statements_per_batch(self, engine, db_session, max_queries):
+        """Test each batch costs one query plus one per relationship, not one per row."""
+        with engine.connect() as conn, max_queries(100) as queries:
+            batches = list(export_batches(conn, EXPORTS["movies"], batch_size=5))
+
+        # the last, empty batch only runs the row query
+        assert queries.statements == len(batches) * 3 + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
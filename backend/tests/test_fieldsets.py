@@ -0,0 +1,123 @@
+"""Test sparse fieldsets and include control on movie lists."""
+
+import pytest
+from sqlalchemy import event
+
+
+class TestMovieFieldsets:
+    """`fields` and `include` shape the list payload and what gets loaded."""
+
+    def test_default_shape(self, client):
+        """Test lists embed director, genres and actors but not ratings by default."""
+        movie = client.get("/api/movies?limit=1").json()[0]
+
+        assert {"director", "genres", "actors", "average_rating", "rating_count"} <= set(movie)
+        assert "ratings" not in movie
+
+    def test_sparse_fields_without_relationships(self, client):
+        """Test only requested fields are returned, with id always present."""
+        movies = client.get("/api/movies?fields=title,poster_url&include=").json()
+
+        assert movies
+        assert all(set(m) == {"id", "title", "poster_url"} for m in movies)
+
+    def test_include_ratings(self, client):
+        """Test ratings are embedded when requested."""
+        movie = client.get("/api/movies?fields=title&include=ratings&limit=1").json()[0]
+
+        assert set(movie) == {"id", "title", "ratings"}
+        assert movie["ratings"]
+
+    def test_search_accepts_fieldsets(self, client):
+        """Test the search endpoint honours fields and include."""
+        movies = client.get("/api/movies/search?q=nolan&fields=title&include=director").json()
+
+        assert movies
+        assert all(set(m) == {"id", "title", "director"} for m in movies)
+
+    def test_unknown_names_rejected(self, client):
+        """Test unknown fields or relationships return 400."""
+        assert client.get("/api/movies?fields=title,budget").status_code == 400
+        assert client.get("/api/movies?include=studio").status_code == 400
+
+    def test_unrequested_data_is_not_queried(self, client, engine):
+        """Test deferred columns and skipped relationships never reach SQL."""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            client.get("/api/movies?fields=title&include=")
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        sql = " ".join(statements)
+        assert "synopsis" not in sql
+        assert "actors" not in sql
+        assert "ratings" not in sql
+
+
+class TestSideloadedShape:
+    """`shape=sideload` references relationships by id from a shared `included` map."""
+
+    def test_references_resolve_to_included(self, client):
+        """Test every referenced id has exactly one entry in `included`."""
+        body = client.get("/api/movies?shape=sideload").json()
+        included = body["included"]
+
+        assert set(body) == {"movies", "included"}
+        for movie in body["movies"]:
+            assert "director" not in movie and "actors" not in movie
+            assert str(movie["director_id"]) in included["directors"]
+            assert all(str(i) in included["genres"] for i in movie["genre_ids"])
+            assert all(str(i) in included["actors"] for i in movie["actor_ids"])
+
+        referenced = {i for m in body["movies"] for i in m["actor_ids"]}
+        assert {int(i) for i in included["actors"]} == referenced
+
+    def test_matches_embedded_shape(self, client):
+        """Test side-loaded movies carry the same relationships as embedded ones."""
+        embedded = client.get("/api/movies").json()
+        body = client.get("/api/movies?shape=sideload").json()
+        included = body["included"]
+
+        for nested, flat in zip(embedded, body["movies"]):
+            assert nested["id"] == flat["id"]
+            assert nested["director"] == included["directors"][str(flat["director_id"])]
+            assert sorted(nested["genres"], key=lambda g: g["id"]) == [
+                included["genres"][str(i)] for i in flat["genre_ids"]
+            ]
+            assert sorted(nested["actors"], key=lambda a: a["id"]) == [
+                included["actors"][str(i)] for i in flat["actor_ids"]
+            ]
+
+    def test_payload_is_smaller(self, client):
+        """Test shared entities make the side-loaded page smaller than the embedded one."""
+        embedded = client.get("/api/movies")
+        sideloaded = client.get("/api/movies?shape=sideload")
+
+        assert len(sideloaded.content) < len(embedded.content)
+
+    def test_include_limits_sideloaded_types(self, client):
+        """Test only included relationships are referenced; ratings stay embedded."""
+        body = client.get("/api/movies?shape=sideload&fields=title&include=genres,ratings").json()
+
+        assert set(body["included"]) == {"genres"}
+        assert all(set(m) == {"id", "title", "genre_ids", "ratings"} for m in body["movies"])
+
+    def test_search_sideload(self, client):
+        """Test the search endpoint supports the side-loaded shape."""
+        body = client.get("/api/movies/search?q=nolan&shape=sideload").json()
+
+        assert body["movies"]
+        assert len(body["included"]["directors"]) == 1
+
+    def test_unknown_shape_rejected(self, client):
+        """Test an unknown shape returns 422."""
+        assert client.get("/api/movies?shape=flat").status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -3,7 +3,15 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api.filters import (
+    ACTOR_FILTERS,
+    DIRECTOR_FILTERS,
+    MOVIE_FILTERS,
+    apply_filters,
+    compile_filters,
+)
 from app.main import app
+from app.models import Actor, Director, Genre, Movie
 
 client = TestClient(app)
 
@@ -271,5 +279,136 @@ class TestSorting:
             assert movies1[0]["id"] == movies2[0]["id"]
 
 
+def _legacy_movie_ids(db, genre=None, director=None, actor=None, min_year=None, search=None):
+    """Join + DISTINCT reference implementation of the movie filters."""
+    query = db.query(Movie.id)
+    if genre:
+        query = query.join(Movie.genres).filter(Genre.name.ilike(f"%{genre}%"))
+    if director:
+        query = query.join(Movie.director).filter(Director.name.ilike(f"%{director}%"))
+    if actor:
+        query = query.join(Movie.actors).filter(Actor.name.ilike(f"%{actor}%"))
+    if min_year:
+        query = query.filter(Movie.release_year >= min_year)
+    if search:
+        query = query.filter(Movie.title.ilike(f"%{search}%"))
+    return {row[0] for row in query.distinct()}
+
+
+class TestSemiJoinFilters:
+    """Semi-join filters return the same sets as the previous join + DISTINCT queries."""
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {"genre": "Drama"},
+            {"director": "Nolan"},
+            {"actor": "a"},
+            {"genre": "r", "actor": "e"},
+            {"genre": "Action", "director": "Nolan", "actor": "Bale", "min_year": 2000},
+            {"actor": "Pitt", "search": "Club"},
+        ],
+    )
+    def test_movie_filters_match_join_queries(self, db_session, filters):
+        """Test movie filter combinations match the join-based result sets."""
+        query = apply_filters(db_session.query(Movie.id), MOVIE_FILTERS, **filters)
+        ids = [row[0] for row in query]
+
+        assert len(ids) == len(set(ids))
+        assert set(ids) == _legacy_movie_ids(db_session, **filters)
+
+    def test_actor_genre_and_movie_filters_combine(self, db_session):
+        """Test genre and movie filters on actors no longer join movies twice."""
+        query = apply_filters(
+            db_session.query(Actor.id), ACTOR_FILTERS, genre="Crime", movie="Pulp"
+        )
+        ids = [row[0] for row in query]
+
+        expected = {
+            actor.id
+            for movie in db_session.query(Movie).filter(Movie.title.ilike("%Pulp%"))
+            for actor in movie.actors
+            if any("Crime" in g.name for m in actor.movies for g in m.genres)
+        }
+        assert len(ids) == len(set(ids))
+        assert set(ids) == expected
+
+    def test_director_genre_filter(self, db_session):
+        """Test the director genre filter matches the join-based result set."""
+        query = apply_filters(db_session.query(Director.id), DIRECTOR_FILTERS, genre="Thriller")
+        expected = {
+            row[0]
+            for row in db_session.query(Director.id)
+            .join(Director.movies)
+            .join(Movie.genres)
+            .filter(Genre.name.ilike("%Thriller%"))
+            .distinct()
+        }
+        assert {row[0] for row in query} == expected
+
+    def test_id_filters_match_name_filters(self, client):
+        """Test id forms of the filters return the same results as names."""
+        genre = client.get("/api/genres?search=Sci-Fi").json()[0]
+        actor = client.get("/api/actors?search=Cillian").json()[0]
+        director = client.get("/api/directors?search=Nolan").json()[0]
+
+        def ids(url):
+            return {item["id"] for item in client.get(url).json()}
+
+        assert ids(f"/api/movies?genre_id={genre['id']}") == ids("/api/movies?genre=Sci-Fi")
+        assert ids(f"/api/movies?actor_id={actor['id']}") == ids("/api/movies?actor=Cillian")
+        assert ids(f"/api/movies?director_id={director['id']}") == ids("/api/movies?director=Nolan")
+        assert ids(f"/api/actors?genre_id={genre['id']}") == ids("/api/actors?genre=Sci-Fi")
+        assert ids("/api/actors?movie_id=1") == ids("/api/actors?movie=Inception")
+        assert ids(f"/api/directors?genre_id={genre['id']}") == ids("/api/directors?genre=Sci-Fi")
+
+
+class TestMatchModes:
+    """Exact and prefix name matching against the folded shadow columns."""
+
+    def test_exact_match(self, client):
+        """Test exact matching ignores case and accents but not partial names."""
+        titles = {m["title"] for m in client.get("/api/movies?genre=sci-fi&match=exact").json()}
+        assert "Inception" in titles
+        assert client.get("/api/movies?genre=Sci&match=exact").json() == []
+
+        actors = client.get("/api/actors?search=TIMOTHEE%20CHALAMET&match=exact").json()
+        assert [a["name"] for a in actors] == ["Timothée Chalamet"]
+
+    def test_prefix_match(self, client):
+        """Test prefix matching anchors at the start of the name."""
+        directors = client.get("/api/directors?search=chris&match=prefix").json()
+        assert [d["name"] for d in directors] == ["Christopher Nolan"]
+        assert client.get("/api/directors?search=nolan&match=prefix").json() == []
+
+        movies = client.get("/api/movies?director=quentin&match=prefix").json()
+        assert {m["title"] for m in movies} == {"Pulp Fiction"}
+
+    def test_contains_is_default(self, client):
+        """Test the default mode keeps substring matching."""
+        directors = client.get("/api/directors?search=nolan").json()
+        assert [d["name"] for d in directors] == ["Christopher Nolan"]
+
+    def test_folded_columns_follow_writes(self, client):
+        """Test renames keep the folded column in sync."""
+        genre = client.post("/api/genres/", json={"name": "Ciné Vérité"}).json()
+        assert client.get("/api/genres?search=cine%20verite&match=exact").json() == [genre]
+
+        client.put(f"/api/genres/{genre['id']}", json={"name": "Documentary"})
+        assert client.get("/api/genres?search=cine&match=prefix").json() == []
+        assert len(client.get("/api/genres?search=DOCU&match=prefix").json()) == 1
+
+    @pytest.mark.parametrize("match", ["exact", "prefix"])
+    def test_exact_and_prefix_use_name_index(self, db_session, match):
+        """Test exact and prefix lookups are index seeks, not scans."""
+        query = db_session.query(Actor.id).filter(
+            *compile_filters(ACTOR_FILTERS, match, search="Brad")
+        )
+        sql = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+        plan = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+
+        assert any("ix_actors_name_folded" in row[-1] for row in plan)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
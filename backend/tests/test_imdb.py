@@ -0,0 +1,208 @@
+"""Test the IMDb dataset importer."""
+
+import gzip
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app.db.database import Base, create_sqlite_engine, sqlite_pragmas
+from app.db.imdb import FILES, PLACEHOLDER_DIRECTOR, _Loader, import_imdb, read_tsv
+from app.db.search_index import FTS_TABLE, fts5_available
+
+TITLES = [
+    ("tconst", "titleType", "primaryTitle", "originalTitle", "isAdult", "startYear",
+     "endYear", "runtimeMinutes", "genres"),
+    ("tt0000001", "movie", "Le Voyage", "Le Voyage", "0", "1902", "\\N", "13", "Fantasy,Sci-Fi"),
+    ("tt0000002", "movie", "Café Noir", "Café Noir", "0", "1950", "\\N", "\\N", "Drama"),
+    ("tt0000003", "short", "A Short", "A Short", "0", "1990", "\\N", "5", "Short"),
+    ("tt0000004", "movie", "No Year", "No Year", "0", "\\N", "\\N", "90", "Drama"),
+    ("tt0000005", "movie", "Adult", "Adult", "1", "2000", "\\N", "90", "Adult"),
+    ("tt0000001", "movie", "Le Voyage", "Le Voyage", "0", "1902", "\\N", "13", "Fantasy"),
+    ("tt0000006", "movie", "Broken line"),
+]  # fmt: skip
+
+PRINCIPALS = [
+    ("tconst", "ordering", "nconst", "category", "job", "characters"),
+    ("tt0000001", "1", "nm0000010", "actor", "\\N", '["Hero"]'),
+    ("tt0000001", "2", "nm0000011", "actress", "\\N", "\\N"),
+    ("tt0000001", "3", "nm0000010", "actor", "\\N", '["Villain"]'),
+    ("tt0000001", "4", "nm0000020", "director", "\\N", "\\N"),
+    ("tt0000001", "5", "nm0000021", "director", "\\N", "\\N"),
+    ("tt0000001", "6", "nm0000030", "writer", "\\N", "\\N"),
+    ("tt0000002", "1", "nm0000010", "actor", "\\N", "\\N"),
+    ("tt0000002", "2", "nm0000099", "actor", "\\N", "\\N"),
+    ("tt0000003", "1", "nm0000012", "actor", "\\N", "\\N"),
+]
+
+NAMES = [
+    ("nconst", "primaryName", "birthYear", "deathYear", "primaryProfession", "knownForTitles"),
+    ("nm0000010", "Georges Méliès", "1861", "1938", "actor,director", "tt0000001"),
+    ("nm0000011", "Jeanne d'Alcy", "1865", "1956", "actress", "tt0000001"),
+    ("nm0000012", "Shorts Only", "\\N", "\\N", "actor", "tt0000003"),
+    ("nm0000020", "Ada Director", "\\N", "\\N", "director", "tt0000001"),
+]
+
+RATINGS = [
+    ("tconst", "averageRating", "numVotes"),
+    ("tt0000001", "8.1", "52000"),
+    ("tt0000003", "6.0", "10"),
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine on a fresh scratch database with the schema created."""
+    engine = create_sqlite_engine(
+        f"sqlite:///{tmp_path / 'imdb.db'}", sqlite_pragmas("performance")
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def dumps(tmp_path):
+    """Directory with a small gzipped copy of each IMDb dump."""
+    directory = tmp_path / "imdb"
+    directory.mkdir()
+    for name, rows in (
+        ("titles", TITLES),
+        ("principals", PRINCIPALS),
+        ("names", NAMES),
+        ("ratings", RATINGS),
+    ):
+        with gzip.open(directory / FILES[name], "wt", encoding="utf-8") as stream:
+            stream.writelines("\t".join(row) + "\n" for row in rows)
+    return str(directory)
+
+
+def _rows(engine, sql):
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).all()
+
+
+class TestReadTsv:
+    """Line-by-line reading of the dumps."""
+
+    def test_selects_columns_and_nulls(self, dumps):
+        """Test columns are picked by header name, \\N is None and short lines are skipped."""
+        rows = list(read_tsv(os.path.join(dumps, FILES["titles"]), ("tconst", "runtimeMinutes")))
+
+        assert rows[:2] == [("tt0000001", "13"), ("tt0000002", None)]
+        assert len(rows) == len(TITLES) - 2
+
+
+class TestImportImdb:
+    """Mapping of the dumps onto the catalog."""
+
+    def test_movies_and_genres(self, engine, dumps):
+        """Test only dated, non-adult titles of the selected type become movies, once each."""
+        counts = import_imdb(engine, dumps, chunk_size=2)
+
+        movies = _rows(
+            engine, "SELECT title, release_year, duration_minutes FROM movies ORDER BY id"
+        )
+        assert movies == [("Le Voyage", 1902, 13), ("Café Noir", 1950, None)]
+        assert _rows(engine, "SELECT title_folded FROM movies WHERE id = 2")[0][0] == "cafe noir"
+        genres = _rows(
+            engine,
+            "SELECT g.name FROM movie_genres mg JOIN genres g ON g.id = mg.genre_id "
+            "WHERE mg.movie_id = 1 ORDER BY g.name",
+        )
+        assert genres == [("Fantasy",), ("Sci-Fi",)]
+        assert counts["movies"] == 2 and counts["genres"] == 3 and counts["movie_genres"] == 3
+
+    def test_cast_and_directors(self, engine, dumps):
+        """Test credits link each person once and the first director is kept."""
+        counts = import_imdb(engine, dumps, chunk_size=2)
+
+        cast = _rows(
+            engine,
+            "SELECT m.title, a.name FROM movie_actors ma JOIN movies m ON m.id = ma.movie_id "
+            "JOIN actors a ON a.id = ma.actor_id ORDER BY m.id, a.name",
+        )
+        assert cast == [
+            ("Le Voyage", "Georges Méliès"),
+            ("Le Voyage", "Jeanne d'Alcy"),
+            ("Café Noir", "Georges Méliès"),
+            ("Café Noir", "nm0000099"),
+        ]
+        directors = _rows(
+            engine,
+            "SELECT m.title, d.name FROM movies m JOIN directors d ON d.id = m.director_id "
+            "ORDER BY m.id",
+        )
+        assert directors == [("Le Voyage", "Ada Director"), ("Café Noir", PLACEHOLDER_DIRECTOR)]
+        # Actors of titles that are not imported are not created
+        assert counts["actors"] == 3 and counts["movie_actors"] == 4
+        assert counts["directors"] == 1
+
+    def test_failed_load_keeps_links_valid(self, engine, dumps, monkeypatch):
+        """Test credits committed before a failure only link people whose rows exist."""
+
+        def fail(self, path):
+            raise RuntimeError("name.basics unreadable")
+
+        monkeypatch.setattr(_Loader, "load_names", fail)
+        with pytest.raises(RuntimeError):
+            import_imdb(engine, dumps, chunk_size=2)
+
+        dangling = _rows(
+            engine,
+            "SELECT m.id FROM movies m WHERE m.director_id NOT IN (SELECT id FROM directors) "
+            "UNION ALL SELECT ma.movie_id FROM movie_actors ma "
+            "WHERE ma.actor_id NOT IN (SELECT id FROM actors)",
+        )
+        assert dangling == []
+        directors = _rows(
+            engine, "SELECT d.name FROM movies m JOIN directors d ON d.id = m.director_id"
+        )
+        assert ("nm0000020",) in directors
+
+    def test_ratings_and_aggregates(self, engine, dumps):
+        """Test each rated movie gets one rating and matching aggregates."""
+        import_imdb(engine, dumps)
+
+        assert _rows(engine, "SELECT movie_id, score FROM ratings") == [(1, 8.1)]
+        assert _rows(engine, "SELECT rating_count, average_rating FROM movies ORDER BY id") == [
+            (1, 8.1),
+            (0, None),
+        ]
+
+    def test_indexes_restored(self, engine, dumps):
+        """Test the indexes dropped for the load exist again afterwards."""
+        before = set(_rows(engine, "SELECT name FROM sqlite_master WHERE type = 'index'"))
+        import_imdb(engine, dumps)
+
+        assert set(_rows(engine, "SELECT name FROM sqlite_master WHERE type = 'index'")) == before
+
+    @pytest.mark.skipif(not fts5_available(), reason="SQLite built without FTS5")
+    def test_search_index_rebuilt(self, engine, dumps):
+        """Test imported movies are indexed with their cast and triggers are restored."""
+        import_imdb(engine, dumps)
+
+        found = _rows(engine, f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'melies'")
+        assert sorted(found) == [(1,), (2,)]
+        triggers = _rows(engine, "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'")
+        assert triggers[0][0] > 0
+
+    def test_appends_and_optional_files(self, engine, dumps):
+        """Test a second import takes new ids and missing dumps are skipped."""
+        import_imdb(engine, dumps)
+        for name in ("principals", "names", "ratings"):
+            os.unlink(os.path.join(dumps, FILES[name]))
+
+        counts = import_imdb(engine, dumps, title_types=("movie", "short"))
+
+        assert counts["movies"] == 3 and counts["genres"] == 1
+        assert _rows(engine, "SELECT COUNT(*), MAX(id) FROM movies")[0] == (5, 5)
+
+    def test_titles_required(self, engine, tmp_path):
+        """Test a directory without title.basics is rejected."""
+        with pytest.raises(FileNotFoundError):
+            import_imdb(engine, str(tmp_path))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""Test the metrics registry and the /metrics endpoint."""
+
+import threading
+
+import pytest
+
+from app.api.deps import get_read_db
+from app.core.metrics import Counter, Histogram, Registry, pool_wait
+
+
+def _samples(text):
+    """Map of sample name with labels to value, skipping comments."""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+class TestRegistry:
+    """Counters, histograms and the text exposition format."""
+
+    def test_counter_render(self):
+        """Test counters render HELP, TYPE and one sample per label set."""
+        registry = Registry()
+        counter = registry.counter("jobs_total", "Jobs run.", ("kind",))
+        counter.inc("a")
+        counter.inc("a")
+        counter.inc("b", amount=3)
+
+        text = registry.render()
+
+        assert "# HELP jobs_total Jobs run.\n# TYPE jobs_total counter\n" in text
+        assert _samples(text) == {'jobs_total{kind="a"}': 2, 'jobs_total{kind="b"}': 3}
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test observations land in cumulative le buckets with sum and count."""
+        histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        samples = _samples("\n".join(histogram.render()))
+
+        assert samples['latency_seconds_bucket{le="0.1"}'] == 2
+        assert samples['latency_seconds_bucket{le="1"}'] == 3
+        assert samples['latency_seconds_bucket{le="+Inf"}'] == 4
+        assert samples["latency_seconds_sum"] == pytest.approx(2.65)
+        assert samples["latency_seconds_count"] == 4
+
+    def test_thread_shards_are_summed(self):
+        """Test increments from several threads are all reported."""
+        counter = Counter("hits_total", "Hits.")
+
+        def work():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.collect()[()] == [4000]
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and backslashes in label values are escaped."""
+        counter = Counter("paths_total", "Paths.", ("path",))
+        counter.inc('a"b\\c')
+
+        assert counter.render()[-1] == 'paths_total{path="a\\"b\\\\c"} 1'
+
+
+class TestMetricsEndpoint:
+    """Request, database and cache metrics served by the API."""
+
+    def test_route_metrics(self, client):
+        """Test requests are counted and timed under their route template."""
+        client.get("/api/movies/1")
+        client.get("/api/movies/2")
+
+        response = client.get("/metrics")
+        samples = _samples(response.text)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        labels = 'method="GET",route="/api/movies/{movie_id}"'
+        assert samples[f'http_requests_total{{{labels},status="200"}}'] >= 2
+        assert samples[f"http_request_duration_seconds_count{{{labels}}}"] >= 2
+        assert samples[f"http_response_size_bytes_sum{{{labels}}}"] > 0
+        assert samples[f"http_request_db_statements_total{{{labels}}}"] > 0
+
+    def test_pool_checkout_wait(self):
+        """Test session dependencies time their connection checkout."""
+        before = pool_wait.collect().get(("read",), [0] * 20)[-1]
+        sessions = get_read_db()
+        next(sessions)
+        sessions.close()
+
+        assert pool_wait.collect()[("read",)][-1] == before + 1
+
+    def test_unmatched_paths_share_a_label(self, client):
+        """Test unknown paths do not create a series per path."""
+        client.get("/no/such/path")
+
+        samples = _samples(client.get("/metrics").text)
+
+        assert samples['http_requests_total{method="GET",route="unmatched",status="404"}'] >= 1
+
+    def test_cache_metrics(self, client):
+        """Test response cache hits and hit ratio are exposed."""
+        client.get("/api/genres/")
+        client.get("/api/genres/")
+
+        samples = _samples(client.get("/metrics").text)
+
+        assert samples["response_cache_hits_total"] >= 1
+        assert 0 < samples["response_cache_hit_ratio"] <= 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""Test movie create/update handling of genre and cast links."""
+
+import pytest
+from sqlalchemy import text
+
+
+def _links(db_session, table, movie_id):
+    """(rowid, linked id) pairs of `movie_id` in `table`."""
+    column = "genre_id" if table == "movie_genres" else "actor_id"
+    rows = db_session.execute(
+        text(f"SELECT rowid, {column} FROM {table} WHERE movie_id = :m ORDER BY {column}"),
+        {"m": movie_id},
+    )
+    return [tuple(row) for row in rows]
+
+
+class TestMovieLinks:
+    """Genre and actor ids on movie writes."""
+
+    def test_create_links_genres_and_actors(self, client):
+        """Test a created movie has exactly the requested genres and cast."""
+        response = client.post(
+            "/api/movies/",
+            json={
+                "title": "Linked",
+                "release_year": 2020,
+                "director_id": 1,
+                "genre_ids": [2, 1, 2],
+                "actor_ids": [3, 1],
+            },
+        )
+
+        assert response.status_code == 201
+        movie = client.get(f"/api/movies/{response.json()['id']}").json()
+        assert sorted(genre["id"] for genre in movie["genres"]) == [1, 2]
+        assert sorted(actor["id"] for actor in movie["actors"]) == [1, 3]
+
+    def test_unknown_ids_are_reported(self, client):
+        """Test unknown genre or actor ids fail the write and are named."""
+        body = {"title": "Nope", "release_year": 2020, "director_id": 1}
+        response = client.post("/api/movies/", json={**body, "genre_ids": [1, 998, 999]})
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Unknown genre ids: 998, 999"
+        assert not client.get("/api/movies/?search=Nope").json()
+
+        response = client.put("/api/movies/1", json={"actor_ids": [1, 999], "title": "Changed"})
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Unknown actor id: 999"
+        assert client.get("/api/movies/1").json()["title"] != "Changed"
+
+    def test_unknown_director_on_update(self, client):
+        """Test moving a movie to an unknown director is a 404."""
+        response = client.put("/api/movies/1", json={"director_id": 999})
+
+        assert response.status_code == 404
+
+    def test_update_writes_only_changed_links(self, client, db_session):
+        """Test unchanged links keep their rows while added and removed ones change."""
+        client.put("/api/movies/1", json={"genre_ids": [1, 2], "actor_ids": [1, 2]})
+        genres = _links(db_session, "movie_genres", 1)
+        actors = _links(db_session, "movie_actors", 1)
+
+        client.put("/api/movies/1", json={"genre_ids": [2, 3], "actor_ids": [1, 2]})
+
+        after = _links(db_session, "movie_genres", 1)
+        assert [genre_id for _, genre_id in after] == [2, 3]
+        assert after[0] == genres[1]
+        assert _links(db_session, "movie_actors", 1) == actors
+
+    def test_update_without_ids_keeps_links(self, client):
+        """Test omitting genre_ids and actor_ids leaves the links alone."""
+        before = client.get("/api/movies/1").json()
+        client.put("/api/movies/1", json={"title": "Renamed"})
+        after = client.get("/api/movies/1").json()
+
+        assert after["title"] == "Renamed"
+        assert after["genres"] == before["genres"]
+        assert after["actors"] == before["actors"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
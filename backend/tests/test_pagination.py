@@ -0,0 +1,126 @@
+"""Test pagination of list endpoints."""
+
+import pytest
+
+from app.api.pagination import encode_cursor
+
+
+class TestIdFirstPagination:
+    """Pages are counted in movies, not in joined relationship rows."""
+
+    def test_limit_counts_movies(self, client):
+        """Test a page holds `limit` distinct movies even with many actors and ratings."""
+        response = client.get("/api/movies?limit=3")
+        assert response.status_code == 200
+        movies = response.json()
+
+        assert len(movies) == 3
+        assert len({movie["id"] for movie in movies}) == 3
+
+    def test_pages_cover_catalog_without_overlap(self, client):
+        """Test consecutive pages are disjoint and together return every movie."""
+        all_ids = [movie["id"] for movie in client.get("/api/movies").json()]
+
+        paged_ids = []
+        for skip in range(0, len(all_ids), 4):
+            page = client.get(f"/api/movies?skip={skip}&limit=4").json()
+            paged_ids.extend(movie["id"] for movie in page)
+
+        assert paged_ids == all_ids
+        assert len(set(paged_ids)) == len(paged_ids)
+
+    def test_page_loads_all_relationships(self, client):
+        """Test movies on a page carry their full cast, genres and ratings."""
+        detail = client.get("/api/movies/1").json()
+        listed = next(m for m in client.get("/api/movies?limit=5").json() if m["id"] == 1)
+
+        assert {a["id"] for a in listed["actors"]} == {a["id"] for a in detail["actors"]}
+        assert {g["id"] for g in listed["genres"]} == {g["id"] for g in detail["genres"]}
+        assert listed["rating_count"] == detail["rating_count"]
+
+    def test_search_limit_counts_movies(self, client):
+        """Test search pages count distinct movies across OR-matched joins."""
+        response = client.get("/api/movies/search?q=a&limit=2")
+        assert response.status_code == 200
+        movies = response.json()
+
+        assert len(movies) == 2
+        assert movies[0]["id"] != movies[1]["id"]
+
+
+def _walk_cursor(client, url):
+    """Follow X-Next-Cursor from `url` and return every item seen."""
+    items = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == 200
+        items.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+        response = client.get(f"{url}&cursor={cursor}")
+
+
+class TestKeysetPagination:
+    """Cursor pages follow a stable (sort key, id) order."""
+
+    @pytest.mark.parametrize("sort", ["id", "title", "release_year"])
+    def test_cursor_walk_matches_sorted_catalog(self, client, sort):
+        """Test walking cursors returns every movie once in (sort, id) order."""
+        movies = _walk_cursor(client, f"/api/movies?limit=3&sort={sort}")
+        expected = sorted(movies, key=lambda m: (m[sort], m["id"]))
+
+        assert [m["id"] for m in movies] == [m["id"] for m in expected]
+        assert len(movies) == len(client.get("/api/movies").json())
+
+    def test_last_page_has_no_cursor(self, client):
+        """Test the final page omits X-Next-Cursor."""
+        response = client.get("/api/movies?limit=100")
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_cursor_with_filters(self, client):
+        """Test cursors respect active filters."""
+        movies = _walk_cursor(client, "/api/movies?genre=Drama&limit=2&sort=release_year")
+        expected = client.get("/api/movies?genre=Drama").json()
+
+        assert {m["id"] for m in movies} == {m["id"] for m in expected}
+
+    def test_search_cursor(self, client):
+        """Test the search endpoint pages by cursor."""
+        movies = _walk_cursor(client, "/api/movies/search?q=an&limit=2&sort=title")
+        expected = client.get("/api/movies/search?q=an").json()
+
+        assert sorted(m["id"] for m in movies) == sorted(m["id"] for m in expected)
+
+    @pytest.mark.parametrize("path", ["/api/actors", "/api/directors"])
+    def test_people_cursor_walk(self, client, path):
+        """Test actors and directors page by name cursor."""
+        people = _walk_cursor(client, f"{path}?limit=4&sort=name")
+
+        assert [p["name"] for p in people] == sorted(p["name"] for p in people)
+        assert len(people) == len(client.get(path).json())
+
+    def test_invalid_cursor_rejected(self, client):
+        """Test a malformed cursor returns 400."""
+        response = client.get("/api/movies?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "key", [[[], 2], [{"a": 1}, 2], ["Inception", "2"], ["Inception", True], ["x", 1.5]]
+    )
+    def test_cursor_with_bad_key_types_rejected(self, client, key):
+        """Test cursors whose key values cannot be bound return 400, not 500."""
+        cursor = encode_cursor("title", key)
+        response = client.get(f"/api/movies/?sort=title&cursor={cursor}")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    def test_cursor_from_other_sort_rejected(self, client):
+        """Test a cursor issued for one sort cannot be replayed on another."""
+        cursor = client.get("/api/movies?limit=1&sort=title").headers["X-Next-Cursor"]
+        response = client.get(f"/api/movies?limit=1&sort=release_year&cursor={cursor}")
+        assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""Test SQL statement budgets per endpoint and the query stats headers."""
+
+import pytest
+
+from app.api.middleware import DB_TIME_HEADER, STATEMENTS_HEADER
+from app.core import querystats
+
+# (method, url, JSON body, max statements)
+BUDGETS = [
+    ("GET", "/api/movies/", None, 4),
+    ("GET", "/api/movies/?include=director,genres,actors,ratings", None, 5),
+    ("GET", "/api/movies/?shape=sideload", None, 7),
+    ("GET", "/api/movies/?genre=Drama&min_year=2000", None, 4),
+    ("GET", "/api/movies/search?q=dark", None, 4),
+    ("GET", "/api/movies/1", None, 4),
+    ("GET", "/api/movies/1/ratings", None, 2),
+    ("GET", "/api/actors/", None, 2),
+    ("GET", "/api/actors/1", None, 2),
+    ("GET", "/api/directors/", None, 2),
+    ("GET", "/api/directors/1", None, 1),
+    ("GET", "/api/genres/", None, 1),
+    ("GET", "/api/genres/1", None, 1),
+    ("POST", "/api/actors/", {"name": "New Actor"}, 2),
+    ("PUT", "/api/actors/1", {"bio": "Updated"}, 4),
+    ("POST", "/api/ratings", {"movie_id": 1, "score": 8.0}, 4),
+    (
+        "POST",
+        "/api/movies/",
+        {"title": "New", "release_year": 2020, "director_id": 1, "genre_ids": [1, 2]},
+        4,
+    ),
+    ("PUT", "/api/movies/1", {"title": "Renamed"}, 3),
+    ("PUT", "/api/movies/1", {"genre_ids": [1, 3], "actor_ids": [1, 2]}, 9),
+    ("DELETE", "/api/movies/2", None, 8),
+]
+
+
+class TestQueryBudgets:
+    """Endpoints stay within a fixed number of SQL statements."""
+
+    @pytest.mark.parametrize("method, url, body, limit", BUDGETS)
+    def test_budget(self, client, max_queries, method, url, body, limit):
+        """Test the endpoint runs at most its budgeted statements."""
+        with max_queries(limit):
+            response = client.request(method, url, json=body)
+        assert response.status_code < 400
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/movies/?limit={}",
+            "/api/movies/?shape=sideload&include=director,genres,actors,ratings&limit={}",
+            "/api/movies/search?q=the&limit={}",
+            "/api/actors/?limit={}",
+            "/api/directors/?limit={}",
+        ],
+    )
+    def test_lists_do_not_scale_with_page_size(self, client, max_queries, url):
+        """Test a list page costs the same number of statements for 1 or 20 rows (no N+1)."""
+        with max_queries(100) as one:
+            client.get(url.format(1))
+        with max_queries(100) as twenty:
+            client.get(url.format(20))
+
+        assert twenty.statements == one.statements
+
+    def test_movie_writes_do_not_scale_with_links(self, client, max_queries):
+        """Test creating or relinking a movie costs the same for 1 or 10 genres and actors."""
+        body = {"title": "Linked", "release_year": 2020, "director_id": 1}
+        counts = []
+        for ids in ([1], list(range(1, 11))):
+            links = {"genre_ids": ids, "actor_ids": ids}
+            with max_queries(100) as create:
+                movie_id = client.post("/api/movies/", json={**body, **links}).json()["id"]
+            client.put(f"/api/movies/{movie_id}", json={"genre_ids": [], "actor_ids": []})
+            with max_queries(100) as update:
+                client.put(f"/api/movies/{movie_id}", json=links)
+            counts.append((create.statements, update.statements))
+
+        assert counts[0] == counts[1]
+
+
+class TestQueryStatsHeaders:
+    """Statement count and database time headers in debug mode."""
+
+    def test_headers_in_debug_mode(self, client, monkeypatch):
+        """Test responses report their statements and DB time when API_DEBUG is on."""
+        monkeypatch.setattr(querystats, "DEBUG_HEADERS", True)
+        response = client.get("/api/movies/1")
+
+        assert response.headers[STATEMENTS_HEADER] == "4"
+        assert float(response.headers[DB_TIME_HEADER]) > 0
+
+    def test_cache_hits_report_no_statements(self, client, monkeypatch):
+        """Test a response served from the cache ran no queries."""
+        monkeypatch.setattr(querystats, "DEBUG_HEADERS", True)
+        client.get("/api/genres/")
+        response = client.get("/api/genres/")
+
+        assert response.headers["X-Cache"] == "HIT"
+        assert response.headers[STATEMENTS_HEADER] == "0"
+
+    def test_no_headers_by_default(self, client):
+        """Test the headers are omitted outside debug mode."""
+        response = client.get("/api/movies/1")
+
+        assert STATEMENTS_HEADER not in response.headers
+        assert DB_TIME_HEADER not in response.headers
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
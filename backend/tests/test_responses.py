@@ -0,0 +1,59 @@
+"""Test single-pass JSON responses of the read endpoints."""
+
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.api.fieldsets import MovieList
+from app.schemas import Actor, ActorDetail, Director, DirectorDetail, MovieDetail
+
+
+class TestTrustedResponses:
+    """Responses written without response_model still match their schemas."""
+
+    @pytest.mark.parametrize(
+        "url, schema",
+        [
+            ("/api/movies/", MovieList),
+            ("/api/movies/?include=ratings", MovieList),
+            ("/api/movies/?shape=sideload", MovieList),
+            ("/api/movies/search?q=the", MovieList),
+            ("/api/actors/", List[Actor]),
+            ("/api/directors/", List[Director]),
+        ],
+    )
+    def test_lists_match_schema(self, client, url, schema):
+        """Test trusted list rows round-trip through the documented schema."""
+        response = client.get(url)
+        assert response.headers["content-type"] == "application/json"
+
+        adapter = TypeAdapter(schema)
+        validated = adapter.validate_json(response.content)
+        assert adapter.dump_python(validated, mode="json", exclude_unset=True) == response.json()
+
+    @pytest.mark.parametrize(
+        "url, schema",
+        [
+            ("/api/movies/1", MovieDetail),
+            ("/api/actors/1", ActorDetail),
+            ("/api/directors/1", DirectorDetail),
+        ],
+    )
+    def test_details_match_schema(self, client, url, schema):
+        """Test detail responses contain every schema field."""
+        body = client.get(url).json()
+        assert body == schema.model_validate(body).model_dump()
+
+    def test_average_rating_rounded(self, client):
+        """Test list rows round averages like the schema validator does."""
+        client.post("/api/ratings", json={"movie_id": 1, "score": 7.33})
+        listed = client.get("/api/movies/?fields=average_rating&include=").json()
+        detail = client.get("/api/movies/1").json()
+
+        assert listed[0]["average_rating"] == detail["average_rating"]
+        assert listed[0]["average_rating"] == round(listed[0]["average_rating"], 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
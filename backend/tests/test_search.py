@@ -0,0 +1,101 @@
+"""Test full-text movie search."""
+
+import pytest
+
+from app.db.search_index import fts5_available, match_expression
+
+pytestmark = pytest.mark.skipif(not fts5_available(), reason="SQLite built without FTS5")
+
+
+def _titles(client, q, **params):
+    response = client.get("/api/movies/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [movie["title"] for movie in response.json()]
+
+
+class TestSearchIndex:
+    """Search is served by the FTS5 index with BM25 ranking."""
+
+    def test_match_expression(self):
+        """Test every word becomes a quoted prefix term."""
+        assert match_expression("Dark  knight!") == '"dark"* "knight"*'
+        assert match_expression("!!") is None
+
+    def test_prefix_matches_every_field(self, client):
+        """Test prefixes match titles, directors, actors, genres and synopses."""
+        assert "Inception" in _titles(client, "incep")
+        assert "Oppenheimer" in _titles(client, "nol")
+        assert "Fight Club" in _titles(client, "pit")
+        assert "Get Out" in _titles(client, "horr")
+        assert "Goodfellas" in _titles(client, "mob")
+
+    def test_words_are_combined_with_and(self, client):
+        """Test multi-word queries require every word."""
+        assert _titles(client, "nolan sci") == ["Inception"]
+
+    def test_accents_are_folded(self, client):
+        """Test diacritics in indexed names are ignored."""
+        assert "Dune" in _titles(client, "timothee")
+
+    def test_title_matches_rank_first(self, client):
+        """Test BM25 weights put title hits ahead of other fields."""
+        titles = _titles(client, "dark")
+        assert titles[0] == "The Dark Knight"
+
+    def test_no_searchable_words(self, client):
+        """Test punctuation-only queries return nothing."""
+        assert _titles(client, "%") == []
+
+    def test_relevance_cursor_walk(self, client):
+        """Test relevance-ordered results page by cursor without gaps."""
+        expected = _titles(client, "the")
+        seen = []
+        params = {"q": "the", "limit": 2}
+        while True:
+            response = client.get("/api/movies/search", params=params)
+            seen.extend(movie["title"] for movie in response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        assert seen == expected
+
+
+class TestSearchIndexSync:
+    """Writes through the routers are reflected in search results."""
+
+    def test_created_and_deleted_movie(self, client):
+        """Test new movies become searchable and deleted ones disappear."""
+        movie = client.post(
+            "/api/movies/",
+            json={"title": "Zyzzyva Rising", "release_year": 2024, "director_id": 1},
+        ).json()
+        assert _titles(client, "zyzz") == ["Zyzzyva Rising"]
+
+        client.delete(f"/api/movies/{movie['id']}")
+        assert _titles(client, "zyzz") == []
+
+    def test_renamed_actor(self, client):
+        """Test renaming an actor re-indexes their movies."""
+        client.put("/api/actors/1", json={"name": "Quillon Vantablack"})
+        assert "Inception" in _titles(client, "vantablack")
+        assert "Inception" not in _titles(client, "dicaprio")
+
+    def test_renamed_director_and_genre(self, client):
+        """Test renaming a director or genre re-indexes related movies."""
+        client.put("/api/directors/1", json={"name": "Xaviera Quell"})
+        client.put("/api/genres/4", json={"name": "Speculative"})
+
+        assert "Inception" in _titles(client, "xaviera")
+        assert "Inception" in _titles(client, "speculative")
+
+    def test_updated_cast(self, client):
+        """Test replacing a movie's cast updates its document."""
+        client.put("/api/movies/3", json={"actor_ids": [13]})
+
+        assert "Pulp Fiction" in _titles(client, "zendaya")
+        assert "Pulp Fiction" not in _titles(client, "jackson")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+"""Test read/write session routing."""
+
+import os
+import tempfile
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.api.deps import get_db, get_read_db
+from app.db.database import ReadSessionLocal, create_sqlite_engine, sqlite_pragmas
+from app.main import app
+
+
+def _dependencies(route):
+    return {dependency.call for dependency in route.dependant.dependencies}
+
+
+class TestSessionRouting:
+    """GET routes read through the read-only pool; mutations through the writer."""
+
+    def test_get_routes_use_read_sessions(self):
+        """Test every GET route depends on get_read_db and never on get_db."""
+        routes = [r for r in app.routes if isinstance(r, APIRoute) and "GET" in r.methods]
+        db_routes = [r for r in routes if _dependencies(r) & {get_db, get_read_db}]
+
+        assert db_routes
+        assert all(_dependencies(r) & {get_db, get_read_db} == {get_read_db} for r in db_routes)
+
+    def test_mutations_use_write_sessions(self):
+        """Test POST/PUT/DELETE API routes depend on get_db."""
+        routes = [
+            r
+            for r in app.routes
+            if isinstance(r, APIRoute)
+            and r.methods & {"POST", "PUT", "DELETE"}
+            and r.path.startswith("/api/")
+        ]
+
+        assert routes
+        assert all(
+            get_db in _dependencies(r) and get_read_db not in _dependencies(r) for r in routes
+        )
+
+    def test_read_session_configuration(self):
+        """Test read sessions skip autoflush and keep state after commit."""
+        session = ReadSessionLocal()
+        try:
+            assert session.autoflush is False
+            assert session.expire_on_commit is False
+        finally:
+            session.close()
+
+    def test_read_only_engine_rejects_writes(self):
+        """Test connections from a read-only engine cannot modify the database."""
+        fd, path = tempfile.mkstemp(suffix=".db")
+        url = f"sqlite:///{path}"
+        writer = create_sqlite_engine(url, sqlite_pragmas("performance"))
+        reader = create_sqlite_engine(url, sqlite_pragmas("performance"), read_only=True)
+        try:
+            with writer.begin() as conn:
+                conn.execute(text("CREATE TABLE t (x INTEGER)"))
+
+            with reader.connect() as conn:
+                assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+                assert conn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 0
+                with pytest.raises(OperationalError, match="readonly"):
+                    conn.execute(text("INSERT INTO t VALUES (1)"))
+        finally:
+            reader.dispose()
+            writer.dispose()
+            os.close(fd)
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.unlink(path + suffix)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
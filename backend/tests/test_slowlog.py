@@ -0,0 +1,123 @@
+"""Test the slow-query log and its debug endpoint."""
+
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.api.endpoints import debug
+from app.db.database import slow_queries
+from app.db.slowlog import SlowQueryLog
+
+
+@pytest.fixture
+def recording(engine, monkeypatch):
+    """Log every statement run through the test engine."""
+    monkeypatch.setattr(slow_queries, "threshold_ms", 1e-9)
+    slow_queries.clear()
+    slow_queries.install(engine)
+    yield slow_queries
+    slow_queries.remove(engine)
+    slow_queries.clear()
+
+
+class TestSlowQueryLog:
+    """Statements over the threshold are kept with their plans."""
+
+    def test_records_statement_and_plan(self, engine, db_session):
+        """Test a slow statement is logged with duration and query plan but no parameters."""
+        log = SlowQueryLog(threshold_ms=1e-9)
+        log.install(engine)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT * FROM movies WHERE synopsis = :s"), {"s": "x"})
+        finally:
+            log.remove(engine)
+
+        entry = log.snapshot()[0]
+        assert entry["statement"] == "SELECT * FROM movies WHERE synopsis = ?"
+        assert "parameters" not in entry and "'x'" not in str(entry)
+        assert entry["duration_ms"] >= 0
+        assert entry["route"] is None
+        assert entry["plan"] == ["SCAN movies"]
+
+    def test_fast_statements_are_skipped(self, engine):
+        """Test statements under the threshold are not logged."""
+        log = SlowQueryLog(threshold_ms=60_000)
+        log.install(engine)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        finally:
+            log.remove(engine)
+
+        assert log.snapshot() == []
+
+    def test_buffer_is_bounded(self):
+        """Test only the latest entries are kept, newest first."""
+        log = SlowQueryLog(threshold_ms=1, size=2)
+        for number in range(3):
+            log.entries.append({"statement": str(number)})
+
+        assert [entry["statement"] for entry in log.snapshot()] == ["2", "1"]
+
+    def test_dump_json_lines(self):
+        """Test the log dumps one JSON object per line, oldest first."""
+        log = SlowQueryLog(threshold_ms=1)
+        log.entries.extend([{"statement": "a"}, {"statement": "b"}])
+        stream = io.StringIO()
+
+        assert log.dump(stream) == 2
+        assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+            {"statement": "a"},
+            {"statement": "b"},
+        ]
+
+    def test_disabled_by_default(self):
+        """Test the log is off unless DATABASE_SLOW_QUERY_MS is set."""
+        assert not SlowQueryLog().enabled
+
+
+class TestSlowQueryEndpoint:
+    """The slow-query log served at /debug/slow-queries when enabled."""
+
+    @pytest.fixture
+    def debug_client(self):
+        """Client of an app mounting the debug router as `app.main` does when enabled."""
+        app = FastAPI()
+        app.include_router(debug.router, prefix="/debug")
+        return TestClient(app)
+
+    def test_not_mounted_when_disabled(self, client):
+        """Test the routes do not exist unless DATABASE_SLOW_QUERY_MS is set."""
+        assert client.get("/debug/slow-queries").status_code == 404
+        assert client.delete("/debug/slow-queries").status_code in (404, 405)
+
+    def test_entries_name_their_route(self, client, recording):
+        """Test logged statements carry the route of the request that ran them."""
+        client.get("/api/actors/1")
+
+        entries = recording.snapshot()
+
+        assert "GET /api/actors/{actor_id}" in {entry["route"] for entry in entries}
+        assert all(entry["plan"] for entry in entries)
+
+    def test_jsonl_dump_and_clear(self, client, recording, debug_client):
+        """Test the log downloads as JSON lines and can be emptied."""
+        client.get("/api/genres/1")
+
+        response = debug_client.get("/debug/slow-queries?format=jsonl")
+        lines = response.text.splitlines()
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert lines and all("statement" in json.loads(line) for line in lines)
+
+        assert debug_client.delete("/debug/slow-queries").status_code == 204
+        assert debug_client.get("/debug/slow-queries").json()["entries"] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,97 @@
+"""Test SQLite connection tuning profiles."""
+
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import create_sqlite_engine, sqlite_pragmas
+
+
+@pytest.fixture
+def db_url():
+    """URL of a scratch SQLite file."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    yield f"sqlite:///{path}"
+    os.close(fd)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSqliteProfiles:
+    """PRAGMAs of the selected profile are applied on connect."""
+
+    def test_performance_profile_applied(self, db_url):
+        """Test every connection gets the performance PRAGMAs."""
+        engine = create_sqlite_engine(db_url, sqlite_pragmas("performance"))
+        with engine.connect() as conn:
+            assert _pragma(conn, "journal_mode") == "wal"
+            assert _pragma(conn, "synchronous") == 1  # NORMAL
+            assert _pragma(conn, "temp_store") == 2  # MEMORY
+            assert _pragma(conn, "cache_size") == -65536
+            assert _pragma(conn, "busy_timeout") == 5000
+        engine.dispose()
+
+    def test_default_profile_keeps_sqlite_defaults(self, db_url):
+        """Test the default profile leaves the rollback journal in place."""
+        engine = create_sqlite_engine(db_url, sqlite_pragmas("default"))
+        with engine.connect() as conn:
+            assert _pragma(conn, "journal_mode") == "delete"
+        engine.dispose()
+
+    def test_overrides(self):
+        """Test name=value overrides replace or extend profile PRAGMAs."""
+        pragmas = sqlite_pragmas("wal", "synchronous=FULL, mmap_size=0")
+
+        assert pragmas["journal_mode"] == "WAL"
+        assert pragmas["synchronous"] == "FULL"
+        assert pragmas["mmap_size"] == "0"
+
+    def test_unknown_profile_rejected(self):
+        """Test a misspelled profile fails loudly."""
+        with pytest.raises(ValueError, match="Unknown database profile"):
+            sqlite_pragmas("fast")
+
+    def test_pool_sizing(self, db_url):
+        """Test pool size and overflow are configurable."""
+        engine = create_sqlite_engine(db_url, pool_size=3, max_overflow=1)
+
+        assert engine.pool.size() == 3
+        assert engine.pool._max_overflow == 1
+        engine.dispose()
+
+    @pytest.mark.parametrize("profile, blocked", [("default", True), ("wal", False)])
+    def test_open_reader_and_writer(self, db_url, profile, blocked):
+        """Test a writer can commit during an open read transaction only in WAL mode."""
+        engine = create_sqlite_engine(db_url, sqlite_pragmas(profile, "busy_timeout=100"))
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        reader = engine.connect()
+        reader.exec_driver_sql("BEGIN")
+        reader.execute(text("SELECT * FROM t")).all()
+        try:
+            if blocked:
+                with pytest.raises(OperationalError, match="locked"):
+                    with engine.begin() as writer:
+                        writer.execute(text("INSERT INTO t VALUES (2)"))
+            else:
+                with engine.begin() as writer:
+                    writer.execute(text("INSERT INTO t VALUES (2)"))
+                # The reader keeps its snapshot until its transaction ends
+                assert reader.execute(text("SELECT COUNT(*) FROM t")).scalar() == 1
+        finally:
+            reader.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
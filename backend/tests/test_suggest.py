@@ -0,0 +1,157 @@
+"""Test typeahead suggestions."""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from app.core.suggest import SuggestIndex, suggestions
+
+
+def _suggest(client, q, **params):
+    response = client.get("/api/suggest", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(s["type"], s["label"]) for s in response.json()]
+
+
+class TestSuggestIndex:
+    """Unit tests for the sorted-array prefix index."""
+
+    def test_word_prefixes_and_ranking(self):
+        """Test later words match and whole-name matches rank first."""
+        index = SuggestIndex()
+        index.built = True
+        index.upsert("actor", 1, "Brad Pitt")
+        index.upsert("movie", 2, "Pitch Black")
+        index.upsert("director", 3, "Pitof")
+
+        assert index.suggest("pit") == [
+            ("director", 3, "Pitof"),
+            ("movie", 2, "Pitch Black"),
+            ("actor", 1, "Brad Pitt"),
+        ]
+
+    def test_upsert_replaces_and_remove_deletes(self):
+        """Test renames drop the old keys and removals drop every key."""
+        index = SuggestIndex()
+        index.built = True
+        index.upsert("genre", 1, "Sci-Fi")
+        index.upsert("genre", 1, "Science Fiction")
+
+        assert index.suggest("sci-") == []
+        assert index.suggest("fict") == [("genre", 1, "Science Fiction")]
+
+        index.remove("genre", 1)
+        assert index.suggest("sci") == []
+        assert len(index) == 0
+
+    def test_limit_and_types(self):
+        """Test results are capped and filtered by type."""
+        index = SuggestIndex()
+        index.built = True
+        for entity_id in range(30):
+            index.upsert("movie", entity_id, f"Star {entity_id}")
+        index.upsert("actor", 99, "Starla")
+
+        assert len(index.suggest("star", limit=5)) == 5
+        assert index.suggest("star", types=["actor"]) == [("actor", 99, "Starla")]
+
+
+class TestStaleRebuild:
+    """Rebuilds after writes by other processes."""
+
+    def _rename_actor(self, db_session):
+        db_session.execute(text("UPDATE actors SET name = 'Ophelia Quartz' WHERE id = 1"))
+        db_session.commit()
+
+    def test_stale_served_within_interval(self, db_session):
+        """Test a stale index answers until the rebuild interval has passed."""
+        index = SuggestIndex(rebuild_interval=60)
+        index.ensure_built(db_session)
+        self._rename_actor(db_session)
+        index.mark_stale()
+
+        index.ensure_built(db_session)
+        assert index.suggest("quar") == [] and index.stale
+
+        index.rebuild_interval = 0
+        index.ensure_built(db_session)
+        assert index.suggest("quar") == [("actor", 1, "Ophelia Quartz")]
+        assert not index.stale
+
+    def test_single_flight(self, db_session):
+        """Test lookups during a rebuild keep the old index instead of rebuilding too."""
+        index = SuggestIndex(rebuild_interval=0)
+        index.ensure_built(db_session)
+        self._rename_actor(db_session)
+        index.mark_stale()
+        started, release = threading.Event(), threading.Event()
+        rebuild = index._rebuild
+
+        def slow_rebuild(db):
+            started.set()
+            release.wait(5)
+            rebuild(db)
+
+        index._rebuild = slow_rebuild
+        rebuilder = threading.Thread(target=index.ensure_built, args=(db_session,))
+        rebuilder.start()
+        started.wait(5)
+        index._rebuild = None  # a second rebuild would fail
+
+        index.ensure_built(db_session)
+        assert index.suggest("quar") == []
+
+        release.set()
+        rebuilder.join(5)
+        assert index.suggest("quar") == [("actor", 1, "Ophelia Quartz")]
+
+
+class TestSuggestEndpoint:
+    """The endpoint is built from the database and follows CRUD writes."""
+
+    def test_suggests_every_type(self, client):
+        """Test names of each entity type are suggested, accents folded."""
+        assert ("movie", "Inception") in _suggest(client, "incep")
+        assert ("director", "Christopher Nolan") in _suggest(client, "nol")
+        assert ("actor", "Timothée Chalamet") in _suggest(client, "timothee")
+        assert ("genre", "Thriller") in _suggest(client, "thr", type="genre")
+
+    def test_follows_writes(self, client):
+        """Test create, rename and delete are reflected without a rebuild."""
+        actor = client.post("/api/actors/", json={"name": "Ophelia Quartz"}).json()
+        assert ("actor", "Ophelia Quartz") in _suggest(client, "quar")
+
+        client.put(f"/api/actors/{actor['id']}", json={"name": "Ophelia Zircon"})
+        assert _suggest(client, "quar") == []
+        assert ("actor", "Ophelia Zircon") in _suggest(client, "zirc")
+
+        client.delete(f"/api/actors/{actor['id']}")
+        assert _suggest(client, "ophelia") == []
+
+    def test_follows_other_processes(self, client, other_process, monkeypatch):
+        """Test names written by another worker or the CLI are suggested after a rebuild."""
+        monkeypatch.setattr(suggestions, "rebuild_interval", 0)
+        assert _suggest(client, "quar") == []
+        with other_process.begin() as conn:
+            conn.execute(text("UPDATE actors SET name = 'Ophelia Quartz' WHERE id = 1"))
+
+        assert ("actor", "Ophelia Quartz") in _suggest(client, "quar")
+
+    def test_other_writes_keep_index(self, client, other_process):
+        """Test writes of tables without names do not rebuild the index."""
+        _suggest(client, "incep")
+        with other_process.begin() as conn:
+            conn.execute(text("UPDATE ratings SET review = 'Elsewhere' WHERE id = 1"))
+        client.get("/api/genres/")
+
+        assert suggestions.built and not suggestions.stale
+
+    def test_invalid_type_rejected(self, client):
+        """Test unknown suggestion types are rejected."""
+        response = client.get("/api/suggest", params={"q": "a", "type": "studio"})
+        assert response.status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,154 @@
+"""Test the synthetic catalog generator."""
+
+import os
+import tempfile
+from collections import Counter
+
+import pytest
+from sqlalchemy import text
+
+from app.db.database import Base, create_sqlite_engine, sqlite_pragmas
+from app.db.search_index import FTS_TABLE, fts5_available
+from app.db.synthetic import (
+    MAX_REVIEW_LENGTH,
+    MAX_REVIEW_WORDS,
+    WORDS,
+    CatalogSpec,
+    generate_catalog,
+)
+
+SPEC = CatalogSpec(movies=400, chunk_size=150, seed=7)
+
+
+@pytest.fixture
+def make_engine():
+    """Factory of engines on fresh scratch databases with the schema created."""
+    created = []
+
+    def make():
+        fd, path = tempfile.mkstemp(suffix=".db")
+        engine = create_sqlite_engine(f"sqlite:///{path}", sqlite_pragmas("performance"))
+        Base.metadata.create_all(bind=engine)
+        created.append((engine, fd, path))
+        return engine
+
+    yield make
+    for engine, fd, path in created:
+        engine.dispose()
+        os.close(fd)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+
+def _rows(engine, sql):
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).all()
+
+
+class TestSyntheticCatalog:
+    """Deterministic bulk generation with realistic distributions."""
+
+    def test_counts(self, make_engine):
+        """Test the requested number of rows is written and reported."""
+        engine = make_engine()
+        counts = generate_catalog(engine, SPEC)
+
+        assert counts["movies"] == 400
+        assert counts["actors"] == SPEC.actor_count == 200
+        assert counts["directors"] == SPEC.director_count == 20
+        for table, count in counts.items():
+            assert _rows(engine, f"SELECT COUNT(*) FROM {table}")[0][0] == count
+
+    def test_deterministic(self, make_engine):
+        """Test the same spec produces identical catalogs and another seed does not."""
+        first, second, other = make_engine(), make_engine(), make_engine()
+        generate_catalog(first, SPEC)
+        generate_catalog(second, SPEC)
+        generate_catalog(other, SPEC._replace(seed=8))
+
+        for sql in (
+            "SELECT * FROM movies ORDER BY id",
+            "SELECT * FROM movie_actors ORDER BY movie_id, actor_id",
+            "SELECT * FROM ratings ORDER BY id",
+        ):
+            assert _rows(first, sql) == _rows(second, sql)
+        assert _rows(first, "SELECT title FROM movies") != _rows(other, "SELECT title FROM movies")
+
+    def test_distributions(self, make_engine):
+        """Test casts, genres and ratings stay in bounds and actor popularity is skewed."""
+        engine = make_engine()
+        generate_catalog(engine, SPEC)
+
+        cast = Counter(
+            movie_id for _, movie_id in _rows(engine, "SELECT actor_id, movie_id FROM movie_actors")
+        )
+        assert max(cast.values()) <= SPEC.cast_size[1]
+        genres = Counter(
+            movie_id for (movie_id,) in _rows(engine, "SELECT movie_id FROM movie_genres")
+        )
+        assert set(genres.values()) <= set(range(1, SPEC.genres_per_movie[1] + 1))
+
+        appearances = sorted(
+            Counter(
+                actor_id for (actor_id,) in _rows(engine, "SELECT actor_id FROM movie_actors")
+            ).values()
+        )
+        assert appearances[-1] > 10 * appearances[len(appearances) // 2]
+
+        longest = _rows(engine, "SELECT MAX(LENGTH(review)) FROM ratings")[0][0]
+        assert SPEC.review_words < longest <= 2000
+
+        per_movie = [count for (count,) in _rows(engine, "SELECT rating_count FROM movies")]
+        assert 0 in per_movie
+        assert max(per_movie) > 5 * SPEC.mean_ratings
+
+    def test_aggregates_and_folded_names(self, make_engine):
+        """Test stored rating aggregates and folded names match the source rows."""
+        engine = make_engine()
+        generate_catalog(engine, SPEC)
+
+        mismatched = _rows(
+            engine,
+            "SELECT m.id FROM movies m WHERE m.rating_count != "
+            "(SELECT COUNT(*) FROM ratings r WHERE r.movie_id = m.id) "
+            "OR abs(m.rating_sum - (SELECT COALESCE(SUM(score), 0) FROM ratings r "
+            "WHERE r.movie_id = m.id)) > 1e-6",
+        )
+        assert mismatched == []
+        assert _rows(engine, "SELECT COUNT(*) FROM movies WHERE title_folded IS NULL")[0][0] == 0
+
+    def test_reviews_within_schema_limit(self, make_engine):
+        """Test every generated review fits the length the rating schemas accept."""
+        engine = make_engine()
+        generate_catalog(engine, SPEC._replace(movies=100, review_share=1.0, review_words=400))
+
+        reviews = [review for (review,) in _rows(engine, "SELECT review FROM ratings")]
+        assert reviews and all(len(review) <= MAX_REVIEW_LENGTH for review in reviews)
+        # Capped by whole words, and long enough to reach the cap
+        words = [review[:-1].lower().split() for review in reviews]
+        assert all(set(review) <= set(WORDS) for review in words)
+        assert max(map(len, words)) == MAX_REVIEW_WORDS
+
+    @pytest.mark.skipif(not fts5_available(), reason="SQLite built without FTS5")
+    def test_search_index_rebuilt(self, make_engine):
+        """Test the full-text index covers the generated movies and triggers are restored."""
+        engine = make_engine()
+        generate_catalog(engine, SPEC)
+
+        assert _rows(engine, f"SELECT COUNT(*) FROM {FTS_TABLE}")[0][0] == SPEC.movies
+        triggers = _rows(engine, "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'")
+        assert triggers[0][0] > 0
+
+    def test_appends_after_existing_rows(self, make_engine):
+        """Test a second run adds new ids instead of colliding with existing ones."""
+        engine = make_engine()
+        generate_catalog(engine, SPEC)
+        generate_catalog(engine, SPEC._replace(movies=50, seed=1))
+
+        assert _rows(engine, "SELECT COUNT(*), MAX(id) FROM movies")[0] == (450, 450)
+        assert _rows(engine, "SELECT COUNT(*) FROM genres")[0][0] == SPEC.genres
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])